@@ -0,0 +1,262 @@
+"""
+Benchmarks how Smash scales with project size.
+
+Generates a synthetic project and times the engine on it:
+
+    python benchmarks/bench.py run --smashlets 200 --inputs 20 --output new.json
+    python benchmarks/bench.py compare old.json new.json
+
+Scenarios:
+- discovery:  finding smashlets, without and with the discovery index
+- first_build: building the fresh project
+- noop_build:  `smash build` with everything up to date
+- status:      `smash status`
+- one_changed: `smash build` after editing a single input file
+- forced_build: `smash run`, rebuilding everything
+
+Builds run the real CLI in a subprocess (daemon disabled), so interpreter
+startup and imports are included, as users experience them.
+
+`generate` only writes the project, for profiling by hand (`--trace`).
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from smash_core.discovery import walk_smashlets  # noqa: E402
+
+# Default regression threshold for `compare`: 10% slower median
+THRESHOLD = 0.10
+
+SMASHLET_TEMPLATE = """\
+from pathlib import Path
+
+INPUT_GLOB = "*.txt"
+OUTPUT_FILES = [{output!r}]
+
+
+def run(context):
+    data = context["context"].get("data", [])
+    parts = [p.read_text() for p in sorted(context["inputs"])]
+    out = Path({output!r})
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(f"{{len(data)}} {{sum(len(p) for p in parts)}}\\n")
+    return 0
+"""
+
+
+def generate_project(root: Path, smashlets=50, inputs=10, context_kb=64, chain=1):
+    """
+    Write a synthetic Smash project to `root`.
+
+    Args:
+        smashlets (int): Number of smashlets
+        inputs (int): Input `.txt` files per smashlet
+        context_kb (int): Approximate size of the global `context/data.json`
+        chain (int): Smashlets per dependency chain. Each one writes an
+            input of the next, so chains run in order; 1 means independent.
+
+    Returns:
+        dict: The parameters used
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    (root / ".smash").mkdir(exist_ok=True)
+    (root / "context").mkdir(exist_ok=True)
+
+    row = {"title": "x" * 40, "tags": ["a", "b", "c"], "n": 0}
+    rows = max(1, context_kb * 1024 // len(json.dumps(row)))
+    (root / "context" / "data.json").write_text(json.dumps([row] * rows))
+
+    dirs = [
+        Path(f"chain_{i // chain:04d}") / f"step_{i % chain:02d}"
+        for i in range(smashlets)
+    ]
+    for i, rel in enumerate(dirs):
+        directory = root / rel
+        directory.mkdir(parents=True, exist_ok=True)
+        for j in range(inputs):
+            (directory / f"input_{j:04d}.txt").write_text(f"{rel} {j}\n" * 20)
+
+        last_in_chain = i % chain == chain - 1 or i == smashlets - 1
+        output = rel / "result.out" if last_in_chain else dirs[i + 1] / "prev.txt"
+        (directory / "smashlet.py").write_text(
+            SMASHLET_TEMPLATE.format(output=output.as_posix())
+        )
+
+    return {
+        "smashlets": smashlets,
+        "inputs": inputs,
+        "context_kb": context_kb,
+        "chain": chain,
+    }
+
+
+def smash(root: Path, *args):
+    """
+    Run the Smash CLI in `root` and return the wall time in seconds.
+    """
+    env = dict(os.environ, SMASH_NO_DAEMON="1")
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")])
+    )
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "smash_core.cli", *args],
+        cwd=root,
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def timed(func, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def summarize(runs):
+    return {
+        "runs": [round(r, 4) for r in runs],
+        "min": round(min(runs), 4),
+        "median": round(statistics.median(runs), 4),
+    }
+
+
+def run_benchmarks(root: Path, params: dict, repeat=3) -> dict:
+    """
+    Time every scenario on a project generated with `params`.
+    """
+    generate_project(root, **params)
+    results = {}
+
+    results["discovery_cold"] = timed(
+        lambda: walk_smashlets(root, use_index=False), repeat
+    )
+    results["first_build"] = [smash(root, "build")]
+    results["discovery"] = timed(lambda: walk_smashlets(root), repeat)
+    results["noop_build"] = [smash(root, "build") for _ in range(repeat)]
+    results["status"] = [smash(root, "status") for _ in range(repeat)]
+
+    changed = sorted(root.glob("chain_*/step_00/input_0000.txt"))[0]
+    one_changed = []
+    for i in range(repeat):
+        changed.write_text(f"changed {i}\n")
+        one_changed.append(smash(root, "build"))
+    results["one_changed"] = one_changed
+
+    results["forced_build"] = [smash(root, "run") for _ in range(repeat)]
+
+    return {
+        "meta": {
+            "params": params,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": int(time.time()),
+        },
+        "results": {name: summarize(runs) for name, runs in results.items()},
+    }
+
+
+def compare(old: dict, new: dict, threshold=THRESHOLD):
+    """
+    Compare two benchmark results by median time.
+
+    Returns:
+        list of (scenario, old median, new median, change, regressed)
+    """
+    rows = []
+    for name, result in new["results"].items():
+        before = old["results"].get(name)
+        if not before or not before["median"]:
+            continue
+        change = (result["median"] - before["median"]) / before["median"]
+        rows.append(
+            (name, before["median"], result["median"], change, change > threshold)
+        )
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Smash engine benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_project_args(p):
+        p.add_argument("--smashlets", type=int, default=50)
+        p.add_argument("--inputs", type=int, default=10, help="Inputs per smashlet")
+        p.add_argument("--context-kb", type=int, default=64)
+        p.add_argument("--chain", type=int, default=1, help="Dependency chain length")
+
+    gen = sub.add_parser("generate", help="Write a synthetic project")
+    gen.add_argument("path", type=Path)
+    add_project_args(gen)
+
+    run = sub.add_parser("run", help="Generate a project and time each scenario")
+    add_project_args(run)
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--output", type=Path, help="Write results as JSON")
+    run.add_argument("--keep", action="store_true", help="Keep the project")
+
+    cmp_parser = sub.add_parser("compare", help="Flag regressions between runs")
+    cmp_parser.add_argument("old", type=Path)
+    cmp_parser.add_argument("new", type=Path)
+    cmp_parser.add_argument("--threshold", type=float, default=THRESHOLD)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        old = json.loads(args.old.read_text())
+        new = json.loads(args.new.read_text())
+        rows = compare(old, new, args.threshold)
+        for name, before, after, change, regressed in rows:
+            flag = "  ❌ regression" if regressed else ""
+            print(f"{name:16} {before:8.3f}s → {after:8.3f}s {change:+7.1%}{flag}")
+        return 1 if any(row[-1] for row in rows) else 0
+
+    params = {
+        "smashlets": args.smashlets,
+        "inputs": args.inputs,
+        "context_kb": args.context_kb,
+        "chain": args.chain,
+    }
+
+    if args.command == "generate":
+        generate_project(args.path, **params)
+        print(f"Generated {args.smashlets} smashlets in {args.path}")
+        return 0
+
+    root = Path(tempfile.mkdtemp(prefix="smash-bench-"))
+    try:
+        report = run_benchmarks(root / "project", params, args.repeat)
+    finally:
+        if args.keep:
+            print(f"Project kept in {root / 'project'}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    for name, result in report["results"].items():
+        print(f"{name:16} median {result['median']:.3f}s  min {result['min']:.3f}s")
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
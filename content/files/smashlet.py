@@ -110,13 +110,16 @@ def run(context):
             parent = rel.parts[0] if len(rel.parts) > 1 else "."
             grouped.setdefault(parent, []).append(rel)
 
+    # Parse all files up front, spread over the available CPUs.
+    files = [root / file for group in grouped.values() for file in group]
+    hints = dict(zip(files, smash.parallel_map(get_hint, files, context)))
+
     # Build the file overview content.
     lines = ["# 🗂 File Overview", ""]
     for group in sorted(grouped):
         lines.append(f"## {group}/")
         for file in sorted(grouped[group]):
-            full = root / file
-            hint = get_hint(full)
+            hint = hints[root / file]
             lines.append(f"- `{file}`")
             for h in hint:
                 lines.append(f"    {h}")
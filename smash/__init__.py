@@ -12,16 +12,48 @@ from smash_core.helpers import (
     ensure_dir,
     flatten_json_dir,
     write_output_if_changed,
+    write_output_if_changed_async,
 )
 
 from smash_core.files import (
     read,
     write,
     resolve,
+    read_bytes,
+    open_file,
+    read_mmap,
+    read_async,
+    read_bytes_async,
+    write_async,
 )
 
+from smash_core.parallel import parallel_map
+
 from smash_core.log import log as log_raw
 
 # Aliases for consistent naming in smashlets
 log_step = smash_log
 log = log_raw
+
+# What `from smash import *` brings in; nothing here shadows a builtin
+__all__ = [
+    "read_text_files",
+    "write_output",
+    "smash_log",
+    "ensure_dir",
+    "flatten_json_dir",
+    "write_output_if_changed",
+    "write_output_if_changed_async",
+    "read",
+    "write",
+    "resolve",
+    "read_bytes",
+    "open_file",
+    "read_mmap",
+    "read_async",
+    "read_bytes_async",
+    "write_async",
+    "parallel_map",
+    "log_step",
+    "log",
+]
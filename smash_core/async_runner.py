@@ -0,0 +1,97 @@
+"""
+Runs coroutine smashlets (`async def run(context)`) on one event loop per build.
+
+The loop lives in a background thread. Build workers hand it their
+smashlets' coroutines and wait for the result, so while one smashlet waits
+on a service, the others keep going. How many async smashlets are in
+flight at once is capped by the scheduler (see `scheduler.run_graph`) with
+`"async_jobs"` in `.smash/config.json`.
+
+Note: This module is internal and not part of the public Smash API.
+"""
+
+import asyncio
+import functools
+import inspect
+import threading
+
+
+class EventLoopThread:
+    """
+    An event loop running in a daemon thread, started on first use.
+
+    Thread-safe: any thread may call `run()`.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="smash-async", daemon=True
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def run(self, awaitable):
+        """
+        Await `awaitable` on the loop and return its result, blocking the caller.
+        """
+        future = asyncio.run_coroutine_threadsafe(_wait(awaitable), self._start())
+        return future.result()
+
+    def close(self):
+        """
+        Cancel whatever is still scheduled and stop the loop.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(_cancel_all(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+async def _wait(awaitable):
+    return await awaitable
+
+
+async def _cancel_all():
+    current = asyncio.current_task()
+    tasks = [t for t in asyncio.all_tasks() if t is not current]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def in_thread(func, *args, **kwargs):
+    """
+    Run a blocking `func(*args, **kwargs)` in the loop's default executor.
+
+    Same as `asyncio.to_thread`, which needs Python 3.9.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+def await_result(value, session=None):
+    """
+    Return `value`, or its result if it is awaitable.
+
+    Awaitables run on the session's event loop, or on a fresh loop without
+    a session.
+    """
+    if not inspect.isawaitable(value):
+        return value
+    if session is not None:
+        return session.event_loop.run(value)
+    return asyncio.run(_wait(value))
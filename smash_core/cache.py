@@ -0,0 +1,287 @@
+"""
+Content-addressed output cache: restores outputs instead of re-running smashlets.
+
+After a successful run of a cached smashlet, its declared outputs are copied
+into `.smash/cache/objects/` (named by their content digest) and recorded
+under a key made from the digests of the smashlet source, its inputs and its
+context files (`context/`, `context.json` and `smash.py`). When a later run
+computes a key that is already cached — after switching branches or
+reverting a change — the outputs are restored and `run()` is skipped.
+
+Caching is opt-in: set `CACHE = True` in a smashlet, or `"cache": true` in
+`.smash/config.json` for every smashlet that declares outputs (`CACHE = False`
+opts one out). The project-wide setting skips smashlets with `RUN = "always"`
+or a `should_run` hook. Forced runs (`smash run`, `smash build --force`)
+always run, and store their outputs as usual. The cache is capped at `"cache_size_mb"` (default 1024);
+least recently used entries are evicted at the end of a build. Outputs are
+restored as copies, or as hardlinks with `"cache_restore": "hardlink"`, which
+is faster but leaves outputs read-only, so smashlets must replace them rather
+than rewrite them in place (`smash.write` does).
+
+Note: This module is internal and not part of the public Smash API.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from smash_core.digests import file_digest
+from smash_core.project import get_project_config, write_json_atomic
+
+CACHE_DIR = "cache"
+STATS_FILE = "stats.json"
+DEFAULT_SIZE_MB = 1024
+
+
+def cache_enabled(smashlet_mod, project_root: Path) -> bool:
+    """
+    Return True if the smashlet's outputs should be cached.
+    """
+    flag = getattr(smashlet_mod, "CACHE", None)
+    if flag is not None:
+        return bool(flag)
+    # Their outputs depend on more than source, inputs and context
+    if getattr(smashlet_mod, "RUN", None) == "always" or callable(
+        getattr(smashlet_mod, "should_run", None)
+    ):
+        return False
+    return bool(get_project_config(project_root).get("cache"))
+
+
+def cache_key(
+    project_root: Path, smashlet_digest: str, context_files, outputs, stat_cache
+):
+    """
+    Combine everything a run's outputs depend on into one key.
+
+    Paths are taken relative to the project root, so a moved checkout
+    hits the same entries.
+
+    Args:
+        smashlet_digest (str): Combined digest of the smashlet and its inputs
+            (`digests.input_digest`)
+        context_files (list of Path): Context files the run could read
+        outputs (list of Path): Declared outputs
+        stat_cache (StatCache): Digest cache for the context files
+
+    Returns:
+        str: A sha1 hex digest
+    """
+
+    def rel(path):
+        return Path(os.path.relpath(path, project_root)).as_posix()
+
+    h = hashlib.sha1(smashlet_digest.encode())
+    for f in sorted(context_files):
+        if f.is_file():
+            h.update(f"\0ctx\0{rel(f)}\0{stat_cache.digest(f)}".encode())
+    for out in sorted(rel(out) for out in outputs):
+        h.update(f"\0out\0{out}".encode())
+    return h.hexdigest()
+
+
+class OutputCache:
+    """
+    Stores and restores smashlet outputs under `.smash/cache/`.
+
+    Thread-safe for parallel builds. Counters and eviction are persisted by
+    `close()`.
+    """
+
+    def __init__(self, project_root: Path):
+        config = get_project_config(project_root)
+        self.project_root = project_root
+        self.root = project_root / ".smash" / CACHE_DIR
+        self.max_bytes = int(config.get("cache_size_mb", DEFAULT_SIZE_MB)) * 1024**2
+        self.hardlink = config.get("cache_restore") == "hardlink"
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self._lock = threading.Lock()
+
+    def _entry_path(self, key):
+        return self.root / "entries" / f"{key}.json"
+
+    def _object_path(self, digest):
+        return self.root / "objects" / digest[:2] / digest
+
+    def _rel(self, path: Path) -> str:
+        return Path(os.path.relpath(path, self.project_root)).as_posix()
+
+    def restore(self, key, outputs):
+        """
+        Restore the outputs cached under `key`.
+
+        Returns:
+            dict or None: The cached entry if every output was restored, else None
+        """
+        entry_path = self._entry_path(key)
+        try:
+            entry = json.loads(entry_path.read_text())
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        wanted = {self._rel(out) for out in outputs}
+        if set(entry["outputs"]) != wanted or not all(
+            self._object_path(d).is_file() for d in entry["outputs"].values()
+        ):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        for rel, digest in entry["outputs"].items():
+            self._place(self._object_path(digest), self.project_root / rel)
+
+        os.utime(entry_path)  # Mark as recently used
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def _place(self, source: Path, target: Path):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{target.name}.", dir=target.parent)
+        os.close(fd)
+        try:
+            linked = False
+            if self.hardlink:
+                os.unlink(tmp)
+                try:
+                    os.link(source, tmp)
+                    linked = True
+                except OSError:  # e.g. across devices; fall back to a copy
+                    pass
+            if not linked:
+                shutil.copyfile(source, tmp)
+                os.chmod(tmp, 0o644)
+            os.replace(tmp, target)
+            os.utime(target)  # Restored outputs are as fresh as a run's
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def store(self, key, outputs, result=None):
+        """
+        Copy the outputs into the cache under `key`. Missing outputs skip caching.
+        """
+        if not outputs or not all(Path(out).is_file() for out in outputs):
+            return
+
+        stored = {}
+        for out in outputs:
+            digest = file_digest(out)
+            obj = self._object_path(digest)
+            if not obj.exists():
+                obj.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(prefix=".obj.", dir=obj.parent)
+                os.close(fd)
+                shutil.copyfile(out, tmp)
+                os.chmod(tmp, 0o444)
+                os.replace(tmp, obj)
+            stored[self._rel(out)] = digest
+
+        entry_path = self._entry_path(key)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(
+            entry_path,
+            {"outputs": stored, "result": result, "stored_on": int(time.time())},
+        )
+        with self._lock:
+            self.stored += 1
+
+    def _entries(self):
+        entries = []
+        for path in (self.root / "entries").glob("*.json"):
+            try:
+                data = json.loads(path.read_text())
+                entries.append((path.stat().st_mtime, path, data["outputs"]))
+            except (OSError, ValueError, KeyError):
+                continue
+        return sorted(entries, key=lambda e: e[0])
+
+    def _objects(self):
+        objects = {}
+        for path in (self.root / "objects").glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                objects[path.name] = path.stat().st_size
+            except OSError:
+                continue
+        return objects
+
+    def evict(self):
+        """
+        Drop least recently used entries until the cache fits its size cap,
+        then delete objects no entry refers to.
+        """
+        entries = self._entries()
+        objects = self._objects()
+
+        def referenced(items):
+            return {d for _, _, outputs in items for d in outputs.values()}
+
+        live = referenced(entries)
+        size = sum(objects.get(d, 0) for d in live)
+        while entries and size > self.max_bytes:
+            _, path, _ = entries.pop(0)
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            live = referenced(entries)
+            size = sum(objects.get(d, 0) for d in live)
+
+        for digest in set(objects) - live:
+            try:
+                self._object_path(digest).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        """
+        Return sizes and lifetime hit/miss counts.
+        """
+        counters = self._load_counters()
+        objects = self._objects()
+        return {
+            "entries": len(self._entries()),
+            "objects": len(objects),
+            "bytes": sum(objects.values()),
+            "max_bytes": self.max_bytes,
+            "hits": counters["hits"] + self.hits,
+            "misses": counters["misses"] + self.misses,
+        }
+
+    def _load_counters(self):
+        try:
+            counters = json.loads((self.root / STATS_FILE).read_text())
+            return {"hits": int(counters["hits"]), "misses": int(counters["misses"])}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {"hits": 0, "misses": 0}
+
+    def close(self):
+        """
+        Persist hit/miss counters and evict if anything was stored.
+        """
+        with self._lock:
+            hits, misses, stored = self.hits, self.misses, self.stored
+            self.hits = self.misses = self.stored = 0
+        if not (hits or misses or stored) or not self.root.parent.is_dir():
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        counters = self._load_counters()
+        counters["hits"] += hits
+        counters["misses"] += misses
+        write_json_atomic(self.root / STATS_FILE, counters)
+        if stored:
+            self.evict()
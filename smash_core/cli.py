@@ -1,13 +1,19 @@
 """
 Command-line entry point for Smash.
 
-Parses arguments and dispatches to subcommands like `init`, `build`, `add`, `run`, and `status`.
+Parses arguments and dispatches to subcommands like `init`, `build`, `add`, `run`, `status` and `watch`.
 This is the main script run when you type `smash` in the terminal.
 """
 
 import argparse
+import os
+import sys
 from smash_core.commands import run_init, run_build, run_force, run_add_smashlet
+from smash_core.commands.cache import run_cache
+from smash_core.commands.stats import run_stats
 from smash_core.commands.status import run_status
+from smash_core.commands.watch import run_watch
+from smash_core.project import find_project_root
 
 
 def main():
@@ -16,10 +22,14 @@ def main():
 
     Commands:
       smash init         → Initialize a new Smash project
-      smash build        → Run the build process (default)
+      smash build        → Run the build process (default, `--jobs N` for parallel)
       smash add [...]    → Create a new smashlet file
       smash run [...]    → Force-run smashlets
       smash status       → Show which smashlets would run (dry-run)
+      smash stats        → Show run durations and slowdowns per smashlet
+      smash cache [...]  → Show output cache statistics, or clear it
+      smash watch        → Rebuild affected smashlets when files change
+      smash daemon [...] → Start, stop or check the resident build daemon
     """
     parser = argparse.ArgumentParser(
         prog="smash", description="Smash – build system for content"
@@ -28,8 +38,34 @@ def main():
 
     subparsers = parser.add_subparsers(dest="command")
 
-    subparsers.add_parser("init", help="Initialize a new Smash project")
-    subparsers.add_parser("build", help="Run the build process")
+    init_parser = subparsers.add_parser("init", help="Initialize a new Smash project")
+    init_parser.add_argument(
+        "--state",
+        choices=["json", "sqlite"],
+        help="Where to keep the runlog (sqlite migrates runlog.json)",
+    )
+    build_parser = subparsers.add_parser("build", help="Run the build process")
+    build_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Run up to N independent smashlets at once (0 = one per CPU)",
+    )
+    build_parser.add_argument(
+        "--hash",
+        action="store_const",
+        const="hash",
+        dest="freshness",
+        help="Decide freshness by content digests instead of mtimes",
+    )
+    build_parser.add_argument(
+        "--trace",
+        nargs="?",
+        const=True,
+        metavar="FILE",
+        help="Write a Chrome/Perfetto trace of the build (default .smash/trace.json)",
+    )
 
     add_parser = subparsers.add_parser("add", help="Create a new smashlet")
     add_parser.add_argument("name", nargs="?", default=None)
@@ -40,14 +76,57 @@ def main():
 
     run_parser = subparsers.add_parser("run", help="Force run smashlets")
     run_parser.add_argument("smashlet_path", nargs="?")
+    run_parser.add_argument("-j", "--jobs", type=int, default=1)
+
+    status_parser = subparsers.add_parser(
+        "status", help="Show smashlet run status (dry run)"
+    )
+    status_parser.add_argument("--json", action="store_true", help="Output JSON")
+    status_parser.add_argument(
+        "--why", action="store_true", help="Explain why each smashlet would run"
+    )
+
+    stats_parser = subparsers.add_parser(
+        "stats", help="Show run durations and slowdowns per smashlet"
+    )
+    stats_parser.add_argument("--json", action="store_true", help="Output JSON")
+
+    cache_parser = subparsers.add_parser(
+        "cache", help="Show output cache statistics, or clear it"
+    )
+    cache_parser.add_argument(
+        "action", nargs="?", default="stats", choices=["stats", "clear"]
+    )
+    cache_parser.add_argument("--json", action="store_true", help="Output JSON")
+
+    watch_parser = subparsers.add_parser(
+        "watch", help="Rebuild affected smashlets when files change"
+    )
+    watch_parser.add_argument(
+        "--poll", action="store_true", help="Poll for changes instead of inotify"
+    )
+    watch_parser.add_argument("-j", "--jobs", type=int, default=1)
+    watch_parser.add_argument(
+        "--hash", action="store_const", const="hash", dest="freshness"
+    )
 
-    subparsers.add_parser("status", help="Show smashlet run status (dry run)")
+    daemon_parser = subparsers.add_parser(
+        "daemon", help="Keep a warm build process running for this project"
+    )
+    daemon_parser.add_argument("action", choices=["start", "stop", "status"])
 
     args = parser.parse_args()
 
+    if args.command in (None, "build", "run", "status"):
+        code = forward_to_daemon(args)
+        if code is not None:
+            sys.exit(code)
+
     if args.command == "init":
-        run_init()
-    elif args.command == "build" or args.command is None:
+        run_init(state=args.state)
+    elif args.command == "build":
+        run_build(jobs=args.jobs, freshness=args.freshness, trace=args.trace)
+    elif args.command is None:
         run_build()
     elif args.command == "add":
         run_add_smashlet(
@@ -58,12 +137,71 @@ def main():
             context_mode=args.context,
         )
     elif args.command == "run":
-        run_force(args.smashlet_path)
+        run_force(args.smashlet_path, jobs=args.jobs)
     elif args.command == "status":
-        run_status()
+        run_status(as_json=args.json, why=args.why)
+    elif args.command == "stats":
+        run_stats(as_json=args.json)
+    elif args.command == "cache":
+        run_cache(args.action, as_json=args.json)
+    elif args.command == "watch":
+        run_watch(poll=args.poll, jobs=args.jobs, freshness=args.freshness)
+    elif args.command == "daemon":
+        run_daemon(args.action)
     else:
         parser.print_help()
 
 
+def forward_to_daemon(args):
+    """
+    Run the command in the project's daemon, if one is running.
+
+    Returns the exit code, or None to run the command in this process.
+    Set SMASH_NO_DAEMON=1 to always build in-process.
+    """
+    if os.environ.get("SMASH_NO_DAEMON"):
+        return None
+    project_root = find_project_root()
+    if not project_root:
+        return None
+
+    from smash_core.daemon import daemon_request
+
+    request = {"command": args.command or "build", "args": {}}
+    if args.command in ("build", "run"):
+        request["args"]["jobs"] = args.jobs
+    if args.command == "build":
+        request["args"]["freshness"] = args.freshness
+        request["args"]["trace"] = args.trace
+    if args.command == "run":
+        request["args"]["smashlet_path"] = args.smashlet_path
+    if args.command == "status":
+        request["args"]["json"] = args.json
+        request["args"]["why"] = args.why
+    return daemon_request(project_root, request)
+
+
+def run_daemon(action):
+    """
+    Handle `smash daemon start|stop|status`.
+    """
+    from smash_core.daemon import daemon_request, start_daemon, stop_daemon
+    from smash_core.log import log
+
+    project_root = find_project_root()
+    if not project_root:
+        log("❌ Not inside a Smash project (missing .smash/)", level="error")
+        return
+
+    if action == "start":
+        start_daemon(project_root)
+    elif action == "stop":
+        stop_daemon(project_root)
+    elif daemon_request(project_root, {"command": "ping"}) is None:
+        log("ℹ️ No Smash daemon running.")
+    else:
+        log("✅ Smash daemon running.")
+
+
 if __name__ == "__main__":
     main()
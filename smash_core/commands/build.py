@@ -1,52 +1,219 @@
 """
 Runs the main Smash build loop and powers the `smash run` command.
 
-Discovers all smashlets, checks if they should run, and executes them in modification-time order.
+Discovers all smashlets, links them into a dependency graph by matching declared
+outputs against `INPUT_GLOB`, and runs them in topological order in one pass.
+With `--jobs N`, independent smashlets run concurrently on N worker threads.
+Smashlets with `async def run` wait side by side on one event loop, up to
+`"async_jobs"` (config) at once.
 Used by the public CLI, but not part of the importable API.
 """
 
+import os
+import time
 from pathlib import Path
-from smash_core.project import find_project_root
-from smash_core.smashlets import discover_smashlets, should_run, run_smashlet, touch
+from smash_core.project import async_jobs, find_project_root
+from smash_core.smashlets import should_run, run_smashlet
+from smash_core.discovery import walk_smashlets
 from smash_core.context_loader import build_context
-from smash_core.log import log
+from smash_core.fingerprint import (
+    clear_fingerprint,
+    fingerprint_matches,
+    save_fingerprint,
+)
+from smash_core.scheduler import (
+    declared_outputs,
+    find_dependencies,
+    is_async,
+    run_graph,
+    topological_order,
+)
+from smash_core.session import BuildSession
+from smash_core.trace import TRACE_FILE, Tracer
+from smash_core.log import log, buffered_output, routed_stdout
 
-MAX_ITERATIONS = 10  # Prevent infinite build loops
+MAX_ITERATIONS = 10  # Prevent infinite loops from smashlets without declared outputs
 
 
-def run_build(force=False):
+def run_build(force=False, jobs=1, freshness=None, session=None, trace=None):
     """
-    Run the full Smash build loop.
+    Run the full Smash build.
 
     - Discovers all smashlets in the project
-    - Runs each in mtime order
-    - Repeats until no smashlet returns `1`
-    - Stops after MAX_ITERATIONS to avoid infinite loops
+    - Orders them so producers run before the smashlets consuming their outputs,
+      falling back to mtime order between unrelated smashlets
+    - Runs the graph once; dependency cycles are reported as errors
+    - Smashlets without declared outputs that return `1` are touched and
+      trigger another pass, up to MAX_ITERATIONS
+    - A clean build records a fingerprint of what it depended on; while it
+      still matches, the next build stops after stat'ing those files
+      (see `fingerprint.py`)
+
+    Each smashlet module is loaded once and reused across passes.
+
+    Args:
+        force (bool): Run every smashlet regardless of freshness
+        jobs (int): Worker threads for independent smashlets. 0 means one per CPU.
+        freshness (str, optional): "hash" or "mtime" to override every
+            smashlet's FRESHNESS constant
+        session (BuildSession, optional): Reuse warm state, e.g. from the daemon
+        trace (str or True, optional): Write a Chrome trace of the build to
+            this path, or to `.smash/trace.json` if True
     """
     project_root = find_project_root()
     if not project_root:
         log("❌ Not inside a Smash project (missing .smash/)", level="error")
         return
 
-    context = build_context(project_root)
-    smashlets = discover_smashlets(project_root)
+    if session is not None:
+        freshness = session.freshness
+
+    # Nothing the last clean build depended on changed: no need to look closer
+    if not force and not trace and fingerprint_matches(project_root, freshness):
+        log("✅ Nothing changed since the last build")
+        if session is not None:
+            session.close()
+        return
 
-    log(f"🔍 Found {len(smashlets)} smashlet(s)")
+    clear_fingerprint(project_root)
+    if session is None:
+        session = BuildSession(project_root, freshness=freshness)
+    if trace is True:
+        trace = project_root / ".smash" / TRACE_FILE
+    if trace:
+        session.tracer = Tracer()
 
-    iterations = 0
-    while True:
-        ran_any = False
+    try:
+        started = time.time_ns()
+        smashlets = build_project(project_root, session, force=force, jobs=jobs)
+    finally:
+        session.close()
+        if trace:
+            session.tracer.save(trace)
+            log(f"📈 Trace written to {trace}")
+
+    if smashlets is not None:
+        save_fingerprint(project_root, smashlets, session, started)
+
+
+def build_project(project_root, session, force=False, jobs=1):
+    """
+    Discover, plan and run all smashlets with the given session.
+
+    Returns:
+        list or None: The smashlets in build order, if the build finished
+        cleanly (no cycle, no failed run, settled within MAX_ITERATIONS)
+    """
+    tracer = session.tracer
+    context = session.context
+    with tracer.span("discover"):
+        smashlets, scan = walk_smashlets(project_root, snapshot=session.snapshot)
+
+    log(
+        f"🔍 Found {len(smashlets)} smashlet(s) "
+        f"(scanned {scan['dirs_visited']} directories)"
+    )
+
+    with tracer.span("plan"):
+        plan = plan_build(smashlets, session)
+    if plan["cycle"]:
+        log_cycle(plan["cycle"], project_root)
+        return None
 
-        for smashlet in sorted(smashlets, key=lambda p: p.stat().st_mtime):
-            if force or should_run(smashlet, project_root):
-                log(f"⚙️  Running: {smashlet.relative_to(project_root)}")
-                changed = run_smashlet(smashlet, project_root, context)
+    settled = execute_plan(
+        plan, plan["order"], context, session, force=force, jobs=jobs
+    )
+    if not settled or session.failed:
+        return None
+    return plan["order"]
 
-                if changed:
-                    touch(smashlet)
-                    ran_any = True
+
+def plan_build(smashlets, session) -> dict:
+    """
+    Work out the order smashlets must run in.
+
+    Returns:
+        dict with:
+        - "order": smashlets in topological order, ties in mtime order
+        - "deps": {smashlet: set(upstream smashlets)}
+        - "opaque": smashlets that declare no outputs
+        - "cycle": list of smashlets forming a cycle, or None
+    """
+    outputs = {s: declared_outputs(s, session) for s in smashlets}
+    deps = find_dependencies(smashlets, session, outputs)
+    opaque = {s for s in smashlets if not outputs[s]}
+    order, cycle = topological_order(
+        sorted(smashlets, key=session.snapshot.mtime), deps
+    )
+    return {"order": order, "deps": deps, "opaque": opaque, "cycle": cycle}
+
+
+def log_cycle(cycle, project_root):
+    chain = " → ".join(str(p.relative_to(project_root)) for p in cycle)
+    log(f"❌ Dependency cycle between smashlets: {chain}", level="error")
+
+
+def execute_plan(plan, order, context, session, force=False, jobs=1):
+    """
+    Check and run `order` (a subset of the plan, in plan order) until settled.
+
+    Returns:
+        int: Number of passes made, or 0 if the build did not settle
+    """
+    project_root = session.project_root
+    jobs = jobs or os.cpu_count() or 1
+    state = {"force": force}
+
+    # Share the CPUs between smashlets running side by side (see parallel_map)
+    if jobs > 1:
+        context = {**context, "workers": max(1, (os.cpu_count() or 1) // jobs)}
+
+    # Coroutine smashlets wait side by side on the session's event loop
+    async_limit = async_jobs(project_root)
+    async_nodes = (
+        {s for s in order if is_async(s, session)} if async_limit > 1 else set()
+    )
+
+    tracer = session.tracer
+
+    def build_one(smashlet):
+        rel = smashlet.relative_to(project_root)
+        with buffered_output(), tracer.span(str(rel), cat="smashlet"):
+            with tracer.span("should_run", cat="smashlet"):
+                due = state["force"] or should_run(smashlet, project_root, session)
+            if due:
+                log(f"⚙️  Running: {rel}")
+                changed = run_smashlet(
+                    smashlet, project_root, context, session, force=state["force"]
+                )
+                forget_outputs(smashlet, plan, session)
+
+                # Without declared outputs, downstream smashlets can't see what
+                # changed; touching the smashlet re-checks it in another pass.
+                if changed and smashlet in plan["opaque"]:
+                    session.modules.touch(smashlet)
+                    return True
+        return False
+
+    iterations = 0
+    while True:
+        # Files may have changed since the last pass; look at them afresh
+        session.snapshot.clear()
+        with tracer.span(f"pass {iterations + 1}", cat="pass"):
+            if jobs > 1 or async_nodes:
+                with routed_stdout():
+                    results = run_graph(
+                        order, plan["deps"], build_one, jobs, async_nodes, async_limit
+                    )
+                ran_any = any(results.values())
+            else:
+                ran_any = False
+                for smashlet in order:
+                    if build_one(smashlet):
+                        ran_any = True
 
         iterations += 1
+        state["force"] = False
 
         if not ran_any:
             log(f"✅ Build complete in {iterations} pass(es)")
@@ -57,10 +224,26 @@ def run_build(force=False):
                 "❌ Build exceeded max iterations. Possible infinite loop.",
                 level="error",
             )
-            break
+            return 0
+
+    return iterations
+
+
+def forget_outputs(smashlet, plan, session):
+    """
+    Drop a smashlet's outputs from the pass snapshot after it ran.
+
+    Smashlets that declare no outputs may have written anything, so the
+    whole snapshot is cleared for them.
+    """
+    if smashlet in plan["opaque"]:
+        session.snapshot.clear()
+        return
+    for out in declared_outputs(smashlet, session):
+        session.snapshot.invalidate(out)
 
 
-def run_force(smashlet_path=None):
+def run_force(smashlet_path=None, jobs=1, freshness=None, session=None):
     """
     Force-run a specific smashlet, or all smashlets if none is given.
     """
@@ -69,15 +252,20 @@ def run_force(smashlet_path=None):
         log("❌ Not inside a Smash project (missing .smash/)", level="error")
         return
 
-    context = build_context(project_root)
-
     if smashlet_path:
         target = Path(smashlet_path)
         if not target.exists():
             log(f"❌ Smashlet not found: {smashlet_path}", level="error")
             return
         log(f"⚙️  Force running: {target}")
-        run_smashlet(target, project_root, context)
+        clear_fingerprint(project_root)
+        if session is None:
+            run_smashlet(target, project_root, build_context(project_root), force=True)
+        else:
+            run_smashlet(
+                target.resolve(), project_root, session.context, session, force=True
+            )
+            session.close()
         return
 
-    run_build(force=True)
+    run_build(force=True, jobs=jobs, freshness=freshness, session=session)
@@ -0,0 +1,54 @@
+"""
+Implements the `smash cache` command: inspect or empty the output cache.
+
+`smash cache stats` reports the cache size and hit rate; `smash cache clear`
+removes every stored output.
+"""
+
+import json
+import shutil
+
+from smash_core.cache import OutputCache
+from smash_core.log import log
+from smash_core.project import find_project_root
+
+
+def _megabytes(size):
+    return f"{size / 1024**2:.1f} MB"
+
+
+def run_cache(action="stats", as_json=False):
+    """
+    Print output cache statistics, or clear the cache.
+    """
+    project_root = find_project_root()
+    if not project_root:
+        log("❌ Not inside a Smash project (missing .smash/)", level="error")
+        return
+
+    cache = OutputCache(project_root)
+
+    if action == "clear":
+        shutil.rmtree(cache.root, ignore_errors=True)
+        log("🧹 Output cache cleared.")
+        return
+
+    stats = cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else None
+
+    if as_json:
+        print(json.dumps(stats, indent=2))
+        return
+
+    log(
+        f"📦 {stats['entries']} cached run(s), {stats['objects']} file(s), "
+        f"{_megabytes(stats['bytes'])} of {_megabytes(stats['max_bytes'])}"
+    )
+    if lookups:
+        log(
+            f"♻️ {stats['hits']} hit(s), {stats['misses']} miss(es) "
+            f"({stats['hit_rate']:.0%} hit rate)"
+        )
+    else:
+        log("No cache lookups recorded yet.")
@@ -1,28 +1,45 @@
 """
 Handles the `smash init` command by creating a new `.smash/` directory.
 
+`smash init --state sqlite` also switches the project's runlog to the SQLite
+backend, migrating an existing `runlog.json`.
+
 Used by the public CLI to initialize a Smash project. Not part of the importable API.
 """
 
 from pathlib import Path
 from smash_core.log import log
+from smash_core.project import open_runlog, update_project_config
+
+STATE_BACKENDS = ["json", "sqlite"]
 
 
-def run_init():
+def run_init(state=None):
     """
     Initialize a new Smash project by creating a .smash/ directory.
 
-    If the directory already exists, informs the user without modifying it.
+    If the directory already exists, informs the user without modifying it,
+    unless `state` is given to switch the runlog backend ("json" or "sqlite").
     """
     project_root = Path.cwd()
     smash_dir = project_root / ".smash"
 
     if smash_dir.exists():
-        log("✅ Project already initialized.")
-        return
-
-    try:
-        smash_dir.mkdir()
-        log("✅ Initialized new Smash project.")
-    except Exception as e:
-        log(f"❌ Failed to create .smash/: {e}", level="error")
+        if not state:
+            log("✅ Project already initialized.")
+            return
+    else:
+        try:
+            smash_dir.mkdir()
+            log("✅ Initialized new Smash project.")
+        except Exception as e:
+            log(f"❌ Failed to create .smash/: {e}", level="error")
+            return
+
+    if state:
+        if state not in STATE_BACKENDS:
+            log(f"❌ Unknown state backend: {state}", level="error")
+            return
+        update_project_config(project_root, state=state)
+        open_runlog(project_root).close()
+        log(f"✅ Using {state} state backend.")
@@ -0,0 +1,140 @@
+"""
+Implements the `smash stats` command: run durations per smashlet from the runlog.
+
+Reports run count, p50/p95/max and total duration for each smashlet, and flags
+smashlets whose latest runs are much slower than their earlier ones.
+"""
+
+import json
+import statistics
+from pathlib import Path
+
+from smash_core.log import log
+from smash_core.project import find_project_root, open_runlog
+
+# Latest runs compared against the rest of the history
+RECENT_RUNS = 3
+# Earlier runs needed before a smashlet can be flagged
+MIN_BASELINE_RUNS = 5
+# Flag when the recent median exceeds the baseline median by this factor...
+REGRESSION_FACTOR = 1.5
+# ...and by at least this many seconds, so tiny runs don't trigger on noise
+REGRESSION_MIN_SECONDS = 0.05
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of a non-empty list of numbers.
+    """
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def regression(durations):
+    """
+    Compare the latest runs with the earlier ones.
+
+    Returns:
+        dict or None: {"baseline", "recent", "ratio"} medians if the recent
+        runs are significantly slower, else None
+    """
+    recent, baseline = durations[-RECENT_RUNS:], durations[:-RECENT_RUNS]
+    if len(recent) < RECENT_RUNS or len(baseline) < MIN_BASELINE_RUNS:
+        return None
+
+    before = statistics.median(baseline)
+    after = statistics.median(recent)
+    if after - before < REGRESSION_MIN_SECONDS or after < before * REGRESSION_FACTOR:
+        return None
+    return {
+        "baseline": round(before, 3),
+        "recent": round(after, 3),
+        "ratio": round(after / before, 2) if before else None,
+    }
+
+
+def smashlet_stats(entry, history) -> dict:
+    """
+    Summarize one smashlet's runlog entry and run history.
+    """
+    durations = [h["duration"] for h in history if h.get("duration") is not None]
+    stats = {
+        "runs": entry.get("runs", len(history)),
+        "last_run": entry.get("last_run"),
+        "timed_runs": len(durations),
+        "p50": None,
+        "p95": None,
+        "max": None,
+        "total": None,
+        "regression": None,
+    }
+    if durations:
+        stats.update(
+            {
+                "p50": percentile(durations, 50),
+                "p95": percentile(durations, 95),
+                "max": max(durations),
+                "total": round(sum(durations), 3),
+                "regression": regression(durations),
+            }
+        )
+    return stats
+
+
+def collect_stats(project_root: Path) -> dict:
+    """
+    Return {smashlet path relative to the root: stats} for every smashlet
+    in the runlog.
+    """
+    runlog = open_runlog(project_root)
+    try:
+        result = {}
+        for key, entry in runlog.entries.items():
+            path = Path(key)
+            try:
+                name = path.relative_to(project_root).as_posix()
+            except ValueError:
+                name = str(path)
+            result[name] = smashlet_stats(entry, runlog.history(path))
+        return dict(sorted(result.items()))
+    finally:
+        runlog.close()
+
+
+def _seconds(value):
+    return "-" if value is None else f"{value:.3f}s"
+
+
+def run_stats(as_json=False):
+    """
+    Print duration statistics for each smashlet, as a table or JSON.
+    """
+    project_root = find_project_root()
+    if not project_root:
+        log("❌ Not inside a Smash project (missing .smash/)", level="error")
+        return
+
+    stats = collect_stats(project_root)
+
+    if as_json:
+        print(json.dumps({"smashlets": stats}, indent=2))
+        return
+
+    if not stats:
+        log("No runs recorded yet.")
+        return
+
+    for name, s in stats.items():
+        log(
+            f"📊 {name} — {s['runs']} run(s), p50 {_seconds(s['p50'])}, "
+            f"p95 {_seconds(s['p95'])}, max {_seconds(s['max'])}, "
+            f"total {_seconds(s['total'])}"
+        )
+        if s["regression"]:
+            r = s["regression"]
+            log(
+                f"🐢 {name} — recent runs take {_seconds(r['recent'])}, "
+                f"up from {_seconds(r['baseline'])}",
+                level="warn",
+            )
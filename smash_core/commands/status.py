@@ -1,102 +1,177 @@
 """
 Implements the `smash status` command to preview which smashlets would run (dry run only).
 
+Status asks the same questions as `smash build`: smashlets are discovered and
+ordered by the build planner, and each one is checked with
+`smashlets.explain_run`, the freshness check the build uses. Nothing is run,
+and the global context (including `smash.py`) is only built if a smashlet's
+`should_run(context)` needs it. If the last clean build's fingerprint still
+matches (see `fingerprint.py`), every smashlet is up to date without a check.
+
+Status is read-only: caches, indexes and the runlog are not written back.
+
 Used by the public CLI to show up-to-date, outdated, or skipped smashlets without executing them.
 """
 
-from pathlib import Path
-import time
-from smash_core.project import find_project_root, get_runlog
-from smash_core.context_loader import build_context
-from smash_core.smashlets import discover_smashlets, load_smashlet_module
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from smash_core.commands.build import log_cycle, plan_build
+from smash_core.discovery import walk_smashlets
+from smash_core.fingerprint import fresh_smashlets
 from smash_core.log import log
+from smash_core.project import find_project_root
+from smash_core.session import BuildSession
+from smash_core.smashlets import explain_run
+
+# Checks are mostly stat() calls, which release the GIL
+STATUS_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+# Smashlets checked per task, so thread hand-offs don't outweigh the checks
+STATUS_BATCH = 50
+
+STATE_LABELS = {
+    "run": "⚙️ {path} — will run",
+    "upstream": "🔁 {path} — may run after its upstream smashlets",
+    "fresh": "✅ {path} — up to date",
+    "waiting": "⏳ {path} — skipped (timeout not reached)",
+    "invalid": "⚠️ {path} — skipped ({reason})",
+    "error": "❌ {path} — skipped ({reason})",
+}
+
+
+def _rel(path, project_root):
+    try:
+        return path.relative_to(project_root).as_posix()
+    except ValueError:
+        return str(path)
+
 
-ONE_MINUTE = 60
-RUN_NEVER = 0
+def collect_status(project_root, session) -> dict:
+    """
+    Work out what `smash build` would do, without running anything.
+
+    Returns:
+        dict with:
+        - "smashlets": {smashlet: decision} in build order (see `explain_run`).
+          Smashlets that are up to date but downstream of one that will run
+          get the state "upstream" and an "upstream" list.
+        - "cycle": smashlets forming a dependency cycle, or None
+    """
+    fresh = fresh_smashlets(project_root, session.freshness)
+    if fresh is not None:
+        decision = {
+            "run": False,
+            "state": "fresh",
+            "reason": "nothing changed since the last clean build",
+            "file": None,
+        }
+        return {"smashlets": {s: dict(decision) for s in fresh}, "cycle": None}
+
+    smashlets, _ = walk_smashlets(
+        project_root, snapshot=session.snapshot, update_index=False
+    )
+    plan = plan_build(smashlets, session)
+    if plan["cycle"]:
+        return {"smashlets": {}, "cycle": plan["cycle"]}
+
+    order = plan["order"]
+
+    def explain(batch):
+        return [explain_run(s, project_root, session) for s in batch]
+
+    batches = [order[i : i + STATUS_BATCH] for i in range(0, len(order), STATUS_BATCH)]
+    with ThreadPoolExecutor(max_workers=STATUS_WORKERS) as pool:
+        results = [d for batch in pool.map(explain, batches) for d in batch]
+    decisions = dict(zip(order, results))
+
+    # In plan order, producers are decided before their consumers
+    for smashlet in order:
+        decision = decisions[smashlet]
+        if decision["state"] != "fresh":
+            continue
+        upstream = sorted(
+            dep
+            for dep in plan["deps"][smashlet]
+            if decisions[dep]["state"] in ("run", "upstream")
+        )
+        if upstream:
+            names = ", ".join(_rel(dep, project_root) for dep in upstream)
+            decision.update(
+                state="upstream",
+                reason=f"will be checked again after {names} runs",
+                upstream=upstream,
+            )
 
+    return {"smashlets": decisions, "cycle": None}
 
-def run_status():
+
+def _json_decision(decision, project_root) -> dict:
+    result = {}
+    for key, value in decision.items():
+        if key == "file" and value is not None:
+            value = _rel(value, project_root)
+        elif key == "upstream":
+            value = [_rel(p, project_root) for p in value]
+        result[key] = value
+    return result
+
+
+def run_status(session=None, as_json=False, why=False):
     """
     Analyze and print the status of each smashlet (dry run).
 
     Possible states:
     - ⚙️ will run (inputs changed)
+    - 🔁 may run, after an upstream smashlet that will run
     - ✅ up to date
     - ⏳ skipped (timeout not reached)
     - ⚠️ skipped (invalid or missing config)
+
+    Args:
+        session (BuildSession, optional): Reuse warm state, e.g. from the
+            daemon. It should be read-only.
+        as_json (bool): Print one JSON document instead of a list
+        why (bool): Explain each decision, naming the file and the timestamp
+            or digest that decided it
     """
     project_root = find_project_root()
     if not project_root:
         log("❌ Not inside a Smash project (missing .smash/)", level="error")
         return
 
-    context = build_context(project_root)
-    runlog = get_runlog(project_root)
-    smashlets = discover_smashlets(project_root)
-
-    for path in sorted(smashlets):
-        rel_path = path.relative_to(project_root)
-        mod = load_smashlet_module(path)
-
-        if not mod:
-            log(f"⚠️ {rel_path} — skipped (failed to load)", level="warn")
-            continue
-
-        run_func = getattr(mod, "run", None)
-        if not callable(run_func):
-            log(f"⚠️ {rel_path} — skipped (no run() function)", level="warn")
-            continue
-
-        input_glob = getattr(mod, "INPUT_GLOB", None)
-        if not input_glob:
-            log(f"⚠️ {rel_path} — skipped (missing INPUT_GLOB)", level="warn")
-            continue
-
-        run_mode = getattr(mod, "RUN", "if_changed")
-        entry = runlog.get(str(path))
-        last_run = entry["last_run"] if entry else RUN_NEVER
-
-        if run_mode == "always":
-            timeout = getattr(mod, "RUN_TIMEOUT", ONE_MINUTE)
-            if timeout and (time.time() - last_run < timeout):
-                log(f"⏳ {rel_path} — skipped (timeout not reached)")
-                continue
-            else:
-                log(f"⚙️ {rel_path} — will run (RUN = 'always')")
-                continue
+    if session is None:
+        session = BuildSession(project_root, read_only=True)
+    try:
+        status = collect_status(project_root, session)
+    finally:
+        session.close()
+
+    if status["cycle"]:
+        if as_json:
+            cycle = [_rel(p, project_root) for p in status["cycle"]]
+            print(json.dumps({"smashlets": {}, "cycle": cycle}, indent=2))
+        else:
+            log_cycle(status["cycle"], project_root)
+        return
 
-        input_files = list(path.parent.glob(input_glob))
+    decisions = status["smashlets"]
 
-        if not input_files:
-            log(f"⚙️ {rel_path} — will run (no matching inputs)")
-            continue
+    if as_json:
+        smashlets = {
+            _rel(path, project_root): _json_decision(decision, project_root)
+            for path, decision in decisions.items()
+        }
+        print(json.dumps({"smashlets": smashlets, "cycle": None}, indent=2))
+        return
 
-        outputs = []
-        if hasattr(mod, "get_outputs"):
-            try:
-                outputs = mod.get_outputs()
-            except Exception:
-                pass
-        elif hasattr(mod, "OUTPUT_FILES"):
-            outputs = [Path(p) for p in mod.OUTPUT_FILES]
-
-        if outputs:
-            if any(not o.exists() for o in outputs):
-                log(f"⚙️ {rel_path} — will run (missing outputs)")
-                continue
-            latest_output = max(o.stat().st_mtime for o in outputs)
-            latest_input = max(
-                [f.stat().st_mtime for f in input_files] + [path.stat().st_mtime]
-            )
-            if latest_input > latest_output:
-                log(f"⚙️ {rel_path} — will run (inputs changed)")
-            else:
-                log(f"✅ {rel_path} — up to date")
-        else:
-            latest = max(
-                [f.stat().st_mtime for f in input_files] + [path.stat().st_mtime]
-            )
-            if latest > last_run:
-                log(f"⚙️ {rel_path} — will run (inputs changed)")
-            else:
-                log(f"✅ {rel_path} — up to date")
+    for path, decision in decisions.items():
+        rel_path = _rel(path, project_root)
+        level = "warn" if decision["state"] in ("invalid", "error") else "info"
+        label = STATE_LABELS[decision["state"]]
+        log(label.format(path=rel_path, reason=decision["reason"]), level=level)
+        if why:
+            prefix = ""
+            if decision["file"] is not None:
+                prefix = f"{_rel(decision['file'], project_root)}: "
+            log(f"    ↳ {prefix}{decision['reason']}", level=level)
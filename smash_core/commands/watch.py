@@ -0,0 +1,162 @@
+"""
+Implements `smash watch`: rebuilds affected smashlets whenever files change.
+
+Runs a normal build first, then waits for changes (inotify, or polling as a
+fallback), debounces bursts, and re-runs only the smashlets a change can
+affect plus everything downstream of them. Discovery results, loaded modules,
+the global context and the runlog stay warm between events.
+
+Used by the public CLI, but not part of the importable API.
+"""
+
+import os
+from pathlib import Path
+
+from smash_core.commands.build import execute_plan, log_cycle, plan_build
+from smash_core.discovery import walk_smashlets
+from smash_core.log import log
+from smash_core.patterns import glob_to_regex
+from smash_core.project import find_project_root
+from smash_core.scheduler import input_glob
+from smash_core.session import BuildSession
+from smash_core.watch import (
+    DEBOUNCE_SECONDS,
+    PollingWatcher,
+    create_watcher,
+    wait_for_changes,
+)
+
+
+def run_watch(
+    poll=False, jobs=1, freshness=None, debounce=DEBOUNCE_SECONDS, max_batches=None
+):
+    """
+    Build once, then keep rebuilding affected smashlets as files change.
+
+    Args:
+        poll (bool): Use the polling watcher even if inotify is available
+        jobs (int): Worker threads, as for `smash build --jobs`
+        freshness (str, optional): "hash" or "mtime" override, as for `smash build`
+        debounce (float): Seconds of quiet that end a burst of changes
+        max_batches (int, optional): Stop after this many change batches (for tests)
+    """
+    project_root = find_project_root()
+    if not project_root:
+        log("❌ Not inside a Smash project (missing .smash/)", level="error")
+        return
+
+    session = BuildSession(project_root, freshness=freshness)
+    context = session.context
+    watcher = None
+
+    try:
+        smashlets, _ = walk_smashlets(project_root)
+        plan = plan_build(smashlets, session)
+        if plan["cycle"]:
+            log_cycle(plan["cycle"], project_root)
+        else:
+            execute_plan(plan, plan["order"], context, session, jobs=jobs)
+        session.flush()
+
+        watcher = create_watcher(project_root, poll=poll)
+        kind = "polling" if isinstance(watcher, PollingWatcher) else "inotify"
+        log(f"👀 Watching {project_root} ({kind}). Press Ctrl+C to stop.")
+
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            changed = wait_for_changes(watcher, debounce=debounce)
+            batches += 1
+
+            if affects_global_context(changed, project_root):
+                session.invalidate_context()
+                context = session.context
+
+            smashlets, _ = walk_smashlets(project_root)
+            plan = plan_build(smashlets, session)
+            if plan["cycle"]:
+                log_cycle(plan["cycle"], project_root)
+                continue
+
+            affected = affected_smashlets(changed, smashlets, project_root, session)
+            targets = with_dependents(affected, plan["deps"])
+            order = [s for s in plan["order"] if s in targets]
+            if not order:
+                continue
+
+            log(f"🔄 {len(changed)} change(s) → checking {len(order)} smashlet(s)")
+            execute_plan(plan, order, context, session, jobs=jobs)
+            session.flush()
+
+    except KeyboardInterrupt:
+        log("👋 Stopped watching.")
+    finally:
+        if watcher is not None:
+            watcher.close()
+        session.close()
+
+
+def affects_global_context(changed, project_root: Path) -> bool:
+    """
+    Check whether a change touches `smash.py` or the project-level `context/` folder.
+    """
+    context_dir = project_root / "context"
+    return any(
+        path == project_root
+        or path == project_root / "smash.py"
+        or path == context_dir
+        or context_dir in path.parents
+        for path in changed
+    )
+
+
+def affected_smashlets(changed, smashlets, project_root: Path, session=None) -> set:
+    """
+    Map changed paths to the smashlets they can affect.
+
+    A smashlet is affected if its own source changed, a path matches its
+    INPUT_GLOB, or its local `context/` folder or `context.json` changed.
+    Changes to global context affect every smashlet.
+    """
+    if affects_global_context(changed, project_root):
+        return set(smashlets)
+
+    affected = set()
+    for smashlet in smashlets:
+        base = smashlet.parent
+        local_context = base / "context"
+        pattern = input_glob(smashlet, session)
+        regex = glob_to_regex(pattern) if pattern else None
+
+        for path in changed:
+            if (
+                path == smashlet
+                or path == base / "context.json"
+                or path == local_context
+                or local_context in path.parents
+            ):
+                affected.add(smashlet)
+                break
+            if regex and regex.match(Path(os.path.relpath(path, base)).as_posix()):
+                affected.add(smashlet)
+                break
+
+    return affected
+
+
+def with_dependents(smashlets, deps: dict) -> set:
+    """
+    Add every smashlet downstream of `smashlets` in the dependency graph.
+    """
+    dependents = {}
+    for node, upstream in deps.items():
+        for dep in upstream:
+            dependents.setdefault(dep, set()).add(node)
+
+    result = set(smashlets)
+    stack = list(smashlets)
+    while stack:
+        for child in dependents.get(stack.pop(), ()):
+            if child not in result:
+                result.add(child)
+                stack.append(child)
+    return result
@@ -3,26 +3,326 @@ Loads the full context dictionary used during a Smash build or smashlet run.
 
 It merges project-level context files, local override files, and optional logic from `smash.py`.
 This context is injected into each smashlet’s `run()` function.
+
+Context files are parsed lazily: `context["context"]` is a `LazyContext` that
+parses a file the first time its key is read. Parsed files can be shared
+through a `ContextCache`, so a file is only parsed again when its size or
+mtime changes.
 """
 
+import copy
 import json
 from pathlib import Path
 
+from smash_core.files import map_file
+from smash_core.log import log
+from smash_core.project import StampCache, file_stamp, get_project_config
+
+CONTEXT_CACHE_FILE = "context_cache.json"
+CONTEXT_SUFFIXES = {".json", ".yml", ".yaml", ".txt"}
+
+# Returned by parse_context_file() for files that yield no context value
+SKIPPED = object()
+
+
+def parse_context_file(f: Path):
+    """
+    Parse one context file by its suffix.
+
+    Returns SKIPPED for unsupported files, or YAML files when PyYAML is
+    not installed. Parse errors are raised.
+    """
+    if f.suffix == ".json":
+        return json.loads(f.read_text())
+    if f.suffix in [".yml", ".yaml"]:
+        try:
+            import yaml
+        except ImportError:
+            return SKIPPED
+        return yaml.safe_load(f.read_text())
+    if f.suffix == ".txt":
+        return f.read_text()
+    return SKIPPED
+
+
+class ContextCache(StampCache):
+    """
+    Parsed context files keyed by path and validated by (inode, size, mtime_ns).
+
+    Shared by every smashlet and pass in a build, so context files used by
+    many smashlets are read and parsed once. Values are kept as JSON text and
+    each `get()` decodes a fresh copy, so a smashlet that changes its context
+    can't change what the next one sees. Values that aren't JSON (such as
+    YAML dates) are kept as objects and deep-copied instead.
+
+    With `{"context_cache": true}` in `.smash/config.json` the cache is kept
+    in `.smash/context_cache.json` between builds. Loading it leaves values
+    encoded until a file is first read.
+    """
+
+    FILE = CONTEXT_CACHE_FILE
+
+    @classmethod
+    def load(cls, project_root: Path):
+        """
+        Create the cache for a project, reading the persisted one if enabled.
+        """
+        if not get_project_config(project_root).get("context_cache"):
+            return cls()
+        return super().load(project_root)
+
+    def get(self, f: Path):
+        """
+        Return a fresh copy of the parsed value of `f`, parsing it only if it
+        changed.
+        """
+        key = str(f)
+        stamp = file_stamp(f)
+        cached = self.lookup(key, stamp)
+        if cached is not None:
+            if not cached:
+                return SKIPPED
+            if isinstance(cached[0], str):
+                return json.loads(cached[0])
+            return copy.deepcopy(cached[0])
+
+        value = parse_context_file(f)
+        if value is SKIPPED:
+            self.store(key, stamp)
+            return value
+        try:
+            self.store(key, stamp, json.dumps(value))
+        except (TypeError, ValueError):
+            self.store(key, stamp, value)
+            return copy.deepcopy(value)
+        return value
+
+    def _persisted(self) -> dict:
+        # Values that aren't JSON are only kept in memory
+        return {
+            key: entry
+            for key, entry in self.entries.items()
+            if len(entry) < 4 or isinstance(entry[3], str)
+        }
+
+
+def _parse(f: Path, cache):
+    return cache.get(f) if cache is not None else parse_context_file(f)
+
+
+def _yaml_available():
+    try:
+        import yaml  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _Pending:
+    """
+    A context file that has not been parsed yet.
+    """
+
+    __slots__ = ("path", "cache")
+
+    def __init__(self, path, cache):
+        self.path = path
+        self.cache = cache
+
+
+class LazyContext(dict):
+    """
+    A dict of context values that parses each file on first access.
+
+    Keys are known up front, values are parsed when read and then kept. It
+    is a real `dict`, so existing smashlets can index it, iterate it, copy it
+    with `dict(...)`/`{**...}` or serialize it. `in`, `len()` and iteration
+    parse nothing; copying or reading all values (`keys()`, `items()`,
+    `values()`, `==`) parses every file.
+
+    A file that fails to parse is dropped on first access, as if it had
+    never been there. The file behind each value is remembered, so `mmap()`
+    works whether or not the value was parsed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sources = {}
 
-def load_context_data(context_dir: Path):
+    def __setitem__(self, key, value):
+        self._sources.pop(key, None)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._sources.pop(key, None)
+        dict.__delitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if type(value) is not _Pending:
+            return value
+        try:
+            parsed = _parse(value.path, value.cache)
+        except Exception as e:
+            log(f"⚠️ Could not parse context file {value.path}: {e}", level="warn")
+            dict.pop(self, key, None)
+            self._sources.pop(key, None)
+            raise KeyError(key) from None
+        dict.__setitem__(self, key, parsed)
+        return parsed
+
+    def __iter__(self):
+        # Overriding __iter__ makes dict(...) and {**...} go through
+        # keys() and __getitem__ instead of copying unparsed values
+        return dict.__iter__(self)
+
+    def __eq__(self, other):
+        self._load_all()
+        if isinstance(other, LazyContext):
+            other._load_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        shown = {
+            k: ("<unparsed>" if type(v) is _Pending else v) for k, v in dict.items(self)
+        }
+        return f"LazyContext({shown!r})"
+
+    def __reduce__(self):
+        self._load_all()
+        return (LazyContext, (dict(dict.items(self)),))
+
+    def __or__(self, other):
+        merged = self.copy()
+        merged.update(other)
+        return merged
+
+    def __ror__(self, other):
+        return merge_contexts(other, self)
+
+    def _load_all(self):
+        for key in list(dict.keys(self)):
+            try:
+                self[key]
+            except KeyError:
+                pass
+
+    def is_loaded(self, key) -> bool:
+        """
+        Return True if the value for `key` has already been parsed.
+        """
+        return type(dict.__getitem__(self, key)) is not _Pending
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        # Used by dict(...), {**...} and update(), which read every value anyway
+        self._load_all()
+        return dict.keys(self)
+
+    def items(self):
+        self._load_all()
+        return dict.items(self)
+
+    def values(self):
+        self._load_all()
+        return dict.values(self)
+
+    def pop(self, key, *default):
+        try:
+            value = self[key]
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+        dict.pop(self, key)
+        self._sources.pop(key, None)
+        return value
+
+    def popitem(self):
+        key = next(reversed(dict.keys(self)))
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            dict.__setitem__(self, key, default)
+        return self.get(key, default)
+
+    def copy(self):
+        """
+        Return a shallow copy that shares unparsed values instead of parsing them.
+        """
+        return merge_contexts(self)
+
+    def mmap(self, key):
+        """
+        Memory-map the file behind `key` read-only, without parsing it.
+
+        Useful for large text files that are scanned rather than read whole.
+        Returns an `mmap.mmap`; an empty file yields `b""`, since empty
+        files cannot be mapped.
+        """
+        dict.__getitem__(self, key)  # KeyError for unknown keys
+        path = self._sources.get(key)
+        if path is None:
+            raise ValueError(f"Context value {key!r} is not backed by a file")
+        return map_file(path)
+
+    def _set_pending(self, key, path, cache):
+        dict.__setitem__(self, key, _Pending(path, cache))
+        self._sources[key] = path
+
+
+def merge_contexts(*mappings) -> LazyContext:
+    """
+    Merge context mappings into a new `LazyContext`, later ones winning.
+
+    Unparsed values are carried over without being parsed.
+    """
+    merged = LazyContext()
+    for mapping in mappings:
+        if isinstance(mapping, LazyContext):
+            for key in dict.keys(mapping):
+                merged._sources.pop(key, None)
+            dict.update(merged, dict.items(mapping))
+            merged._sources.update(mapping._sources)
+        else:
+            merged.update(mapping)
+    return merged
+
+
+def load_context_data(context_dir: Path, cache=None):
     """
     Load context values from a directory or context.json file.
 
+    Args:
+        context_dir (Path): A `context/` directory or a `context.json` file
+        cache (ContextCache): Optional cache of already parsed files
+
     Returns:
-        merged (dict): Parsed content from .json/.yaml/.txt files
+        merged (LazyContext): Content from .json/.yaml/.txt files, parsed
+            when first accessed
         paths (dict):   Raw Path objects keyed by filename
     """
-    merged = {}
+    merged = LazyContext()
     paths = {}
 
     if context_dir.is_file() and context_dir.name.endswith(".json"):
         try:
-            merged = json.loads(context_dir.read_text())
+            merged = LazyContext(_parse(context_dir, cache))
             paths[context_dir.name] = context_dir
         except Exception:
             pass
@@ -38,30 +338,21 @@ def load_context_data(context_dir: Path):
 
             paths[f.name] = f
 
-            try:
-                if f.suffix == ".json":
-                    merged[f.stem] = json.loads(f.read_text())
-                elif f.suffix in [".yml", ".yaml"]:
-                    try:
-                        import yaml
-
-                        merged[f.stem] = yaml.safe_load(f.read_text())
-                    except ImportError:
-                        pass
-                elif f.suffix == ".txt":
-                    merged[f.stem] = f.read_text()
-            except Exception:
+            if f.suffix not in CONTEXT_SUFFIXES:
+                continue
+            if f.suffix in [".yml", ".yaml"] and not _yaml_available():
                 continue
+            merged._set_pending(f.stem, f, cache)
 
     return merged, paths
 
 
-def build_context(project_root: Path) -> dict:
+def build_context(project_root: Path, cache=None) -> dict:
     """
     Construct the full build context for Smash execution.
 
     Includes:
-    - Global context/ files (if any)
+    - Global context/ files (if any), parsed through `cache` if given
     - smash.py config and `on_context()` hook (if present)
 
     Returns:
@@ -71,7 +362,7 @@ def build_context(project_root: Path) -> dict:
 
     # Inject top-level context/ files (if any)
     context_dir = project_root / "context"
-    merged_ctx, ctx_paths = load_context_data(context_dir)
+    merged_ctx, ctx_paths = load_context_data(context_dir, cache)
     context["context"] = merged_ctx
     context["context_files"] = ctx_paths
 
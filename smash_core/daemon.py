@@ -0,0 +1,410 @@
+"""
+Opt-in resident build daemon, so repeated `smash` calls reuse a warm interpreter.
+
+`smash daemon start` launches one background process per project. It listens on
+a Unix domain socket and runs `build`, `run` and `status` requests with warm
+state: loaded smashlet modules, the parsed global context and the file digest
+cache. While it is running, the `smash` CLI forwards those commands to it and
+streams the log output back.
+
+Warm state is checked against the filesystem on every request: modules are
+reloaded when their (mtime_ns, size) changes, the context when `smash.py` or
+any file in `context/` changes, and the runlog is re-read for each request.
+When a project module that smashlets import (say `lib/util.py`) changes,
+every project module is dropped from `sys.modules` and the loaded smashlets
+and context are discarded, so the next request imports the new code.
+
+Note: This module is internal and not part of the public Smash API.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+
+from smash_core.context_loader import ContextCache, build_context
+from smash_core.digests import StatCache
+from smash_core.discovery import DEFAULT_IGNORED_DIRS
+from smash_core.log import log
+from smash_core.session import BuildSession
+from smash_core.smashlets import ModuleRegistry
+
+SOCKET_NAME = "daemon.sock"
+INFO_FILE = "daemon.json"
+IDLE_TIMEOUT = 60 * 60  # Exit after an hour without requests
+START_TIMEOUT = 5.0
+MAX_SOCKET_PATH = 100  # sun_path is ~108 bytes on Linux, less on macOS
+
+# Commands the CLI forwards to a running daemon
+DAEMON_COMMANDS = {"build", "run", "status"}
+
+
+def socket_path(project_root: Path) -> Path:
+    """
+    Return the daemon socket for a project.
+
+    Uses `.smash/daemon.sock`, or a path in the temp dir if that would be
+    too long for a Unix socket address.
+    """
+    path = project_root / ".smash" / SOCKET_NAME
+    if len(os.fsencode(path)) < MAX_SOCKET_PATH:
+        return path
+    digest = hashlib.sha1(os.fsencode(project_root)).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / f"smash-{digest}.sock"
+
+
+class WarmContext:
+    """
+    Caches `build_context()` until `smash.py` or a file in `context/` changes.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self._stamp = None
+        self._context = None
+
+    @staticmethod
+    def stamp(project_root: Path):
+        entries = []
+        for path in [project_root / "smash.py", project_root / "context"]:
+            try:
+                st = path.stat()
+                entries.append((str(path), st.st_mtime_ns, st.st_size))
+            except OSError:
+                continue
+        context_dir = project_root / "context"
+        if context_dir.is_dir():
+            for f in sorted(context_dir.iterdir()):
+                try:
+                    st = f.stat()
+                    entries.append((str(f), st.st_mtime_ns, st.st_size))
+                except OSError:
+                    continue
+        return tuple(entries)
+
+    def get(self, project_root: Path) -> dict:
+        stamp = self.stamp(project_root)
+        if self._context is None or stamp != self._stamp:
+            self._context = build_context(project_root, self.cache)
+            self._stamp = stamp
+        return self._context
+
+
+class ProjectImports:
+    """
+    Tracks modules imported from the project's own files, e.g. helpers that
+    smashlets or `smash.py` import, so the daemon can tell when they change.
+    """
+
+    def __init__(self, project_root: Path):
+        self.project_root = project_root
+        self._stamps = {}
+        # Installed packages, even in a virtualenv inside the project, are not project code
+        self._excluded = {
+            Path(p).resolve()
+            for p in {sys.prefix, sys.base_prefix, sys.exec_prefix}
+            | {str(Path(__file__).resolve().parent.parent)}
+        }
+
+    def _project_file(self, module):
+        filename = getattr(module, "__file__", None)
+        if not filename:
+            return None
+        path = Path(filename).resolve()
+        try:
+            rel = path.relative_to(self.project_root)
+        except ValueError:
+            return None
+        if DEFAULT_IGNORED_DIRS & set(rel.parts[:-1]):
+            return None
+        if any(base == path or base in path.parents for base in self._excluded):
+            return None
+        return path
+
+    def _current(self):
+        stamps = {}
+        for name, module in list(sys.modules.items()):
+            path = self._project_file(module)
+            if path is None:
+                continue
+            try:
+                st = path.stat()
+                stamps[name] = (str(path), st.st_mtime_ns, st.st_size)
+            except OSError:
+                stamps[name] = (str(path), None, None)
+        return stamps
+
+    def remember(self):
+        """
+        Record the project modules imported so far, e.g. after a request.
+        """
+        self._stamps = self._current()
+
+    def changed(self) -> bool:
+        """
+        Return True if a remembered project module changed, evicting every
+        project module from `sys.modules` if so.
+        """
+        current = self._current()
+        stale = any(
+            name in self._stamps and self._stamps[name] != stamp
+            for name, stamp in current.items()
+        )
+        if stale:
+            for name in current:
+                sys.modules.pop(name, None)
+            self._stamps = {}
+        return stale
+
+
+class _SocketStream:
+    """
+    A stdout replacement that forwards writes to the client as JSON lines.
+
+    If the client goes away (e.g. Ctrl-C), the request keeps running and
+    its output is dropped.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.closed = False
+
+    def write(self, text):
+        if text and not self.closed:
+            try:
+                self.conn.sendall((json.dumps({"out": text}) + "\n").encode())
+            except OSError:
+                self.closed = True
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+class SmashDaemon:
+    """
+    Serves build requests for one project, keeping state warm between them.
+    """
+
+    def __init__(self, project_root: Path):
+        self.project_root = project_root
+        self.modules = ModuleRegistry()
+        self.context_cache = ContextCache.load(project_root)
+        self.context = WarmContext(self.context_cache)
+        self.stat_cache = StatCache.load(project_root)
+        self.imports = ProjectImports(project_root)
+        self.running = True
+
+    def session(self, freshness=None, read_only=False) -> BuildSession:
+        """
+        Create a build session that shares the daemon's warm state.
+        """
+        return BuildSession(
+            self.project_root,
+            freshness=freshness,
+            modules=self.modules,
+            context_loader=self.context.get,
+            stat_cache=self.stat_cache,
+            context_cache=self.context_cache,
+            read_only=read_only,
+        )
+
+    def handle(self, request: dict) -> int:
+        """
+        Run one request. Output goes to whatever `sys.stdout` currently is.
+        """
+        from smash_core.commands.build import run_build, run_force
+        from smash_core.commands.status import run_status
+
+        command = request.get("command")
+        args = request.get("args", {})
+
+        if command == "ping":
+            return 0
+        if command == "stop":
+            self.running = False
+            log("👋 Smash daemon stopping.")
+            return 0
+
+        os.chdir(request.get("cwd") or self.project_root)
+
+        # Loaded smashlets and the context hold on to the old helper code
+        if self.imports.changed():
+            self.modules = ModuleRegistry()
+            self.context = WarmContext(self.context_cache)
+        session = self.session(args.get("freshness"), read_only=command == "status")
+
+        try:
+            if command == "build":
+                run_build(
+                    jobs=args.get("jobs", 1), session=session, trace=args.get("trace")
+                )
+            elif command == "run":
+                run_force(
+                    args.get("smashlet_path"), jobs=args.get("jobs", 1), session=session
+                )
+            elif command == "status":
+                run_status(
+                    session=session, as_json=args.get("json"), why=args.get("why")
+                )
+            else:
+                log(f"❌ Unknown daemon command: {command}", level="error")
+                return 1
+        finally:
+            self.imports.remember()
+        return 0
+
+    def serve(self, conn):
+        with conn, conn.makefile("r") as reader:
+            line = reader.readline()
+            try:
+                request = json.loads(line)
+            except ValueError:
+                return
+
+            stream = _SocketStream(conn)
+            original = sys.stdout
+            sys.stdout = stream
+            try:
+                code = self.handle(request)
+            except Exception:
+                stream.write(traceback.format_exc())
+                code = 1
+            finally:
+                sys.stdout = original
+
+            try:
+                conn.sendall((json.dumps({"exit": code}) + "\n").encode())
+            except OSError:
+                pass
+
+    def serve_forever(self):
+        """
+        Listen on the project socket until stopped or idle for IDLE_TIMEOUT.
+        """
+        path = socket_path(self.project_root)
+        if path.exists():
+            path.unlink()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(path))
+        server.listen(8)
+        server.settimeout(IDLE_TIMEOUT)
+
+        info = self.project_root / ".smash" / INFO_FILE
+        info.write_text(json.dumps({"pid": os.getpid(), "socket": str(path)}))
+
+        try:
+            while self.running:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    break
+                conn.settimeout(None)
+                try:
+                    self.serve(conn)
+                except OSError:
+                    pass  # The client went away; keep serving others
+        finally:
+            server.close()
+            for leftover in (path, info):
+                try:
+                    leftover.unlink()
+                except OSError:
+                    pass
+            self.stat_cache.save()
+            self.context_cache.save()
+
+
+def daemon_request(project_root: Path, request: dict, stream=None):
+    """
+    Send a request to the project's daemon and stream its output.
+
+    Returns:
+        int or None: The request's exit code, or None if no daemon is running
+    """
+    path = socket_path(project_root)
+    if not path.exists():
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+
+    stream = stream or sys.stdout
+    request = dict(request, cwd=os.getcwd())
+
+    with sock, sock.makefile("r") as reader:
+        sock.sendall((json.dumps(request) + "\n").encode())
+        for line in reader:
+            message = json.loads(line)
+            if "out" in message:
+                stream.write(message["out"])
+                stream.flush()
+            elif "exit" in message:
+                return message["exit"]
+
+    return 1
+
+
+def start_daemon(project_root: Path) -> bool:
+    """
+    Launch the daemon in the background and wait until it answers.
+    """
+    if daemon_request(project_root, {"command": "ping"}) is not None:
+        log("✅ Smash daemon already running.")
+        return True
+
+    subprocess.Popen(
+        [sys.executable, "-m", "smash_core.daemon", str(project_root)],
+        cwd=str(project_root),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if daemon_request(project_root, {"command": "ping"}) is not None:
+            log("✅ Smash daemon started.")
+            return True
+        time.sleep(0.05)
+
+    log("❌ Smash daemon did not start.", level="error")
+    return False
+
+
+def stop_daemon(project_root: Path) -> bool:
+    """
+    Ask a running daemon to exit.
+    """
+    if daemon_request(project_root, {"command": "stop"}, stream=_NullStream()) is None:
+        log("ℹ️ No Smash daemon running.")
+        return False
+    log("✅ Smash daemon stopped.")
+    return True
+
+
+class _NullStream:
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+if __name__ == "__main__":
+    SmashDaemon(Path(sys.argv[1]).resolve()).serve_forever()
@@ -0,0 +1,84 @@
+"""
+Content digests for hash-based freshness checks.
+
+Hashing every input on every build would cost more than it saves, so file
+digests are cached in `.smash/stat_cache.json` keyed by (inode, size, mtime_ns).
+A file is only re-hashed when one of those changes.
+
+Note: This module is internal and not part of the public Smash API.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+from smash_core.project import StampCache, file_stamp
+
+STAT_CACHE_FILE = "stat_cache.json"
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path) -> str:
+    """
+    Return the sha1 hex digest of a file's contents, read in chunks.
+    """
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class StatCache(StampCache):
+    """
+    File digests keyed by path and validated by (inode, size, mtime_ns).
+
+    Thread-safe, so parallel build workers can share one cache.
+    """
+
+    FILE = STAT_CACHE_FILE
+
+    def digest(self, path: Path) -> str:
+        """
+        Return the digest of `path`, hashing it only if its stat tuple changed.
+        """
+        key = str(path)
+        stamp = file_stamp(path)
+        cached = self.lookup(key, stamp)
+        if cached:
+            return cached[0]
+
+        digest = file_digest(path)
+        self.store(key, stamp, digest)
+        return digest
+
+
+def input_digest(smashlet_path: Path, inputs, cache: StatCache) -> str:
+    """
+    Combine the digests of a smashlet's source and all of its inputs.
+
+    Inputs are identified by their path relative to the smashlet directory,
+    so renaming or removing a file changes the result too.
+    """
+    return input_digests(smashlet_path, inputs, cache)[0]
+
+
+def input_digests(smashlet_path: Path, inputs, cache: StatCache):
+    """
+    Digest a smashlet's source and inputs.
+
+    Returns:
+        (combined, per_input): The combined digest (see `input_digest`) and
+        a dict of {path relative to the smashlet dir: file digest}
+    """
+    h = hashlib.sha1()
+    h.update(cache.digest(smashlet_path).encode())
+    base = smashlet_path.parent
+    per_input = {}
+    for f in sorted(inputs):
+        if not f.is_file():
+            continue
+        name = Path(os.path.relpath(f, base)).as_posix()
+        per_input[name] = cache.digest(f)
+        h.update(f"\0{name}\0{per_input[name]}".encode())
+    return h.hexdigest(), per_input
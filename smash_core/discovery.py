@@ -0,0 +1,245 @@
+"""
+Walks a Smash project to find smashlet files, pruning directories early.
+
+Skips version control, dependency and cache directories, `.smash/`, virtualenvs
+and nested Smash projects, and honours `.gitignore`-style patterns from a
+`.smashignore` file in the project root.
+
+Results are kept in `.smash/discovery.json` together with the mtime of every
+directory scanned, so later walks only re-list directories that changed.
+
+Note: This module is internal and not part of the public Smash API.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from smash_core.patterns import IgnoreRules
+from smash_core.project import RACY_WINDOW_NS, write_json_atomic
+
+IGNORE_FILE = ".smashignore"
+INDEX_FILE = "discovery.json"
+INDEX_VERSION = 1
+
+# Directory names that never contain smashlets worth running
+DEFAULT_IGNORED_DIRS = {
+    ".git",
+    ".hg",
+    ".svn",
+    ".smash",
+    ".tox",
+    ".nox",
+    ".venv",
+    "venv",
+    "node_modules",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+}
+
+# Entries that mark a directory as something other than project content
+PRUNE_MARKERS = {".smash", "pyvenv.cfg"}
+
+
+def is_smashlet_name(name: str) -> bool:
+    """
+    Check whether a filename is `smashlet.py` or `smashlet_<name>.py`.
+    """
+    return name == "smashlet.py" or (
+        name.startswith("smashlet_") and name.endswith(".py")
+    )
+
+
+def load_ignore_rules(root: Path) -> IgnoreRules:
+    """
+    Read `.smashignore` from the project root. Missing files yield no rules.
+    """
+    try:
+        return IgnoreRules((root / IGNORE_FILE).read_text().splitlines())
+    except OSError:
+        return IgnoreRules()
+
+
+def scan_dir(path: Path, rel: str, rules: IgnoreRules, is_root: bool):
+    """
+    List one directory's smashlets and the subdirectories worth descending into.
+
+    Returns:
+        (smashlet_names, subdir_names), or None if the directory is pruned
+        because it is a nested Smash project or a virtualenv
+    """
+    smashlets = []
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return [], []
+
+    names = {e.name for e in entries}
+    if not is_root and names & PRUNE_MARKERS:
+        return None
+
+    for entry in entries:
+        name = entry.name
+        child_rel = f"{rel}/{name}" if rel else name
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if name in DEFAULT_IGNORED_DIRS:
+                    continue
+                if not rules.is_ignored(child_rel, True):
+                    subdirs.append(name)
+            elif is_smashlet_name(name) and entry.is_file():
+                if not rules.is_ignored(child_rel, False):
+                    smashlets.append(name)
+        except OSError:
+            continue
+
+    return sorted(smashlets), sorted(subdirs)
+
+
+def _ignore_stamp(root: Path):
+    try:
+        st = (root / IGNORE_FILE).stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_index(root: Path, ignore_stamp) -> dict:
+    """
+    Load the cached directory listings from `.smash/discovery.json`.
+
+    Returns an empty dict if the index is missing, unreadable, from another
+    index version, or was built with different `.smashignore` rules.
+    """
+    try:
+        raw = json.loads((root / ".smash" / INDEX_FILE).read_text())
+    except (OSError, ValueError):
+        return {}
+
+    if raw.get("version") != INDEX_VERSION or raw.get("ignore") != ignore_stamp:
+        return {}
+
+    dirs = raw.get("dirs")
+    return dirs if isinstance(dirs, dict) else {}
+
+
+def indexed_dirs(root: Path) -> dict:
+    """
+    Return the index's {directory relative to root: listing} as of the last walk.
+    """
+    return load_index(root, _ignore_stamp(root))
+
+
+def save_index(root: Path, ignore_stamp, dirs: dict):
+    """
+    Persist directory listings to `.smash/discovery.json`.
+    """
+    write_json_atomic(
+        root / ".smash" / INDEX_FILE,
+        {"version": INDEX_VERSION, "ignore": ignore_stamp, "dirs": dirs},
+    )
+
+
+def walk_smashlets(
+    root: Path, use_index: bool = True, snapshot=None, update_index: bool = True
+):
+    """
+    Find all smashlets under `root`, pruning ignored directories before descending.
+
+    If the project has a `.smash/` directory, listings are reused from the
+    discovery index for every directory whose mtime is unchanged, and the
+    index is rewritten when anything was rescanned (unless `update_index` is
+    False). Directory stats go through `snapshot` (a `FileSnapshot`) if
+    given, so the build can reuse them.
+
+    Returns:
+        (smashlets, stats): Sorted smashlet paths, and a dict with
+        `dirs_visited`, `dirs_scanned` and `dirs_pruned` counts
+    """
+    rules = load_ignore_rules(root)
+    persist = use_index and (root / ".smash").is_dir()
+    ignore_stamp = _ignore_stamp(root)
+    cached_dirs = load_index(root, ignore_stamp) if persist else {}
+    dirs = {}
+
+    found = []
+    stats = {"dirs_visited": 0, "dirs_scanned": 0, "dirs_pruned": 0}
+    scan_started = time.time_ns()
+
+    stack = [(root, "")]
+    while stack:
+        path, rel = stack.pop()
+        stats["dirs_visited"] += 1
+
+        if snapshot is not None:
+            st = snapshot.stat(path)
+        else:
+            try:
+                st = os.stat(path)
+            except OSError:
+                st = None
+        if st is None:
+            continue
+        mtime_ns = st.st_mtime_ns
+
+        cached = cached_dirs.get(rel)
+        if cached and cached.get("mtime_ns") == mtime_ns:
+            entry = cached
+        else:
+            stats["dirs_scanned"] += 1
+            result = scan_dir(path, rel, rules, is_root=(path == root))
+            stable = scan_started - mtime_ns >= RACY_WINDOW_NS
+            entry = {
+                "mtime_ns": mtime_ns if stable else None,
+                "pruned": result is None,
+                "smashlets": result[0] if result else [],
+                "subdirs": result[1] if result else [],
+            }
+        dirs[rel] = entry
+
+        if entry["pruned"]:
+            stats["dirs_pruned"] += 1
+            continue
+
+        found.extend(path / name for name in entry["smashlets"])
+        for name in reversed(entry["subdirs"]):
+            stack.append((path / name, f"{rel}/{name}" if rel else name))
+
+    if persist and update_index and dirs != cached_dirs:
+        try:
+            save_index(root, ignore_stamp, dirs)
+        except OSError:
+            pass
+
+    return sorted(found), stats
+
+
+def iter_project_dirs(root: Path, start: Path = None, rules: IgnoreRules = None):
+    """
+    Yield every directory under `start` (default: `root`) that discovery descends into.
+
+    Used to decide which directories to watch for changes. `start` itself is
+    skipped if discovery would prune it.
+    """
+    rules = rules or load_ignore_rules(root)
+    start = start or root
+
+    if start != root:
+        rel = start.relative_to(root).as_posix()
+        if start.name in DEFAULT_IGNORED_DIRS or rules.is_ignored(rel, True):
+            return
+
+    stack = [start]
+    while stack:
+        path = stack.pop()
+        rel = "" if path == root else path.relative_to(root).as_posix()
+        result = scan_dir(path, rel, rules, is_root=(path == root))
+        if result is None:
+            continue
+        yield path
+        stack.extend(path / name for name in reversed(result[1]))
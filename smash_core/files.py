@@ -1,12 +1,47 @@
 """
-Provides path-safe `read`, `write`, and `resolve` functions for use in smashlets.
+Provides path-safe `read`, `write`, and `resolve` functions for use in smashlets,
+plus `read_bytes`, `open_file` (streaming) and `read_mmap` (zero-copy) for binary
+and very large files. `read_async`, `read_bytes_async` and `write_async` do the
+same from `async def run(context)`, on a worker thread, so the event loop
+keeps serving other smashlets meanwhile.
 
 These functions interpret paths relative to the smashlet's directory (`context["cwd"]`) or project root.
 Exposed to users via the public `smash` API.
 """
 
+import functools
+import mmap
+import os
+import stat
+import tempfile
 from pathlib import Path
 
+from smash_core.async_runner import in_thread
+from smash_core.snapshot import notify_write
+
+CHUNK_SIZE = 1024 * 1024
+
+
+@functools.lru_cache(maxsize=None)
+def _default_mode() -> int:
+    """
+    Return the mode `open()` would give a new file: 0666 minus the umask.
+
+    New outputs get the usual permissions, not mkstemp's 0600. The umask is
+    read from /proc where possible; setting it to read it back changes it
+    for every thread, so that fallback only happens on first use.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return 0o666 & ~int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
 
 def resolve(relative_path, context):
     """
@@ -38,10 +73,198 @@ def read(relative_path, context):
     return resolve(relative_path, context).read_text()
 
 
+def read_bytes(relative_path, context):
+    """
+    Read a file's raw bytes relative to the smashlet directory.
+    """
+    return resolve(relative_path, context).read_bytes()
+
+
+def open_file(relative_path, mode, context, **kwargs):
+    """
+    Open a file relative to the smashlet directory, like the built-in `open()`.
+
+    Use it to stream files too large to read at once. Writing modes create
+    missing parent directories, and the build sees the change once the file
+    is closed. Keyword arguments (`encoding`, `buffering`, ...) are passed on
+    to `open()`.
+
+        with smash.open_file("logs/big.log", "rb", context) as f:
+            for line in f:
+                ...
+    """
+    path = resolve(relative_path, context)
+    if any(flag in mode for flag in "wax+"):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return _NotifyingFile(open(path, mode, **kwargs), path)
+    return open(path, mode, **kwargs)
+
+
+class _NotifyingFile:
+    """
+    Wraps a writable file so closing it invalidates the path in build snapshots.
+    """
+
+    def __init__(self, f, path):
+        self._f = f
+        self._path = path
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+    def __iter__(self):
+        return iter(self._f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._f.close()
+        notify_write(self._path)
+
+
+def read_mmap(relative_path, context):
+    """
+    Memory-map a file read-only, relative to the smashlet directory.
+
+    Returns an `mmap.mmap`: a zero-copy, bytes-like buffer that supports
+    slicing, `find()`, regexes on bytes and `memoryview()`, without reading
+    the whole file into memory. Empty files yield `b""`.
+    """
+    return map_file(resolve(relative_path, context))
+
+
+def map_file(path):
+    """
+    Memory-map a file read-only. Empty files yield `b""`.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
 def write(relative_path, data, context):
     """
     Write a string to a file relative to the smashlet directory.
+
+    The file is replaced atomically, so readers never see a partial write.
     """
-    path = resolve(relative_path, context)
+    write_atomic(resolve(relative_path, context), iter_chunks(data))
+
+
+async def read_async(relative_path, context):
+    """
+    Like `read()`, for coroutine smashlets. The file is read on a worker thread.
+    """
+    return await in_thread(read, relative_path, context)
+
+
+async def read_bytes_async(relative_path, context):
+    """
+    Like `read_bytes()`, for coroutine smashlets. The file is read on a worker thread.
+    """
+    return await in_thread(read_bytes, relative_path, context)
+
+
+async def write_async(relative_path, data, context):
+    """
+    Like `write()`, for coroutine smashlets. The file is written on a worker thread.
+    """
+    await in_thread(write, relative_path, data, context)
+
+
+def iter_chunks(content):
+    """
+    Yield `content` as bytes chunks.
+
+    Accepts str (encoded as UTF-8), bytes-like objects, or an iterable of
+    str or bytes chunks.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        view = memoryview(content).cast("B")
+        for start in range(0, len(view), CHUNK_SIZE):
+            yield view[start : start + CHUNK_SIZE]
+        return
+    for chunk in content:
+        yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+
+def write_atomic(path: Path, chunks, compare=False) -> bool:
+    """
+    Stream `chunks` into a temp file next to `path`, then rename it into place.
+
+    With `compare=True` the existing file is read alongside, chunk by chunk,
+    and left untouched if the new content is identical.
+
+    Returns:
+        bool: True if `path` was replaced
+    """
+    path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(data)
+    # Keep the mode of an existing output, unless it is read-only, like an
+    # output hardlinked from the cache
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except OSError:
+        mode = None
+    if mode is None or not mode & stat.S_IWUSR:
+        mode = _default_mode()
+
+    old = None
+    if compare:
+        try:
+            old = open(path, "rb")
+        except OSError:
+            old = None
+
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        same = old is not None
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                if same and old.read(len(chunk)) != chunk:
+                    same = False
+        if same and old.read(1) == b"":
+            os.unlink(tmp)
+            return False
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    finally:
+        if old is not None:
+            old.close()
+
+    notify_write(path)
+    return True
+
+
+def same_content(path: Path, data) -> bool:
+    """
+    Return True if the file at `path` holds exactly `data` (bytes-like).
+
+    Compares sizes first, then reads the file in chunks, stopping at the
+    first difference.
+    """
+    view = memoryview(data).cast("B")
+    try:
+        if os.stat(path).st_size != len(view):
+            return False
+        with open(path, "rb") as f:
+            for start in range(0, len(view), CHUNK_SIZE):
+                if f.read(CHUNK_SIZE) != view[start : start + CHUNK_SIZE]:
+                    return False
+    except OSError:
+        return False
+    return True
@@ -0,0 +1,202 @@
+"""
+Lets a build that would change nothing finish after a stat-only sweep.
+
+After a clean build, Smash records which files and directories the build
+depended on: every smashlet, its inputs and declared outputs, global and
+local context files, `smash.py`, the config, and every directory discovery
+or an `INPUT_GLOB` walked (so added or removed files show up as a changed
+directory mtime).
+The paths are stored in `.smash/fingerprint.json` with one digest over
+their (inode, size, mtime_ns).
+
+The next `smash build` stats those paths and compares the digest. If it
+matches, the build is over without importing any smashlet or running
+`smash.py`, and `smash status` reports every smashlet as up to date. Anything else — a changed stat, a failed run, a smashlet with
+`RUN = "always"` or a `should_run` hook, a different freshness mode — takes
+the regular path.
+
+Note: This module is internal and not part of the public Smash API.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from smash_core.discovery import IGNORE_FILE, indexed_dirs
+from smash_core.project import CONFIG_FILE, RACY_WINDOW_NS, write_json_atomic
+from smash_core.scheduler import declared_outputs
+from smash_core.smashlets import load_smashlet_spec
+
+FINGERPRINT_FILE = "fingerprint.json"
+FINGERPRINT_VERSION = 2
+
+
+def _stamps(project_root: Path, paths):
+    """
+    Yield (inode, size, mtime_ns) per path, or None for missing paths.
+    """
+    for rel in paths:
+        try:
+            st = os.stat(project_root / rel)
+        except OSError:
+            yield None
+            continue
+        yield (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _digest(stamps) -> str:
+    h = hashlib.sha1()
+    for stamp in stamps:
+        h.update(repr(stamp).encode())
+    return h.hexdigest()
+
+
+def glob_dirs(directory: Path, pattern: str):
+    """
+    Return the directories globbing `pattern` in `directory` has to list.
+
+    That is the pattern's literal base, plus every directory below it if a
+    directory part of the pattern is a wildcard (e.g. `**/*.html`). Ignored
+    directories count too: `.smashignore` prunes discovery, not globs.
+    """
+    parts = Path(pattern).parts
+    base = Path(directory)
+    for part in parts[:-1]:
+        if glob.has_magic(part):
+            break
+        base /= part
+    else:
+        return [base]
+
+    dirs = [base]
+    for dirpath, dirnames, _ in os.walk(base):
+        dirs.extend(Path(dirpath) / name for name in dirnames)
+    return dirs
+
+
+def _matching(project_root: Path, freshness):
+    try:
+        data = json.loads((project_root / ".smash" / FINGERPRINT_FILE).read_text())
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != FINGERPRINT_VERSION
+        or data.get("freshness") != freshness
+    ):
+        return None
+    if _digest(_stamps(project_root, data["paths"])) != data["digest"]:
+        return None
+    return data
+
+
+def fingerprint_matches(project_root: Path, freshness=None) -> bool:
+    """
+    Return True if nothing the last clean build depended on has changed.
+    """
+    return _matching(project_root, freshness) is not None
+
+
+def fresh_smashlets(project_root: Path, freshness=None):
+    """
+    Return the smashlets of the last clean build in build order, if the
+    fingerprint still matches (so all of them are up to date), else None.
+    """
+    data = _matching(project_root, freshness)
+    if data is None:
+        return None
+    return [project_root / rel for rel in data["smashlets"]]
+
+
+def clear_fingerprint(project_root: Path):
+    """
+    Forget the last fingerprint, e.g. before a build that might not finish cleanly.
+    """
+    try:
+        (project_root / ".smash" / FINGERPRINT_FILE).unlink()
+    except OSError:
+        pass
+
+
+def dependency_paths(project_root: Path, smashlets, session):
+    """
+    Collect every path a build of `smashlets` depends on.
+
+    Returns:
+        set of Path, or None if the build can't be fingerprinted: a smashlet
+        runs on a timer or decides for itself in `should_run`, or a directory
+        changed too recently for its mtime to be trusted
+    """
+    index = indexed_dirs(project_root)
+    if any(entry.get("mtime_ns") is None for entry in index.values()):
+        return None
+
+    paths = {project_root / rel for rel in index}
+    paths |= {
+        project_root / "smash.py",
+        project_root / IGNORE_FILE,
+        project_root / ".smash" / CONFIG_FILE,
+        project_root / "context",
+    }
+    paths |= set(session.context.get("context_files", {}).values())
+
+    snapshot = session.snapshot
+    for smashlet in smashlets:
+        paths.add(smashlet)
+        spec, _ = load_smashlet_spec(smashlet, session)
+        if not spec:
+            continue
+        if spec["constants"]["RUN"] == "always" or spec["functions"]["should_run"]:
+            return None
+
+        pattern = spec["constants"]["INPUT_GLOB"]
+        inputs = snapshot.glob(smashlet.parent, pattern) if pattern else []
+        paths.update(inputs)
+        if pattern:
+            paths.update(glob_dirs(smashlet.parent, pattern))
+        paths.update(declared_outputs(smashlet, session))
+
+        local = smashlet.parent / "context"
+        paths |= {local, smashlet.parent / "context.json"}
+        if snapshot.exists(local):
+            paths.update(snapshot.glob(local, "*"))
+
+    return paths
+
+
+def save_fingerprint(project_root: Path, smashlets, session, started=None) -> bool:
+    """
+    Record the fingerprint of a clean build of `smashlets`, in build order.
+
+    Stamps are taken after the build, so a file changed while it ran could
+    be recorded in a state the build never saw. Nothing is recorded if any
+    path changed after the build started (`started`, from `time.time_ns()`),
+    or too recently for its mtime to be trusted.
+
+    Returns:
+        bool: True if a fingerprint was written
+    """
+    paths = dependency_paths(project_root, smashlets, session)
+    if paths is None:
+        return False
+
+    rel_paths = sorted(os.path.relpath(p, project_root) for p in paths)
+    stamps = list(_stamps(project_root, rel_paths))
+    since = (started if started is not None else time.time_ns()) - RACY_WINDOW_NS
+    if any(s is not None and s[2] >= since for s in stamps):
+        return False
+
+    write_json_atomic(
+        project_root / ".smash" / FINGERPRINT_FILE,
+        {
+            "version": FINGERPRINT_VERSION,
+            "freshness": session.freshness,
+            "paths": rel_paths,
+            "smashlets": [os.path.relpath(s, project_root) for s in smashlets],
+            "digest": _digest(stamps),
+        },
+    )
+    return True
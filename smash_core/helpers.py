@@ -8,7 +8,9 @@ Exposed to users via the public `smash` API.
 import hashlib
 from pathlib import Path
 
-from smash_core.files import resolve
+from smash_core.async_runner import in_thread
+from smash_core.files import resolve, same_content, write_atomic, iter_chunks
+from smash_core.snapshot import notify_write
 
 
 def get_digest(content):
@@ -29,6 +31,7 @@ def write_output(path, content):
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(content)
+    notify_write(path)
 
 
 def smash_log(msg):
@@ -43,6 +46,7 @@ def ensure_dir(path):
     Ensure a directory exists (like mkdir -p).
     """
     Path(path).mkdir(parents=True, exist_ok=True)
+    notify_write(path)
 
 
 def flatten_json_dir(path):
@@ -66,13 +70,29 @@ def write_output_if_changed(path, content, context):
     """
     Writes `content` to the resolved path only if it differs from what's already there.
     Returns True if a write occurred (content changed), else False.
+
+    `content` may be a str (written as UTF-8), bytes, or an iterable of str
+    or bytes chunks for outputs too large to build in memory. The existing
+    file is never read whole: sizes are compared first, then chunks. Writes
+    go to a temp file that is renamed into place, so readers never see a
+    partial output.
     """
     out_path = path if isinstance(path, Path) else resolve(path, context)
-    old = out_path.read_text() if out_path.exists() else ""
 
-    if content != old:
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text(content)
-        return True
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        if same_content(out_path, content):
+            return False
+        return write_atomic(out_path, iter_chunks(content))
+
+    # Streams can only be compared while they are written
+    return write_atomic(out_path, iter_chunks(content), compare=True)
+
 
-    return False
+async def write_output_if_changed_async(path, content, context):
+    """
+    Like `write_output_if_changed()`, for coroutine smashlets. The comparison
+    and write happen on a worker thread.
+    """
+    return await in_thread(write_output_if_changed, path, content, context)
@@ -3,8 +3,17 @@ Standard logging utility used across Smash and in smashlets.
 
 Adds consistent emoji prefixes for log levels like info, warn, error, and debug.
 Part of the public smashlet API via `from smash import log`.
+
+Also lets parallel builds keep each smashlet's output together: while
+`routed_stdout()` is active, threads inside `buffered_output()` collect their
+prints and logs and emit them as one block when done.
 """
 
+import io
+import sys
+import threading
+from contextlib import contextmanager
+
 LEVEL_PREFIX = {
     "info": "ℹ️ ",
     "warn": "⚠️ ",
@@ -23,3 +32,67 @@ def log(msg: str, *, level="info"):
     """
     prefix = LEVEL_PREFIX.get(level, "")
     print(f"{prefix} {msg}")
+
+
+_local = threading.local()
+_emit_lock = threading.Lock()
+
+
+class _ThreadRoutedStream:
+    """
+    A stdout stand-in that sends writes from buffering threads to their buffer
+    and everything else to the real stream.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        buffer = getattr(_local, "buffer", None)
+        if buffer is not None:
+            return buffer.write(text)
+        with _emit_lock:
+            return self._stream.write(text)
+
+    def flush(self):
+        if getattr(_local, "buffer", None) is None:
+            self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+@contextmanager
+def routed_stdout():
+    """
+    Route `sys.stdout` through a per-thread dispatcher for the duration of the block.
+    """
+    original = sys.stdout
+    sys.stdout = _ThreadRoutedStream(original)
+    try:
+        yield
+    finally:
+        sys.stdout = original
+
+
+@contextmanager
+def buffered_output():
+    """
+    Collect everything the current thread prints, then write it out in one piece.
+
+    Only takes effect inside `routed_stdout()`; otherwise output passes
+    straight through.
+    """
+    stream = sys.stdout
+    if not isinstance(stream, _ThreadRoutedStream):
+        yield
+        return
+
+    _local.buffer = io.StringIO()
+    try:
+        yield
+    finally:
+        text = _local.buffer.getvalue()
+        _local.buffer = None
+        if text:
+            stream.write(text)
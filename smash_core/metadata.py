@@ -0,0 +1,230 @@
+"""
+Reads smashlet constants and function definitions statically, without importing.
+
+Freshness checks only need literal constants like `RUN` and `INPUT_GLOB` and to
+know that `run()` exists. Parsing the source with `ast` answers that without
+executing the smashlet's top-level code (and its imports). Results are cached
+per source digest, and between runs in `.smash/metadata.json`, keyed by path
+and validated by (inode, size, mtime_ns) like the digest cache.
+
+Note: This module is internal and not part of the public Smash API.
+"""
+
+import ast
+import hashlib
+import json
+from pathlib import Path
+
+from smash_core.project import StampCache, file_stamp
+
+METADATA_FILE = "metadata.json"
+
+# Names whose values decide freshness; anything else in a smashlet is ignored
+TRACKED_CONSTANTS = {
+    "RUN",
+    "RUN_TIMEOUT",
+    "INPUT_GLOB",
+    "OUTPUT_FILES",
+    "FRESHNESS",
+    "INCREMENTAL",
+    "CACHE",
+}
+TRACKED_FUNCTIONS = {"run", "run_one", "should_run", "get_outputs"}
+TRACKED_NAMES = TRACKED_CONSTANTS | TRACKED_FUNCTIONS
+
+# Hooks that can only be evaluated by importing and calling them
+DYNAMIC_HOOKS = {"should_run", "get_outputs"}
+
+# Stands in for a function that is defined in the source but not imported
+DEFINED = object()
+
+_cache = {}
+
+
+def read_smashlet_metadata(smashlet_path: Path, index=None):
+    """
+    Statically extract a smashlet's tracked constants and functions.
+
+    Args:
+        index (MetadataIndex, optional): Results kept from earlier runs
+
+    Returns:
+        dict or None: None if the file can't be read or parsed, otherwise
+        {
+            "digest": str,          # sha1 of the source
+            "constants": dict,      # literal values of tracked constants
+            "functions": set,       # tracked names defined with def / async def
+            "coroutines": set,      # those defined with async def
+            "static": bool,         # False if any tracked name is bound dynamically
+        }
+    """
+    if index is not None:
+        meta = index.get(smashlet_path)
+        if meta is not None:
+            return meta
+
+    try:
+        source = Path(smashlet_path).read_bytes()
+    except OSError:
+        return None
+
+    digest = hashlib.sha1(source).hexdigest()
+    if digest in _cache:
+        meta = _cache[digest]
+    else:
+        try:
+            tree = ast.parse(source, filename=str(smashlet_path))
+        except (SyntaxError, ValueError):
+            meta = None
+        else:
+            meta = extract_metadata(tree, scan_globals=b"global" in source)
+            meta["digest"] = digest
+        _cache[digest] = meta
+
+    if index is not None and meta is not None:
+        index.put(smashlet_path, meta)
+    return meta
+
+
+class MetadataIndex(StampCache):
+    """
+    Smashlet metadata keyed by path and validated by (inode, size, mtime_ns).
+
+    Saves parsing every smashlet in a fresh process. Thread-safe, so
+    parallel status checks and build workers can share one index.
+    """
+
+    FILE = METADATA_FILE
+
+    def __init__(self, path=None, entries=None):
+        super().__init__(path, entries)
+        self._decoded = {}
+
+    def get(self, smashlet_path):
+        """
+        Return the stored metadata if the file is unchanged, else None.
+        """
+        key = str(smashlet_path)
+        cached = self.lookup(key, file_stamp(key))
+        if not cached or "coroutines" not in cached[0]:
+            return None
+        with self._lock:
+            meta = self._decoded.get(key)
+            if meta is None:
+                meta = dict(
+                    cached[0],
+                    functions=set(cached[0]["functions"]),
+                    coroutines=set(cached[0]["coroutines"]),
+                )
+                self._decoded[key] = meta
+            return meta
+
+    def put(self, smashlet_path, meta):
+        """
+        Store metadata for a file, unless it was modified too recently to trust
+        or its constants don't survive a JSON round trip (e.g. tuples).
+        """
+        key = str(smashlet_path)
+        stored = dict(
+            meta,
+            functions=sorted(meta["functions"]),
+            coroutines=sorted(meta["coroutines"]),
+        )
+        try:
+            if json.loads(json.dumps(stored["constants"])) != meta["constants"]:
+                return
+        except (TypeError, ValueError):
+            return
+        if self.store(key, file_stamp(key), stored):
+            with self._lock:
+                self._decoded[key] = meta
+
+
+def needs_import(meta) -> bool:
+    """
+    Check whether a freshness decision requires importing the smashlet.
+    """
+    return meta is None or not meta["static"] or bool(meta["functions"] & DYNAMIC_HOOKS)
+
+
+def extract_metadata(tree: ast.Module, scan_globals=True) -> dict:
+    """
+    Walk a module's top-level statements and record tracked bindings.
+
+    Only plain `NAME = <literal>` assignments and top-level `def`s are trusted.
+    Tracked names bound any other way (imports, computed values, inside `if` or
+    `try` blocks, `global` statements, star imports) mark the module as not static.
+    `scan_globals=False` skips looking for `global` statements in nested code,
+    for sources known not to contain the word.
+    """
+    constants = {}
+    functions = set()
+    coroutines = set()
+    static = True
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if node.name in TRACKED_FUNCTIONS:
+                functions.add(node.name)
+                if isinstance(node, ast.AsyncFunctionDef):
+                    coroutines.add(node.name)
+            elif node.name in TRACKED_CONSTANTS:
+                static = False
+            if node.name == "__getattr__":
+                static = False
+            continue
+
+        if isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names = _bound_names(targets)
+            if not names & TRACKED_NAMES:
+                continue
+            simple = (
+                len(targets) == 1
+                and isinstance(targets[0], ast.Name)
+                and targets[0].id in TRACKED_CONSTANTS
+                and node.value is not None
+            )
+            if not simple:
+                static = False
+                continue
+            try:
+                constants[targets[0].id] = ast.literal_eval(node.value)
+            except ValueError:
+                static = False
+            continue
+
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                bound = alias.asname or alias.name.split(".")[0]
+                if alias.name == "*" or bound in TRACKED_NAMES:
+                    static = False
+            continue
+
+        # Any other statement (if/try/with/for/...) must not bind tracked names
+        if _bound_names([node]) & TRACKED_NAMES:
+            static = False
+
+    for node in ast.walk(tree) if scan_globals else ():
+        if isinstance(node, ast.Global) and set(node.names) & TRACKED_NAMES:
+            static = False
+
+    return {
+        "constants": constants,
+        "functions": functions,
+        "coroutines": coroutines,
+        "static": static,
+    }
+
+
+def _bound_names(nodes):
+    names = set()
+    for node in nodes:
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.Name) and isinstance(sub.ctx, ast.Store):
+                names.add(sub.id)
+            elif isinstance(sub, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                names.add(sub.name)
+            elif isinstance(sub, ast.alias):
+                names.add(sub.asname or sub.name.split(".")[0])
+    return names
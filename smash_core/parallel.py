@@ -0,0 +1,193 @@
+"""
+Spreads CPU-bound work inside a smashlet over a process pool.
+
+Smashlet functions live in modules Smash loads from file paths, so they can't
+be pickled by reference. On Linux, in a single-threaded build, the function is
+registered before the workers fork and only the items and results cross
+process boundaries. Forking a process with other threads running (`--jobs`,
+async smashlets, the daemon) can deadlock on locks those threads hold, and
+macOS does not support fork reliably, so otherwise workers are started from
+a fork server (or spawned where there is none). Those workers get a
+picklable function as is; any other top-level function is sent as the path
+of the file that defines it and its name, and each worker loads that file
+once, the way Smash loads a smashlet. Only lambdas and nested functions
+run serially.
+
+What `func` prints in a worker is captured and printed by the calling
+smashlet once the results are in, in item order, so it shows up with the
+smashlet's output.
+
+Exposed to users via the public `smash` API.
+"""
+
+import io
+import itertools
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from smash_core.log import log
+
+# Below this many items, starting processes costs more than it saves
+PARALLEL_MIN_ITEMS = 16
+
+# Functions registered for forked workers, by call
+_tasks = {}
+_task_ids = itertools.count()
+_tasks_lock = threading.Lock()
+
+
+def _captured(func, item):
+    out = io.StringIO()
+    with redirect_stdout(out):
+        result = func(item)
+    return result, out.getvalue()
+
+
+def _run_task(task_id, item):
+    return _captured(_tasks[task_id], item)
+
+
+def _run_func(func, item):
+    return _captured(func, item)
+
+
+# Smashlets loaded by this worker process, by path
+_modules = {}
+
+
+def _run_ref(ref, item):
+    return _captured(_resolve(ref), item)
+
+
+def _file_ref(func):
+    """
+    Return (path, qualname, cwd) to find a top-level function by, or None.
+    """
+    path = getattr(func, "__globals__", {}).get("__file__")
+    qualname = getattr(func, "__qualname__", "")
+    if not path or not qualname or "<" in qualname:
+        return None
+    return (path, qualname, os.getcwd())
+
+
+def _resolve(ref):
+    """
+    Load the function behind a `_file_ref()` in a worker process.
+    """
+    from smash_core.smashlets import load_smashlet_module
+
+    path, qualname, cwd = ref
+    # Fork server workers start in the directory the server started in
+    if os.getcwd() != cwd:
+        os.chdir(cwd)
+    mod = _modules.get(path)
+    if mod is None:
+        mod = load_smashlet_module(Path(path))
+        if mod is None:
+            raise ImportError(f"parallel_map: could not load {path} in a worker")
+        _modules[path] = mod
+    func = mod
+    for name in qualname.split("."):
+        func = getattr(func, name)
+    return func
+
+
+def _fork_context():
+    """
+    Return the fork context if forking is safe here, else None.
+    """
+    if not sys.platform.startswith("linux") or threading.active_count() > 1:
+        return None
+    return multiprocessing.get_context("fork")
+
+
+def _spawn_context():
+    """
+    Return a context that starts workers without forking this process.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _results(outcomes):
+    results = []
+    for result, printed in outcomes:
+        if printed:
+            sys.stdout.write(printed)
+        results.append(result)
+    return results
+
+
+def parallel_map(func, items, context=None, workers=None, chunksize=None):
+    """
+    Apply `func` to every item on a process pool and return the results in order.
+
+    Args:
+        func (callable): Called as `func(item)` in a worker process
+        items (iterable): Inputs; they and the results must be picklable
+        context (dict, optional): The smashlet context. `context["workers"]`,
+            if set, caps the pool size, e.g. when smashlets already run in
+            parallel with `smash build --jobs`
+        workers (int, optional): Pool size; defaults to one per CPU
+        chunksize (int, optional): Items sent to a worker at a time
+
+    Returns:
+        list: `[func(item) for item in items]`
+
+    Raises:
+        The first exception raised by `func`, as in a serial loop.
+
+    Small inputs, single-CPU machines, and lambdas or nested functions when
+    workers can't fork, run serially in the calling process. What `func`
+    prints to stdout in a worker is printed here afterwards; stderr is not
+    captured.
+    """
+    items = list(items)
+    workers = workers or (context or {}).get("workers") or os.cpu_count() or 1
+    workers = min(workers, len(items))
+
+    if workers <= 1 or len(items) < PARALLEL_MIN_ITEMS:
+        return [func(item) for item in items]
+
+    if chunksize is None:
+        chunksize = max(1, len(items) // (workers * 4))
+
+    fork = _fork_context()
+    if fork is None:
+        run, target = _run_func, func
+        try:
+            pickle.dumps(func)
+        except Exception:
+            run, target = _run_ref, _file_ref(func)
+        if target is None:
+            log(
+                f"parallel_map: {getattr(func, '__name__', func)} can't be sent "
+                "to worker processes, running serially",
+                level="warn",
+            )
+            return [func(item) for item in items]
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=_spawn_context()
+        ) as pool:
+            return _results(
+                pool.map(run, [target] * len(items), items, chunksize=chunksize)
+            )
+
+    with _tasks_lock:
+        task_id = next(_task_ids)
+        _tasks[task_id] = func
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=fork) as pool:
+            return _results(
+                pool.map(_run_task, [task_id] * len(items), items, chunksize=chunksize)
+            )
+    finally:
+        with _tasks_lock:
+            del _tasks[task_id]
@@ -0,0 +1,118 @@
+"""
+Translates glob and ignore patterns into compiled regular expressions.
+
+Used for `.smashignore` rules during discovery and for matching paths against
+a smashlet's `INPUT_GLOB` without touching the filesystem.
+
+Note: This module is internal and not part of the public Smash API.
+"""
+
+import re
+
+
+def glob_to_regex(pattern: str):
+    """
+    Compile a glob pattern into a regex matching POSIX-style relative paths.
+
+    Supports:
+    - `*` and `?` (never crossing a `/`)
+    - `**` for any number of directories (`**/` may match none)
+    - `[abc]` and `[!abc]` character classes
+    """
+    out = []
+    i, n = 0, len(pattern)
+
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern[i : i + 2] == "**":
+                if pattern[i + 2 : i + 3] == "/":
+                    out.append("(?:.*/)?")
+                    i += 3
+                else:
+                    out.append(".*")
+                    i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            k = i + 1
+            if k < n and pattern[k] == "!":
+                k += 1
+            if k < n and pattern[k] == "]":
+                k += 1
+            j = pattern.find("]", k)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : j].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j + 1
+                continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+
+    return re.compile("".join(out) + r"\Z")
+
+
+def parse_ignore_line(line: str):
+    """
+    Parse one `.gitignore`-style line into a rule dict, or None for blanks and comments.
+
+    Rule keys:
+        regex (Pattern): Matches paths relative to the ignore file's directory
+        negate (bool): True for `!pattern` re-includes
+        dir_only (bool): True if the pattern ended with `/`
+    """
+    line = line.rstrip()
+    if not line or line.startswith("#"):
+        return None
+
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    if line.startswith("\\"):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    # Patterns containing a slash are anchored to the ignore file's directory;
+    # bare names match at any depth.
+    if "/" in line:
+        pattern = line.lstrip("/")
+    else:
+        pattern = "**/" + line
+
+    return {
+        "regex": glob_to_regex(pattern),
+        "negate": negate,
+        "dir_only": dir_only,
+    }
+
+
+class IgnoreRules:
+    """
+    An ordered list of `.gitignore`-style rules. The last matching rule wins.
+    """
+
+    def __init__(self, lines=()):
+        self.rules = [r for r in (parse_ignore_line(line) for line in lines) if r]
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """
+        Check whether a POSIX-style path relative to the project root is ignored.
+        """
+        ignored = False
+        for rule in self.rules:
+            if rule["dir_only"] and not is_dir:
+                continue
+            if rule["regex"].match(rel_path):
+                ignored = not rule["negate"]
+        return ignored
@@ -2,17 +2,25 @@
 Manages project-level state, including project root detection and runlog persistence.
 
 - Locates the Smash project root (identified by a `.smash/` directory)
-- Reads and writes `.smash/runlog.json` with structured per-smashlet metadata
+- Reads project settings from `.smash/config.json`
+- Reads and writes `.smash/runlog.json` with structured per-smashlet metadata,
+  or delegates to the SQLite backend in `state.py` when configured
 
 Note: This module is internal and not part of the public Smash API.
 """
 
 import json
+import os
+import tempfile
+import threading
 import time
 from pathlib import Path
 
 from smash_core.log import log
 
+# Serializes runlog read-modify-write cycles between build worker threads
+_runlog_lock = threading.Lock()
+
 
 def find_project_root():
     """
@@ -29,6 +37,188 @@ def find_project_root():
     return None
 
 
+CONFIG_FILE = "config.json"
+DEFAULT_HISTORY_LIMIT = 10  # Runs kept per smashlet unless "history" is configured
+DEFAULT_ASYNC_JOBS = 8  # Async smashlets in flight unless "async_jobs" is configured
+
+
+def get_project_config(project_root) -> dict:
+    """
+    Read `.smash/config.json`. Missing or unreadable files yield an empty dict.
+
+    Known keys:
+        "state": "json" (default) or "sqlite" — where the runlog is kept
+        "history": number of runs kept per smashlet (default 10); SQLite
+            keeps every run and uses this for what `get()` returns
+        "context_cache": true to keep parsed context files between builds
+        "cache", "cache_size_mb", "cache_restore": the output cache (see `cache.py`)
+        "async_jobs": async smashlets run at once (default 8)
+    """
+    try:
+        config = json.loads((project_root / ".smash" / CONFIG_FILE).read_text())
+    except (OSError, ValueError):
+        return {}
+    return config if isinstance(config, dict) else {}
+
+
+def update_project_config(project_root, **values):
+    """
+    Merge `values` into `.smash/config.json`.
+    """
+    config = get_project_config(project_root)
+    config.update(values)
+    write_json_atomic(project_root / ".smash" / CONFIG_FILE, config, indent=2)
+
+
+def history_limit(project_root) -> int:
+    """
+    Return how many runs to keep per smashlet, from `"history"` in the config.
+    """
+    limit = get_project_config(project_root).get("history")
+    if isinstance(limit, int) and not isinstance(limit, bool) and limit > 0:
+        return limit
+    return DEFAULT_HISTORY_LIMIT
+
+
+def async_jobs(project_root) -> int:
+    """
+    Return how many async smashlets may run at once, from `"async_jobs"` in the config.
+    """
+    limit = get_project_config(project_root).get("async_jobs")
+    if isinstance(limit, int) and not isinstance(limit, bool) and limit > 0:
+        return limit
+    return DEFAULT_ASYNC_JOBS
+
+
+def open_runlog(project_root, flush_interval=None, read_only=False):
+    """
+    Open the runlog using the backend selected in `.smash/config.json`.
+
+    With `read_only`, a missing state database is not created; the runlog is
+    read from `runlog.json` instead, as it would be before the migration.
+
+    Returns a `Runlog` (JSON) or a `state.SqliteRunlog`; both share the same interface.
+    """
+    config = get_project_config(project_root)
+    limit = history_limit(project_root)
+    if config.get("state") == "sqlite":
+        from smash_core.state import STATE_FILE, SqliteRunlog
+
+        if not read_only or (project_root / ".smash" / STATE_FILE).exists():
+            return SqliteRunlog.open(
+                project_root, history_limit=limit, read_only=read_only
+            )
+    return Runlog.load(project_root, flush_interval=flush_interval, history_limit=limit)
+
+
+def write_json_atomic(path, data, indent=None):
+    """
+    Write `data` as JSON via a temp file and rename, so readers never see a
+    partially written file and a crash leaves the previous version intact.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+# Files modified this recently may change again within the same mtime tick,
+# so nothing derived from them is cached.
+RACY_WINDOW_NS = 1_000_000_000
+
+
+def file_stamp(path):
+    """
+    Return [inode, size, mtime_ns] for `path`, or None if it can't be stat'ed.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+class StampCache:
+    """
+    Values derived from files, keyed by path and validated by `file_stamp()`.
+
+    Kept in `.smash/<FILE>` as {path: [inode, size, mtime_ns, *values]}.
+    Files modified within `RACY_WINDOW_NS` are not stored. Thread-safe, so
+    parallel build workers can share one cache.
+    """
+
+    FILE = None
+
+    def __init__(self, path=None, entries=None):
+        self.path = path
+        self.entries = entries or {}
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, project_root):
+        """
+        Load the cache from `.smash/<FILE>`.
+
+        Starts empty if the file is missing or unreadable.
+        """
+        smash_dir = Path(project_root) / ".smash"
+        path = smash_dir / cls.FILE if smash_dir.is_dir() else None
+        entries = {}
+        if path:
+            try:
+                entries = json.loads(path.read_text())
+            except (OSError, ValueError):
+                entries = {}
+        return cls(path, entries if isinstance(entries, dict) else {})
+
+    def lookup(self, key, stamp):
+        """
+        Return the values stored for `key` under `stamp`, or None.
+        """
+        with self._lock:
+            cached = self.entries.get(key)
+        if stamp is None or not cached or cached[:3] != stamp:
+            return None
+        return cached[3:]
+
+    def store(self, key, stamp, *values) -> bool:
+        """
+        Store values for `key` unless its file changed too recently to trust.
+        """
+        if stamp is None or time.time_ns() - stamp[2] < RACY_WINDOW_NS:
+            return False
+        with self._lock:
+            self.entries[key] = stamp + list(values)
+            self.dirty = True
+        return True
+
+    def save(self):
+        """
+        Write the cache back to disk if anything changed.
+        """
+        if not self.path or not self.dirty:
+            return
+        with self._lock:
+            entries = self._persisted()
+            self.dirty = False
+        try:
+            write_json_atomic(self.path, entries)
+        except OSError:
+            pass
+
+    def _persisted(self) -> dict:
+        return dict(self.entries)
+
+
 def get_runlog(project_root):
     """
     Read and normalize the runlog from `.smash/runlog.json`.
@@ -37,21 +227,47 @@ def get_runlog(project_root):
     {
         "last_run": int,
         "runs": int,
-        "history": [ { "finished_on": int, "duration": float? } ]
+        "history": [ { "finished_on": int, "duration": float? } ],
+        "digest": str?   # combined input digest, for hash freshness
     }
 
     Ignores legacy flat timestamps. No migration is attempted.
     """
-    path = project_root / ".smash" / "runlog.json"
-    if not path.exists():
-        return {}
-
+    runlog = open_runlog(project_root)
     try:
-        raw = json.loads(path.read_text())
-    except Exception as e:
-        log(f"Failed to read runlog.json: {e}", level="error")
-        return {}
+        return runlog.entries
+    finally:
+        runlog.close()
+
 
+def update_runlog(
+    project_root,
+    smashlet_path,
+    finished_on=None,
+    duration=None,
+    digest=None,
+    inputs=None,
+):
+    """
+    Record a finished run for `smashlet_path` in the project runlog.
+
+    `digest` is the combined input digest the run consumed and `inputs` the
+    per-input digests, stored for hash-based freshness checks. Safe to call
+    from several build worker threads at once.
+    """
+    with _runlog_lock:
+        runlog = open_runlog(project_root)
+        try:
+            runlog.record(smashlet_path, finished_on, duration, digest, inputs)
+        finally:
+            runlog.close()
+
+
+def _normalize_runlog(raw, history_limit=DEFAULT_HISTORY_LIMIT):
+    """
+    Drop legacy and malformed entries, keeping the last `history_limit` runs
+    of each (all of them if None).
+    """
     runlog = {}
 
     for key, value in raw.items():
@@ -78,31 +294,143 @@ def get_runlog(project_root):
         runlog[key] = {
             "last_run": value["last_run"],
             "runs": value.get("runs", len(normalized)),
-            "history": normalized[-10:],
+            "history": normalized[-history_limit:] if history_limit else normalized,
         }
+        if isinstance(value.get("digest"), str):
+            runlog[key]["digest"] = value["digest"]
+        if isinstance(value.get("inputs"), dict):
+            runlog[key]["inputs"] = value["inputs"]
 
     return runlog
 
 
-def update_runlog(project_root, smashlet_path, finished_on=None, duration=None):
-    runlog = get_runlog(project_root)
-    key = str(smashlet_path)
-    now = int(finished_on or time.time())
+class Runlog:
+    """
+    Build-scoped, in-memory runlog.
+
+    Loaded once from `.smash/runlog.json`, updated in memory as smashlets
+    finish, and written back with one atomic temp-file-plus-rename by
+    `flush()`. If `flush_interval` is set, pending updates are also flushed
+    whenever that many seconds have passed since the last write, bounding
+    what a crash can lose.
+    """
+
+    def __init__(
+        self,
+        project_root,
+        entries=None,
+        flush_interval=None,
+        history_limit=DEFAULT_HISTORY_LIMIT,
+    ):
+        self.path = project_root / ".smash" / "runlog.json"
+        self.entries = entries if entries is not None else {}
+        self.flush_interval = flush_interval
+        self.history_limit = history_limit
+        self.dirty = False
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+
+    @classmethod
+    def load(
+        cls, project_root, flush_interval=None, history_limit=DEFAULT_HISTORY_LIMIT
+    ):
+        """
+        Read and normalize `.smash/runlog.json`.
+
+        Starts empty if the file is missing or unreadable.
+        """
+        runlog = cls(
+            project_root, flush_interval=flush_interval, history_limit=history_limit
+        )
+        if not runlog.path.exists():
+            return runlog
+
+        try:
+            raw = json.loads(runlog.path.read_text())
+        except Exception as e:
+            log(f"Failed to read runlog.json: {e}", level="error")
+            return runlog
+
+        runlog.entries = _normalize_runlog(raw, history_limit)
+        return runlog
+
+    def get(self, smashlet_path, default=None):
+        """
+        Return the entry for a smashlet, or `default` if it has never run.
+        """
+        return self.entries.get(str(smashlet_path), default)
+
+    def get_inputs(self, smashlet_path) -> dict:
+        """
+        Return the per-input digests stored with the smashlet's last run.
+        """
+        return dict(self.get(smashlet_path, {}).get("inputs", {}))
+
+    def history(self, smashlet_path, limit=None):
+        """
+        Return a smashlet's kept run history, oldest first.
+        """
+        history = list(self.get(smashlet_path, {}).get("history", []))
+        return history[-limit:] if limit else history
+
+    def record(
+        self, smashlet_path, finished_on=None, duration=None, digest=None, inputs=None
+    ):
+        """
+        Record a finished run in memory.
+
+        `digest` is the combined input digest and `inputs` the per-input
+        digests ({relative path: digest}) the run consumed, if known. A run
+        recorded without a digest clears the stored one.
+        """
+        key = str(smashlet_path)
+        now = int(finished_on or time.time())
+
+        history_entry = {"finished_on": now}
+        if duration is not None:
+            history_entry["duration"] = duration
+
+        with self._lock:
+            entry = self.entries.get(key)
+
+            if isinstance(entry, dict):
+                entry["last_run"] = now
+                entry["runs"] = entry.get("runs", 0) + 1
+                history = entry.get("history", [])
+                history.append(history_entry)
+                entry["history"] = history[-self.history_limit :]
+            else:
+                entry = {"last_run": now, "runs": 1, "history": [history_entry]}
+                self.entries[key] = entry
 
-    history_entry = {"finished_on": now}
-    if duration is not None:
-        history_entry["duration"] = duration
+            # A run without a digest (mtime freshness) makes the old one stale
+            if digest is not None:
+                entry["digest"] = digest
+            else:
+                entry.pop("digest", None)
+            if inputs is not None:
+                entry["inputs"] = inputs
 
-    entry = runlog.get(key)
+            self.dirty = True
+            if (
+                self.flush_interval is not None
+                and time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self.flush()
 
-    if isinstance(entry, dict):
-        entry["last_run"] = now
-        entry["runs"] = entry.get("runs", 0) + 1
-        history = entry.get("history", [])
-        history.append(history_entry)
-        entry["history"] = history[-10:]
-    else:
-        runlog[key] = {"last_run": now, "runs": 1, "history": [history_entry]}
+    def flush(self):
+        """
+        Atomically write pending changes to `.smash/runlog.json`.
+        """
+        with self._lock:
+            if not self.dirty:
+                return
+            write_json_atomic(self.path, self.entries, indent=2)
+            self.dirty = False
+            self._last_flush = time.monotonic()
 
-    runlog_path = project_root / ".smash" / "runlog.json"
-    runlog_path.write_text(json.dumps(runlog, indent=2))
+    def close(self):
+        """
+        Flush pending changes. Part of the interface shared with `SqliteRunlog`.
+        """
+        self.flush()
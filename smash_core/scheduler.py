@@ -0,0 +1,198 @@
+"""
+Works out which smashlets feed each other and runs them concurrently.
+
+A smashlet depends on another when one of the other's declared outputs
+(`OUTPUT_FILES` or `get_outputs()`) matches its `INPUT_GLOB`. The build runs
+this graph in topological order in a single pass: independent smashlets can
+run side by side on a thread pool, while dependent ones wait for their
+producers to finish. Cycles are reported instead of being run.
+
+Note: This module is internal and not part of the public Smash API.
+"""
+
+import heapq
+import os
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from smash_core.patterns import glob_to_regex
+from smash_core.smashlets import load_smashlet_spec
+
+
+def declared_outputs(smashlet_path: Path, session=None):
+    """
+    Return the output paths a smashlet declares, resolved against the working directory.
+
+    Uses `get_outputs()` if defined, otherwise `OUTPUT_FILES`. Invalid
+    smashlets and failing `get_outputs()` calls declare nothing.
+    """
+    spec, _ = load_smashlet_spec(smashlet_path, session)
+    if not spec:
+        return []
+
+    get_outputs = spec["functions"]["get_outputs"]
+    try:
+        outputs = get_outputs() if get_outputs else spec["constants"]["OUTPUT_FILES"]
+        return [Path(p).resolve() for p in outputs or []]
+    except Exception:
+        return []
+
+
+def input_glob(smashlet_path: Path, session=None):
+    """
+    Return a smashlet's INPUT_GLOB, or None if it has none or is invalid.
+    """
+    spec, _ = load_smashlet_spec(smashlet_path, session)
+    return spec["constants"]["INPUT_GLOB"] if spec else None
+
+
+def find_dependencies(smashlets, session=None, outputs=None) -> dict:
+    """
+    Map each smashlet to the set of smashlets whose outputs match its INPUT_GLOB.
+
+    Args:
+        smashlets (List[Path]): Smashlets to consider
+        session (BuildSession, optional): Reuses loaded modules for `get_outputs()`
+        outputs (dict, optional): {smashlet: declared outputs}, if already known
+
+    Returns:
+        dict: {smashlet: set(upstream smashlets)}
+    """
+    if outputs is None:
+        outputs = {s: declared_outputs(s, session) for s in smashlets}
+    deps = {s: set() for s in smashlets}
+
+    # Index outputs under every directory above them, so a consumer only
+    # looks at outputs below its own directory instead of all of them
+    below = defaultdict(list)
+    everything = []
+    for producer in smashlets:
+        for out in outputs[producer]:
+            everything.append((producer, out))
+            for parent in out.parents:
+                below[parent].append((producer, out))
+
+    for consumer in smashlets:
+        pattern = input_glob(consumer, session)
+        if not pattern:
+            continue
+
+        regex = glob_to_regex(pattern)
+        base = consumer.parent.resolve()
+
+        # Patterns reaching outside the smashlet dir can match any output
+        outside = pattern.startswith(("..", "/")) or "/../" in pattern
+        candidates = everything if outside else below.get(base, ())
+
+        for producer, out in candidates:
+            if producer == consumer or producer in deps[consumer]:
+                continue
+            rel = Path(os.path.relpath(out, base)).as_posix()
+            if regex.match(rel):
+                deps[consumer].add(producer)
+
+    return deps
+
+
+def topological_order(nodes, deps: dict):
+    """
+    Order `nodes` so every node comes after its dependencies.
+
+    Among nodes that are ready at the same time, the given order is kept,
+    so ties still fall back to e.g. modification time.
+
+    Returns:
+        (order, cycle): The ordered nodes and None, or a partial order and
+        the list of nodes forming a cycle (first node repeated at the end)
+    """
+    position = {node: i for i, node in enumerate(nodes)}
+    waiting = {node: set(deps.get(node, ())) & position.keys() for node in nodes}
+    dependents = {node: [] for node in nodes}
+    for node, upstream in waiting.items():
+        for dep in upstream:
+            dependents[dep].append(node)
+
+    # Ready nodes as (position, node) in a heap, so the earliest comes first
+    ready = [(position[node], node) for node in nodes if not waiting[node]]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        _, node = heapq.heappop(ready)
+        order.append(node)
+        for child in dependents[node]:
+            waiting[child].discard(node)
+            if not waiting[child]:
+                heapq.heappush(ready, (position[child], child))
+
+    if len(order) == len(nodes):
+        return order, None
+    return order, _find_cycle({n: w for n, w in waiting.items() if w})
+
+
+def _find_cycle(waiting: dict):
+    # Every remaining node still waits on another remaining node,
+    # so following any dependency chain must revisit a node.
+    node = next(iter(waiting))
+    seen = []
+    while node not in seen:
+        seen.append(node)
+        node = min(waiting[node], key=str)
+    return seen[seen.index(node) :] + [node]
+
+
+def is_async(smashlet_path: Path, session=None) -> bool:
+    """
+    Return True if the smashlet's `run` or `run_one` is a coroutine function.
+    """
+    spec, _ = load_smashlet_spec(smashlet_path, session)
+    return bool(spec and spec["async"])
+
+
+def run_graph(nodes, deps: dict, task, jobs: int, async_nodes=(), async_jobs=0) -> dict:
+    """
+    Call `task(node)` for every node on up to `jobs` worker threads.
+
+    A node starts only once all of its dependencies among `nodes` have
+    finished. When several nodes are ready they start in the given order.
+    `nodes` must be free of cycles (see `topological_order`).
+
+    Nodes in `async_nodes` spend their time waiting on the build's event
+    loop, so up to `async_jobs` of them run on extra threads, next to the
+    `jobs` others.
+
+    Returns:
+        dict: {node: task result}
+    """
+    remaining = list(nodes)
+    running = {}
+    results = {}
+    async_nodes = set(async_nodes) if async_jobs > 0 else set()
+    jobs = max(1, jobs)
+
+    def lane_full(node):
+        lane = node in async_nodes
+        busy = sum(1 for n in running.values() if (n in async_nodes) == lane)
+        return busy >= (async_jobs if lane else jobs)
+
+    workers = jobs + (async_jobs if async_nodes else 0)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while remaining or running:
+            pending = set(remaining) | set(running.values())
+
+            for node in list(remaining):
+                if lane_full(node):
+                    continue
+                if deps.get(node, set()) & (pending - {node}):
+                    continue
+                remaining.remove(node)
+                running[pool.submit(task, node)] = node
+
+            if not running:
+                raise ValueError("Dependency cycle among remaining nodes")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+    return results
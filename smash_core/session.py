@@ -0,0 +1,175 @@
+"""
+Holds the state shared by every smashlet check and run during a single build.
+
+A `BuildSession` is created once per `smash build`, `smash run` or `smash status`
+call and passed down to the engine, so work like loading smashlet modules
+and parsing context files happen once per build instead of once per check. A
+long-lived process (the daemon) can hand the same module registry, context
+loader and caches to every session it creates, keeping them warm between
+builds. A read-only session (`smash status`) never writes anything back.
+
+Note: This module is internal and not part of the public Smash API.
+"""
+
+from smash_core.async_runner import EventLoopThread
+from smash_core.cache import OutputCache
+from smash_core.context_loader import ContextCache, build_context
+from smash_core.digests import StatCache
+from smash_core.metadata import MetadataIndex
+from smash_core.project import open_runlog
+from smash_core.snapshot import FileSnapshot
+from smash_core.trace import NULL_TRACER
+from smash_core.smashlets import ModuleRegistry
+
+# Seconds between runlog writes during a long build
+RUNLOG_FLUSH_INTERVAL = 5.0
+
+
+class BuildSession:
+    """
+    Build-scoped state for one Smash invocation.
+
+    Attributes:
+        project_root (Path): Root of the Smash project
+        modules (ModuleRegistry): Loaded smashlet modules, reused across passes
+        freshness (str or None): "hash" or "mtime" to override every
+            smashlet's FRESHNESS setting, None to respect it
+        runlog (Runlog or SqliteRunlog): The runlog, opened once and
+            flushed on `close()`
+        context (dict): The global build context, built on first use
+        context_cache (ContextCache): Parsed context files, shared by the
+            global and every local context
+        metadata_index (MetadataIndex): Statically read smashlet metadata,
+            kept between runs
+        snapshot (FileSnapshot): Memoized stat and glob results, cleared at
+            the start of each build pass
+        tracer (Tracer or NullTracer): Records timing spans for `--trace`
+        failed (set): Smashlets whose run raised during this session
+        output_cache (OutputCache): Stored outputs of cached smashlets
+        event_loop (EventLoopThread): Runs `async def run` smashlets, started
+            on first use
+        read_only (bool): Keep caches and the runlog in memory only
+    """
+
+    def __init__(
+        self,
+        project_root,
+        freshness=None,
+        modules=None,
+        context_loader=None,
+        stat_cache=None,
+        context_cache=None,
+        tracer=None,
+        read_only=False,
+    ):
+        self.project_root = project_root
+        self.modules = modules if modules is not None else ModuleRegistry()
+        self.freshness = freshness
+        self._context_loader = context_loader
+        self._context = None
+        self._stat_cache = stat_cache
+        self._context_cache = context_cache
+        self.snapshot = FileSnapshot()
+        self.tracer = tracer or NULL_TRACER
+        self._runlog = None
+        self._output_cache = None
+        self._metadata_index = None
+        self.event_loop = EventLoopThread()
+        self.failed = set()
+        self.read_only = read_only
+
+    @property
+    def context(self):
+        """
+        The global build context (`context_loader.build_context`), built on first use.
+        """
+        if self._context is None:
+            with self.tracer.span("build context"):
+                if self._context_loader is not None:
+                    self._context = self._context_loader(self.project_root)
+                else:
+                    self._context = build_context(self.project_root, self.context_cache)
+        return self._context
+
+    def invalidate_context(self):
+        """
+        Forget the global context, so it is built again (through the context
+        cache) on next use, e.g. after `smash.py` or `context/` changed.
+        """
+        self._context = None
+
+    @property
+    def context_cache(self):
+        """
+        Parsed context files, loaded on first use.
+        """
+        if self._context_cache is None:
+            self._context_cache = ContextCache.load(self.project_root)
+        return self._context_cache
+
+    @property
+    def stat_cache(self):
+        """
+        The project's file digest cache, loaded on first use.
+        """
+        if self._stat_cache is None:
+            self._stat_cache = StatCache.load(self.project_root)
+        return self._stat_cache
+
+    @property
+    def metadata_index(self):
+        """
+        Smashlet metadata read in earlier runs, loaded on first use.
+        """
+        if self._metadata_index is None:
+            self._metadata_index = MetadataIndex.load(self.project_root)
+        return self._metadata_index
+
+    @property
+    def output_cache(self):
+        """
+        The project's output cache (`cache.OutputCache`), opened on first use.
+        """
+        if self._output_cache is None:
+            self._output_cache = OutputCache(self.project_root)
+        return self._output_cache
+
+    @property
+    def runlog(self):
+        """
+        The project's runlog, opened on first use with the configured backend.
+        """
+        if self._runlog is None:
+            self._runlog = open_runlog(
+                self.project_root,
+                flush_interval=RUNLOG_FLUSH_INTERVAL,
+                read_only=self.read_only,
+            )
+        return self._runlog
+
+    def flush(self):
+        """
+        Persist state gathered so far, keeping the session usable.
+        """
+        if self.read_only:
+            return
+        if self._stat_cache is not None:
+            self._stat_cache.save()
+        if self._context_cache is not None:
+            self._context_cache.save()
+        if self._metadata_index is not None:
+            self._metadata_index.save()
+        if self._runlog is not None:
+            self._runlog.flush()
+
+    def close(self):
+        """
+        Persist any state gathered during the build.
+        """
+        self.event_loop.close()
+        self.flush()
+        if self._output_cache is not None:
+            self._output_cache.close()
+        if self._runlog is not None:
+            self._runlog.close()
+            self._runlog = None
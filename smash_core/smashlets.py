@@ -8,18 +8,30 @@ Used by the build system. Not part of the public API.
 """
 
 import importlib.util
+import inspect
 import sys
 import time
+from datetime import datetime
 from pathlib import Path
 
-from .context_loader import load_context_data
-from .project import get_runlog, update_runlog
+from .async_runner import await_result
+from .cache import OutputCache, cache_enabled, cache_key
+from .context_loader import load_context_data, merge_contexts
+from .discovery import walk_smashlets
+from .metadata import DEFINED, needs_import, read_smashlet_metadata
+from .digests import StatCache, input_digests
+from .project import get_runlog, open_runlog, update_runlog
+from .snapshot import FileSnapshot, notify_write
+from .trace import NULL_TRACER
 from .context_loader import build_context
 from smash_core.log import log as smash_log
 
 # Constants
 ONE_MINUTE = 60  # Default RUN_TIMEOUT for "always" smashlets
 RUN_NEVER = 0  # Default last-run timestamp if not yet run
+# Key for the smashlet's own source digest among its stored per-input digests.
+# Never a relative file path, so it can't collide with an input.
+SOURCE_KEY = "<smashlet>"
 
 
 def discover_smashlets(root: Path):
@@ -30,17 +42,17 @@ def discover_smashlets(root: Path):
     - smashlet.py
     - smashlet_<name>.py
 
+    Skips `.smash/`, VCS and dependency folders, nested projects and
+    anything matched by `.smashignore` (see `discovery.walk_smashlets`).
+
     Args:
         root (Path): Project root path
 
     Returns:
         List[Path]: A list of all matching smashlet files across the project
     """
-    return [
-        p
-        for p in root.rglob("smashlet*.py")
-        if p.name == "smashlet.py" or p.name.startswith("smashlet_")
-    ]
+    smashlets, _ = walk_smashlets(root)
+    return smashlets
 
 
 def load_smashlet_module(smashlet_path: Path):
@@ -75,6 +87,76 @@ def load_smashlet_module(smashlet_path: Path):
         return None
 
 
+class ModuleRegistry:
+    """
+    Build-scoped cache of loaded smashlet modules.
+
+    Modules are keyed by path plus the file's (mtime_ns, size) at load time,
+    so each smashlet is executed once per build and only reloaded when the
+    file actually changes on disk.
+    """
+
+    def __init__(self):
+        self._modules = {}
+
+    def load(self, smashlet_path: Path):
+        """
+        Return the loaded module for `smashlet_path`, executing it only if it
+        has not been loaded yet or has changed since.
+
+        Failed loads are remembered too, so a broken smashlet is reported once
+        per change instead of once per check.
+        """
+        key = str(smashlet_path)
+        try:
+            stamp = _file_stamp(smashlet_path)
+        except OSError:
+            self._modules.pop(key, None)
+            return None
+
+        cached = self._modules.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        mod = load_smashlet_module(smashlet_path)
+        self._modules[key] = (stamp, mod)
+        return mod
+
+    def touch(self, smashlet_path: Path):
+        """
+        Touch a smashlet file without invalidating its loaded module.
+
+        Smash touches smashlets that report changes; the source is unchanged,
+        so there is no reason to execute it again.
+        """
+        touch(smashlet_path)
+        key = str(smashlet_path)
+        if key in self._modules:
+            self._modules[key] = (_file_stamp(smashlet_path), self._modules[key][1])
+
+    def forget(self, smashlet_path: Path):
+        """
+        Drop a cached module so the next load executes the file again.
+        """
+        self._modules.pop(str(smashlet_path), None)
+
+
+def _file_stamp(path: Path):
+    st = path.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _load_module(smashlet_path: Path, session):
+    if session is not None:
+        with session.tracer.span("load module", cat="smashlet"):
+            return session.modules.load(smashlet_path)
+    return load_smashlet_module(smashlet_path)
+
+
+def _tracer(session):
+    return session.tracer if session is not None else NULL_TRACER
+
+
 SMASHLET_CONSTANT_DEFAULTS = [
     {
         "name": "RUN",
@@ -96,71 +178,253 @@ SMASHLET_CONSTANT_DEFAULTS = [
         "default": [],
         "allowed": [],
     },
+    {
+        "name": "FRESHNESS",
+        "default": "mtime",
+        "allowed": ["mtime", "hash"],
+    },
+    {
+        "name": "INCREMENTAL",
+        "default": False,
+        "allowed": [True, False],
+    },
+    {
+        "name": "CACHE",
+        "default": None,
+        "allowed": [None, True, False],
+    },
 ]
 
+# `run` may be replaced by `run_one(path, context)` (see `run_smashlet`)
 SMASHLET_REQUIRED_FUNCTIONS = [
-    {"name": "run", "required": True},
+    {"name": "run", "required": True, "or": "run_one"},
+    {"name": "run_one", "required": False},
     {"name": "should_run", "required": False},
     {"name": "get_outputs", "required": False},
 ]
 
 
-def should_run(smashlet_path: Path, project_root: Path) -> bool:
+def load_smashlet_spec(smashlet_path: Path, session=None):
     """
-    Determine whether a smashlet should run.
+    Collect and validate a smashlet's constants and functions.
 
-    Decisions are based on:
-    - Constants like RUN, INPUT_GLOB
-    - Optional should_run(context) override
-    - Timestamp comparisons for inputs and outputs
+    Values are read statically from the source when possible (see
+    `metadata.read_smashlet_metadata`). The module is only imported when a
+    value can't be known without executing it, or when it defines a dynamic
+    `should_run` or `get_outputs` hook that has to be called.
+
+    Returns:
+        (spec, error): spec is a dict with "constants", "functions",
+        "imported" and "async" (`run` or `run_one` is a coroutine function),
+        or None with a short error message if the smashlet is invalid.
+        Functions that were only seen statically are represented by `DEFINED`.
     """
+    index = session.metadata_index if session is not None else None
+    meta = read_smashlet_metadata(smashlet_path, index)
 
-    # Load the smashlet module
-    smashlet_mod = load_smashlet_module(smashlet_path)
-    if not smashlet_mod:
-        smash_log(f"{smashlet_path.name}: could not be loaded", level="warn")
-        return False
+    if needs_import(meta):
+        smashlet_mod = _load_module(smashlet_path, session)
+        if not smashlet_mod:
+            return None, "could not be loaded"
+
+        def lookup(name, default):
+            return getattr(smashlet_mod, name, default)
+
+    else:
+
+        def lookup(name, default):
+            if name in meta["functions"]:
+                return DEFINED
+            return meta["constants"].get(name, default)
 
     # Validate required functions
     smashlet_functions = {}
+
+    def defined(func):
+        return func is DEFINED or callable(func)
+
     for entry in SMASHLET_REQUIRED_FUNCTIONS:
-        func = getattr(smashlet_mod, entry["name"], None)
-        if entry["required"] and not callable(func):
-            smash_log(
-                f"{smashlet_path.name}: missing required function '{entry['name']}'",
-                level="warn",
-            )
-            return False
+        func = lookup(entry["name"], None)
+        alternative = entry.get("or")
+        if (
+            entry["required"]
+            and not defined(func)
+            and not (alternative and defined(lookup(alternative, None)))
+        ):
+            return None, f"missing required function '{entry['name']}'"
         smashlet_functions[entry["name"]] = func
 
     # Load and validate constants
     smashlet_constants = {}
     for const in SMASHLET_CONSTANT_DEFAULTS:
-        value = getattr(smashlet_mod, const["name"], const["default"])
+        value = lookup(const["name"], const["default"])
         if const["allowed"] and value not in const["allowed"]:
-            smash_log(
-                f"{smashlet_path.name}: invalid constant {const['name']}={value}. Allowed: {const['allowed']}",
-                level="warn",
+            return (
+                None,
+                f"invalid constant {const['name']}={value}. Allowed: {const['allowed']}",
             )
-            return False
         smashlet_constants[const["name"]] = value
 
+    if needs_import(meta):
+        coroutine = any(
+            inspect.iscoroutinefunction(smashlet_functions[name])
+            for name in ("run", "run_one")
+        )
+    else:
+        coroutine = bool(meta["coroutines"] & {"run", "run_one"})
+
+    spec = {
+        "constants": smashlet_constants,
+        "functions": smashlet_functions,
+        "imported": needs_import(meta),
+        "async": coroutine,
+    }
+    return spec, None
+
+
+def freshness_mode(constants: dict, session=None) -> str:
+    """
+    Return "hash" or "mtime".
+
+    The session override wins if set, otherwise the smashlet's FRESHNESS.
+    """
+    if session is not None and session.freshness:
+        return session.freshness
+    return constants.get("FRESHNESS", "mtime")
+
+
+def _runlog_entry(smashlet_path: Path, project_root: Path, session) -> dict:
+    if session is not None:
+        return session.runlog.get(smashlet_path, {})
+    return get_runlog(project_root).get(str(smashlet_path), {})
+
+
+def _stat_cache(project_root: Path, session):
+    if session is not None:
+        return session.stat_cache
+    return StatCache.load(project_root)
+
+
+def _previous_inputs(smashlet_path: Path, project_root: Path, session) -> dict:
+    if session is not None:
+        return session.runlog.get_inputs(smashlet_path)
+    runlog = open_runlog(project_root)
+    try:
+        return runlog.get_inputs(smashlet_path)
+    finally:
+        runlog.close()
+
+
+def changed_inputs(smashlet_path: Path, per_input: dict, previous: dict, full: bool):
+    """
+    Compare per-input digests with those stored for the last successful run.
+
+    Args:
+        per_input (dict): {path relative to the smashlet dir: digest} now
+        previous (dict): The same for the last run (`SOURCE_KEY` is ignored)
+        full (bool): Treat every input as changed, e.g. on a forced run
+
+    Returns:
+        (changed, removed): Lists of absolute Paths, sorted
+    """
+    base = smashlet_path.parent
+    if full or not previous:
+        changed = list(per_input)
+        removed = []
+    else:
+        changed = [n for n, d in per_input.items() if previous.get(n) != d]
+        removed = [n for n in previous if n not in per_input and n != SOURCE_KEY]
+    return (
+        sorted((base / n).resolve() for n in changed),
+        sorted((base / n).resolve() for n in removed),
+    )
+
+
+def _snapshot(session):
+    if session is not None:
+        return session.snapshot
+    return FileSnapshot()
+
+
+def _decision(run, state, reason, file=None, **detail):
+    return {"run": run, "state": state, "reason": reason, "file": file, **detail}
+
+
+def _stamp(mtime: float) -> str:
+    return datetime.fromtimestamp(mtime).isoformat(sep=" ", timespec="milliseconds")
+
+
+def should_run(smashlet_path: Path, project_root: Path, session=None) -> bool:
+    """
+    Determine whether a smashlet should run.
+
+    Decisions are based on:
+    - Constants like RUN, INPUT_GLOB
+    - Optional should_run(context) override
+    - Timestamp comparisons for inputs and outputs, or with FRESHNESS = "hash",
+      the combined digest of the smashlet and its inputs versus the last run
+
+    Constants are read without importing the smashlet unless it defines
+    dynamic hooks. If a `BuildSession` is given, an imported module is reused
+    from it instead of being executed again. See `explain_run` for why.
+    """
+    decision = explain_run(smashlet_path, project_root, session)
+    if decision["state"] == "invalid":
+        smash_log(f"{smashlet_path.name}: {decision['reason']}", level="warn")
+    elif decision["state"] == "error":
+        smash_log(f"{smashlet_path.name}: {decision['reason']}", level="error")
+    elif decision["state"] == "waiting":
+        smash_log(f"{smashlet_path.name}: RUN_TIMEOUT not reached", level="debug")
+    return decision["run"]
+
+
+def explain_run(smashlet_path: Path, project_root: Path, session=None) -> dict:
+    """
+    Decide whether a smashlet should run, and say why.
+
+    This is the freshness check behind both `smash build` and `smash status`.
+
+    Returns:
+        dict with:
+        - "run" (bool): Whether the smashlet is due
+        - "state" (str): "run", "fresh", "waiting" (RUN_TIMEOUT not reached),
+          "invalid" or "error" (its should_run(context) raised)
+        - "reason" (str): A short explanation
+        - "file" (Path or None): The file that decided it, if any
+        - further details, e.g. "mtime"/"since" timestamps or
+          "digest"/"previous" digests
+    """
+
+    spec, error = load_smashlet_spec(smashlet_path, session)
+    if not spec:
+        return _decision(False, "invalid", error)
+
+    smashlet_functions = spec["functions"]
+    smashlet_constants = spec["constants"]
+
     # Load runlog info
-    runlog = get_runlog(project_root)
-    last_run = runlog.get(str(smashlet_path), {}).get("last_run", 0)
+    runlog_entry = _runlog_entry(smashlet_path, project_root, session)
+    last_run = runlog_entry.get("last_run", 0)
 
     # Handle RUN = 'always'
     if smashlet_constants["RUN"] == "always":
         timeout = smashlet_constants["RUN_TIMEOUT"]
         if (time.time() - last_run) >= timeout:
-            return True
-        else:
-            smash_log(f"{smashlet_path.name}: RUN_TIMEOUT not reached", level="debug")
-            return False
+            return _decision(
+                True, "run", f"RUN = 'always' and RUN_TIMEOUT ({timeout}s) passed"
+            )
+        return _decision(
+            False,
+            "waiting",
+            f"RUN_TIMEOUT ({timeout}s) not reached since the last run "
+            f"at {_stamp(last_run)}",
+            since=last_run,
+        )
 
-    # Load inputs (optional)
+    # Load inputs (optional), through the pass's filesystem snapshot
+    snapshot = _snapshot(session)
     input_glob = smashlet_constants["INPUT_GLOB"]
-    inputs = list(smashlet_path.parent.glob(input_glob)) if input_glob else []
+    inputs = snapshot.glob(smashlet_path.parent, input_glob) if input_glob else []
 
     # Load outputs (optional)
     if smashlet_functions.get("get_outputs"):
@@ -171,68 +435,201 @@ def should_run(smashlet_path: Path, project_root: Path) -> bool:
     # should_run(context) override
     if smashlet_functions.get("should_run"):
         try:
-            context = build_context(project_root)
+            if session is not None:
+                context = dict(session.context)
+            else:
+                context = build_context(project_root)
+            # A copy, so values the hook parses stay out of the shared context
+            context["context"] = merge_contexts(context.get("context", {}))
             context.update(
                 {
                     "cwd": smashlet_path.parent,
                     "inputs": inputs,
-                    "smashlet_mtime": smashlet_path.stat().st_mtime,
+                    "smashlet_mtime": snapshot.mtime(smashlet_path),
                     "last_run": last_run,
                     "latest_input_mtime": max(
-                        (f.stat().st_mtime for f in inputs), default=0
+                        (snapshot.mtime(f) for f in inputs), default=0
                     ),
                 }
             )
-            return smashlet_functions["should_run"](context)
+            due = smashlet_functions["should_run"](context)
         except Exception as e:
-            smash_log(
-                f"{smashlet_path.name}: error in should_run(context): {e}",
-                level="error",
-            )
-            return False
+            return _decision(False, "error", f"error in should_run(context): {e}")
+        return _decision(
+            due, "run" if due else "fresh", f"should_run(context) returned {due!r}"
+        )
+
+    # Missing outputs always need a run
+    outputs = [Path(out).resolve() for out in outputs]
+    for out in outputs:
+        if not snapshot.exists(out):
+            return _decision(True, "run", "output is missing", out)
+
+    # Content comparison: skip if nothing changed since the last successful run
+    if freshness_mode(smashlet_constants, session) == "hash":
+        cache = _stat_cache(project_root, session)
+        digest, per_input = input_digests(smashlet_path, inputs, cache)
+        if session is None:
+            cache.save()
+        previous = runlog_entry.get("digest")
+        if digest == previous:
+            return _decision(False, "fresh", "contents unchanged since the last run")
+        return _changed_digest(smashlet_path, project_root, session, per_input, cache)
 
     # Inputs vs outputs comparison
     if outputs:
-        if any(not out.exists() for out in outputs):
-            return True
+        newest_output = max(outputs, key=snapshot.mtime)
+        newest_input = max(inputs + [smashlet_path], key=snapshot.mtime)
+        if snapshot.mtime(newest_input) > snapshot.mtime(newest_output):
+            return _decision(
+                True,
+                "run",
+                f"modified at {_stamp(snapshot.mtime(newest_input))}, after "
+                f"{_display(newest_output, project_root)} "
+                f"({_stamp(snapshot.mtime(newest_output))})",
+                newest_input,
+                mtime=snapshot.mtime(newest_input),
+                since=snapshot.mtime(newest_output),
+            )
+        return _decision(False, "fresh", "outputs are newer than inputs")
 
-        latest_output_mtime = max(out.stat().st_mtime for out in outputs)
-        latest_input_mtime = max(
-            [f.stat().st_mtime for f in inputs] + [smashlet_path.stat().st_mtime]
+    # Fallback: any input newer than last run
+    newest = max(inputs + [smashlet_path], key=snapshot.mtime)
+    if snapshot.mtime(newest) > last_run:
+        if not last_run:
+            return _decision(True, "run", "never ran")
+        return _decision(
+            True,
+            "run",
+            f"modified at {_stamp(snapshot.mtime(newest))}, after the last run "
+            f"at {_stamp(last_run)}",
+            newest,
+            mtime=snapshot.mtime(newest),
+            since=last_run,
         )
-        return latest_input_mtime > latest_output_mtime
+    return _decision(False, "fresh", "nothing modified since the last run")
 
-    # Fallback: any input newer than last run
-    files_to_check = inputs + [smashlet_path]
-    return any(f.stat().st_mtime > last_run for f in files_to_check)
+
+def _display(path: Path, project_root: Path) -> str:
+    try:
+        return str(path.relative_to(project_root))
+    except ValueError:
+        return str(path)
+
+
+def _changed_digest(smashlet_path, project_root, session, per_input, cache):
+    """
+    Explain a digest mismatch by the first input (or the smashlet) that changed.
+    """
+    entry = _runlog_entry(smashlet_path, project_root, session)
+    if not entry.get("digest"):
+        return _decision(True, "run", "never ran with content-based freshness")
+
+    previous = _previous_inputs(smashlet_path, project_root, session)
+    base = smashlet_path.parent
+    for name, digest in per_input.items():
+        if previous.get(name) != digest:
+            reason = "new input" if name not in previous else "contents changed"
+            return _decision(
+                True,
+                "run",
+                reason,
+                (base / name).resolve(),
+                digest=digest,
+                previous=previous.get(name),
+            )
+    for name in previous:
+        if name not in per_input and name != SOURCE_KEY:
+            return _decision(True, "run", "input was removed", (base / name).resolve())
+
+    # Same inputs (or none recorded): the smashlet itself must have changed
+    return _decision(
+        True,
+        "run",
+        "smashlet source changed",
+        smashlet_path,
+        digest=cache.digest(smashlet_path),
+    )
+
+
+def _outputs(smashlet_mod):
+    """
+    Return the outputs a loaded smashlet declares, resolved against the working directory.
+    """
+    get_outputs = getattr(smashlet_mod, "get_outputs", None)
+    try:
+        outputs = get_outputs() if callable(get_outputs) else None
+    except Exception:
+        return []
+    if outputs is None:
+        outputs = getattr(smashlet_mod, "OUTPUT_FILES", [])
+    return [Path(p).resolve() for p in outputs or []]
+
+
+def _record_run(smashlet_path, project_root, session, duration, digest, inputs):
+    if session is not None:
+        session.runlog.record(
+            smashlet_path, duration=duration, digest=digest, inputs=inputs
+        )
+    else:
+        update_runlog(
+            project_root,
+            smashlet_path,
+            duration=duration,
+            digest=digest,
+            inputs=inputs,
+        )
 
 
-def run_smashlet(smashlet_path: Path, project_root: Path, global_context: dict) -> bool:
+def run_smashlet(
+    smashlet_path: Path,
+    project_root: Path,
+    global_context: dict,
+    session=None,
+    force=False,
+) -> bool:
     """
     Execute a smashlet's run() function, injecting both global and local context.
     Automatically updates the runlog after successful execution.
 
+    Incremental smashlets (`INCREMENTAL = True`, or defining `run_one`) also
+    get `context["changed_inputs"]` and `context["removed_inputs"]`, computed
+    from per-input digests stored with the last successful run. Every input
+    counts as changed on the first or a forced run, or when the smashlet's
+    source differs from the one its last run recorded (by digest, so the
+    engine touching the smashlet between passes doesn't count). `run_one(path, context)` is called for
+    each changed input, then `run(context)` if it is defined too.
+
+    Either may be a coroutine function (`async def`). Its coroutine runs on
+    the session's event loop, shared with other async smashlets of the build.
+
+    Cached smashlets (see `cache.py`) have their declared outputs stored after
+    a successful run. If the same source, inputs and context were seen
+    before, the outputs are restored from the cache and nothing runs, unless
+    the run is forced.
+
     Args:
         smashlet_path (Path): Path to the smashlet file
         project_root (Path): Project root path
         global_context (dict): The global (project-level) context to merge with local
+        session (BuildSession, optional): Build state to reuse loaded modules from
+        force (bool): Treat every input as changed
 
     Returns:
         bool: True if the smashlet indicates an output change (returns 1), else False
     """
 
-    smashlet_mod = load_smashlet_module(smashlet_path)
+    smashlet_mod = _load_module(smashlet_path, session)
     if not smashlet_mod:
         return False
 
     run_func = getattr(smashlet_mod, "run", None)
-    if not callable(run_func):
+    run_one = getattr(smashlet_mod, "run_one", None)
+    if not callable(run_func) and not callable(run_one):
         smash_log(f"Skipping {smashlet_path}: run() is not callable", level="info")
 
         return False
 
-    import inspect
-
     # The smashlet directory is the parent of the smashlet file
     smashlet_dir = smashlet_path.parent
 
@@ -245,47 +642,147 @@ def run_smashlet(smashlet_path: Path, project_root: Path, global_context: dict)
 
     # Auto-inject glob-matched input files for convenience
     input_glob = getattr(smashlet_mod, "INPUT_GLOB", None)
+    inputs = _snapshot(session).glob(smashlet_dir, input_glob) if input_glob else []
     if input_glob:
-        context["inputs"] = list(smashlet_dir.glob(input_glob))
+        context["inputs"] = inputs
+
+    # Digest the inputs this run consumes, for hash-based freshness and
+    # for working out what changed for incremental smashlets
+    digest, per_input = None, None
+    freshness = {"FRESHNESS": getattr(smashlet_mod, "FRESHNESS", "mtime")}
+    hashed = freshness_mode(freshness, session) == "hash"
+    incremental = callable(run_one) or getattr(smashlet_mod, "INCREMENTAL", False)
+    outputs = (
+        _outputs(smashlet_mod) if cache_enabled(smashlet_mod, project_root) else []
+    )
+    tracer = _tracer(session)
+    combined = None
+    if hashed or incremental or outputs:
+        cache = _stat_cache(project_root, session)
+        with tracer.span("digest inputs", cat="smashlet", inputs=len(inputs)):
+            combined, per_input = input_digests(smashlet_path, inputs, cache)
+        if session is None:
+            cache.save()
+        if hashed:
+            digest = combined
+
+    recorded = per_input
+    if incremental:
+        source = cache.digest(smashlet_path)
+        previous = _previous_inputs(smashlet_path, project_root, session)
+        changed, removed = changed_inputs(
+            smashlet_path,
+            per_input,
+            previous,
+            full=force or previous.get(SOURCE_KEY) != source,
+        )
+        context["changed_inputs"] = changed
+        context["removed_inputs"] = removed
+        recorded = {**per_input, SOURCE_KEY: source}
 
     # Merge local context from 'context/' folder or 'context.json' in the smashlet dir
     local_context_dir = smashlet_dir / "context"
     local_context_json = smashlet_dir / "context.json"
 
-    # Load the directory-based local context
-    loaded_local_context, loaded_local_files = load_context_data(local_context_dir)
-
-    # If there's a separate context.json, load that too and merge
-    if local_context_json.exists():
-        json_context, json_files = load_context_data(local_context_json)
-        loaded_local_context.update(json_context)
-        loaded_local_files.update(json_files)
+    with tracer.span("local context", cat="smashlet"):
+        # Load the directory-based local context, reusing files parsed this build
+        context_cache = session.context_cache if session is not None else None
+        loaded_local_context, loaded_local_files = load_context_data(
+            local_context_dir, context_cache
+        )
 
-    # Ensure 'context' and 'context_files' exist in the final dict
-    context.setdefault("context", {}).update(loaded_local_context)
-    context.setdefault("context_files", {}).update(loaded_local_files)
+        # If there's a separate context.json, load that too and merge
+        if local_context_json.exists():
+            json_context, json_files = load_context_data(
+                local_context_json, context_cache
+            )
+            loaded_local_context.update(json_context)
+            loaded_local_files.update(json_files)
+
+    # Merge into copies, so local values never leak into the shared global context
+    context["context"] = merge_contexts(
+        context.get("context", {}), loaded_local_context
+    )
+    context["context_files"] = {
+        **context.get("context_files", {}),
+        **loaded_local_files,
+    }
+
+    output_cache, key = None, None
+    if outputs:
+        output_cache = (
+            session.output_cache if session is not None else OutputCache(project_root)
+        )
+        key = cache_key(
+            project_root,
+            combined,
+            [*context["context_files"].values(), project_root / "smash.py"],
+            outputs,
+            cache,
+        )
 
     try:
-        sig = inspect.signature(run_func)
         start_time = time.time()
-
-        # If run(context) is expected
-        if len(sig.parameters) == 1:
-            result = run_func(context)
-        else:
-            # Otherwise run() with no args
-            result = run_func()
+        result = None
+
+        # A forced run must run; its outputs are still stored afterwards
+        if output_cache is not None and not force:
+            with tracer.span("restore from cache", cat="smashlet"):
+                entry = output_cache.restore(key, outputs)
+            if entry is not None:
+                for out in outputs:
+                    notify_write(out)
+                smash_log(f"♻️ {smashlet_path.name}: outputs restored from cache")
+                _record_run(
+                    smashlet_path,
+                    project_root,
+                    session,
+                    round(time.time() - start_time, 3),
+                    digest,
+                    recorded,
+                )
+                if session is None:
+                    output_cache.close()
+                return entry.get("result") == 1
+
+        with tracer.span("run", cat="smashlet"):
+            # Per-file entry point: only new or changed inputs
+            if callable(run_one):
+                for path in context["changed_inputs"]:
+                    if await_result(run_one(path, context), session) == 1:
+                        result = 1
+
+            if callable(run_func):
+                sig = inspect.signature(run_func)
+
+                # If run(context) is expected
+                if len(sig.parameters) == 1:
+                    run_result = run_func(context)
+                else:
+                    # Otherwise run() with no args
+                    run_result = run_func()
+                # Coroutine smashlets are awaited on the build's event loop
+                if await_result(run_result, session) == 1:
+                    result = 1
 
         end_time = time.time()
         duration = round(end_time - start_time, 3)
 
         # Mark it as run in the runlog
-        update_runlog(project_root, smashlet_path, duration)
+        _record_run(smashlet_path, project_root, session, duration, digest, recorded)
+
+        # Keep the outputs for the next time these inputs come around
+        if output_cache is not None:
+            output_cache.store(key, outputs, result)
+            if session is None:
+                output_cache.close()
 
         return result == 1
 
     except Exception as e:
         smash_log(f"Error in {smashlet_path}: {e}", level="error")
+        if session is not None:
+            session.failed.add(smashlet_path)
 
         return False
 
@@ -0,0 +1,113 @@
+"""
+A per-pass view of the filesystem, so each path is stat'ed and globbed once.
+
+Within one build pass, discovery, ordering, freshness checks, input injection
+and `smash status` all look at the same files. A `FileSnapshot` memoizes
+`stat()` and `glob()` results so each path costs one system call per pass,
+which matters most on network filesystems.
+
+A snapshot goes stale when files are written. The engine invalidates the
+declared outputs of every smashlet it runs and starts a fresh snapshot each
+pass, and the `smash` file helpers (`write`, ...) invalidate exactly the paths
+they write through `notify_write()`.
+
+Note: This module is internal and not part of the public Smash API.
+"""
+
+import os
+import threading
+import weakref
+from pathlib import Path
+
+# Every live snapshot, so file helpers can invalidate paths without a session
+_snapshots = weakref.WeakSet()
+_snapshots_lock = threading.Lock()
+
+
+class FileSnapshot:
+    """
+    Memoized `stat()` and `glob()` results for one build pass.
+
+    Paths are used as given; callers should pass absolute paths. Thread-safe,
+    so parallel build workers can share one snapshot.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._globs = {}
+        self._lock = threading.Lock()
+        with _snapshots_lock:
+            _snapshots.add(self)
+
+    def stat(self, path):
+        """
+        Return `os.stat_result` for `path`, or None if it does not exist.
+        """
+        key = os.fspath(path)
+        with self._lock:
+            if key in self._stats:
+                return self._stats[key]
+        try:
+            st = os.stat(key)
+        except OSError:
+            st = None
+        with self._lock:
+            self._stats[key] = st
+        return st
+
+    def exists(self, path) -> bool:
+        return self.stat(path) is not None
+
+    def mtime(self, path) -> float:
+        """
+        Return the mtime of `path`. Raises FileNotFoundError if it is missing.
+        """
+        st = self.stat(path)
+        if st is None:
+            raise FileNotFoundError(path)
+        return st.st_mtime
+
+    def glob(self, directory: Path, pattern: str):
+        """
+        Return `list(directory.glob(pattern))`, computed once per snapshot.
+        """
+        key = (os.fspath(directory), pattern)
+        with self._lock:
+            if key in self._globs:
+                return list(self._globs[key])
+        found = list(Path(directory).glob(pattern))
+        with self._lock:
+            self._globs[key] = found
+        return list(found)
+
+    def invalidate(self, path):
+        """
+        Forget what is known about `path` and every glob that could match it.
+        """
+        key = os.path.abspath(os.fspath(path))
+        with self._lock:
+            self._stats.pop(os.fspath(path), None)
+            self._stats.pop(key, None)
+            self._stats.pop(os.path.dirname(key), None)
+            for glob_key in list(self._globs):
+                base = os.path.abspath(glob_key[0])
+                if key == base or key.startswith(base.rstrip(os.sep) + os.sep):
+                    del self._globs[glob_key]
+
+    def clear(self):
+        """
+        Forget everything, e.g. after a smashlet wrote files it did not declare.
+        """
+        with self._lock:
+            self._stats.clear()
+            self._globs.clear()
+
+
+def notify_write(path):
+    """
+    Invalidate `path` in every live snapshot. Called by the file helpers.
+    """
+    with _snapshots_lock:
+        snapshots = list(_snapshots)
+    for snapshot in snapshots:
+        snapshot.invalidate(path)
@@ -0,0 +1,303 @@
+"""
+SQLite-backed project state: an optional replacement for `.smash/runlog.json`.
+
+Keeps smashlets, their full run history (with durations) and per-input digests
+in `.smash/state.db`. The database runs in WAL mode, so a watcher and a manual
+build can read and write at the same time without overwriting each other, and
+history is unlimited but cheap to query through indexes.
+
+Enabled with `smash init --state sqlite`, which sets `"state": "sqlite"` in
+`.smash/config.json`. An existing `runlog.json` is migrated on first use.
+
+Note: This module is internal and not part of the public Smash API.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from smash_core.log import log
+from smash_core.project import DEFAULT_HISTORY_LIMIT, _normalize_runlog
+
+STATE_FILE = "state.db"
+BUSY_TIMEOUT_MS = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS smashlets (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    last_run INTEGER NOT NULL,
+    runs INTEGER NOT NULL DEFAULT 0,
+    digest TEXT
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    smashlet_id INTEGER NOT NULL REFERENCES smashlets(id),
+    finished_on INTEGER NOT NULL,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS runs_by_smashlet ON runs (smashlet_id, finished_on);
+CREATE TABLE IF NOT EXISTS input_digests (
+    smashlet_id INTEGER NOT NULL REFERENCES smashlets(id),
+    input TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (smashlet_id, input)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SqliteRunlog:
+    """
+    Runlog backed by `.smash/state.db`, with the same interface as `project.Runlog`.
+
+    Every `record()` commits its own short transaction, so there is nothing
+    to lose on a crash and `flush()` is a no-op. Smashlets are keyed by
+    their path relative to the project root.
+    """
+
+    def __init__(
+        self,
+        project_root: Path,
+        conn: sqlite3.Connection,
+        history_limit=DEFAULT_HISTORY_LIMIT,
+    ):
+        self.project_root = project_root
+        self.conn = conn
+        self.history_limit = history_limit  # History entries returned with `get()`
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(
+        cls, project_root: Path, history_limit=DEFAULT_HISTORY_LIMIT, read_only=False
+    ):
+        """
+        Open (creating if needed) the state database and migrate `runlog.json` once.
+
+        With `read_only`, an existing database is opened for reading only, e.g.
+        for `smash status`.
+        """
+        path = project_root / ".smash" / STATE_FILE
+        if read_only:
+            conn = sqlite3.connect(
+                f"{path.as_uri()}?mode=ro",
+                uri=True,
+                timeout=BUSY_TIMEOUT_MS / 1000,
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            return cls(project_root, conn, history_limit)
+
+        conn = sqlite3.connect(
+            str(path),
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.executescript(SCHEMA)
+
+        runlog = cls(project_root, conn, history_limit)
+        runlog._migrate_json()
+        return runlog
+
+    def _key(self, smashlet_path) -> str:
+        path = Path(smashlet_path)
+        try:
+            return path.relative_to(self.project_root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _path(self, key: str) -> str:
+        return key if Path(key).is_absolute() else str(self.project_root / key)
+
+    def _migrate_json(self):
+        json_path = self.project_root / ".smash" / "runlog.json"
+        if not json_path.exists():
+            return
+
+        with self._lock:
+            # Check and migrate in one write transaction, so two processes
+            # opening the database at once can't both import the runlog.
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                done = self.conn.execute(
+                    "SELECT value FROM meta WHERE key = 'migrated_runlog'"
+                ).fetchone()
+                if done:
+                    self.conn.execute("ROLLBACK")
+                    return
+
+                try:
+                    entries = _normalize_runlog(
+                        json.loads(json_path.read_text()), history_limit=None
+                    )
+                except Exception as e:
+                    log(f"Failed to migrate runlog.json: {e}", level="error")
+                    entries = {}
+
+                for key, entry in entries.items():
+                    smashlet_id = self._upsert(
+                        self._key(key),
+                        entry["last_run"],
+                        entry.get("digest"),
+                        entry["runs"],
+                    )
+                    self.conn.executemany(
+                        "INSERT INTO runs (smashlet_id, finished_on, duration) "
+                        "VALUES (?, ?, ?)",
+                        [
+                            (smashlet_id, h["finished_on"], h.get("duration"))
+                            for h in entry["history"]
+                        ],
+                    )
+                    self._store_inputs(smashlet_id, entry.get("inputs"))
+                self.conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('migrated_runlog', ?)",
+                    (str(int(time.time())),),
+                )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+        log(f"Migrated {len(entries)} runlog entries to {STATE_FILE}", level="debug")
+
+    def _upsert(self, key, last_run, digest, runs_added):
+        self.conn.execute(
+            "INSERT INTO smashlets (path, last_run, runs, digest) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET last_run = excluded.last_run, "
+            "runs = smashlets.runs + excluded.runs, "
+            "digest = excluded.digest",
+            (key, last_run, runs_added, digest),
+        )
+        return self.conn.execute(
+            "SELECT id FROM smashlets WHERE path = ?", (key,)
+        ).fetchone()[0]
+
+    def _store_inputs(self, smashlet_id, inputs):
+        if inputs is None:
+            return
+        self.conn.execute(
+            "DELETE FROM input_digests WHERE smashlet_id = ?", (smashlet_id,)
+        )
+        self.conn.executemany(
+            "INSERT INTO input_digests (smashlet_id, input, digest) VALUES (?, ?, ?)",
+            [(smashlet_id, name, digest) for name, digest in inputs.items()],
+        )
+
+    def _entry(self, row) -> dict:
+        smashlet_id, last_run, runs, digest = row
+        history = self.history_by_id(smashlet_id, self.history_limit)
+        entry = {"last_run": last_run, "runs": runs, "history": history}
+        if digest is not None:
+            entry["digest"] = digest
+        return entry
+
+    def get(self, smashlet_path, default=None):
+        """
+        Return the entry for a smashlet, or `default` if it has never run.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT id, last_run, runs, digest FROM smashlets WHERE path = ?",
+                (self._key(smashlet_path),),
+            ).fetchone()
+            return self._entry(row) if row else default
+
+    @property
+    def entries(self) -> dict:
+        """
+        All entries keyed by absolute path string, like `get_runlog()` returns.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT path, id, last_run, runs, digest FROM smashlets"
+            ).fetchall()
+            return {self._path(row[0]): self._entry(row[1:]) for row in rows}
+
+    def history_by_id(self, smashlet_id, limit=None):
+        query = (
+            "SELECT finished_on, duration FROM runs WHERE smashlet_id = ? "
+            "ORDER BY finished_on DESC, id DESC"
+        )
+        params = [smashlet_id]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        history = []
+        for finished_on, duration in reversed(
+            self.conn.execute(query, params).fetchall()
+        ):
+            item = {"finished_on": finished_on}
+            if duration is not None:
+                item["duration"] = duration
+            history.append(item)
+        return history
+
+    def history(self, smashlet_path, limit=None):
+        """
+        Return a smashlet's run history, oldest first.
+
+        Unlimited unless `limit` is given.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT id FROM smashlets WHERE path = ?", (self._key(smashlet_path),)
+            ).fetchone()
+            return self.history_by_id(row[0], limit) if row else []
+
+    def get_inputs(self, smashlet_path) -> dict:
+        """
+        Return the per-input digests stored with the smashlet's last run.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT input, input_digests.digest FROM input_digests JOIN smashlets "
+                "ON smashlets.id = input_digests.smashlet_id WHERE smashlets.path = ?",
+                (self._key(smashlet_path),),
+            ).fetchall()
+        return dict(rows)
+
+    def record(
+        self, smashlet_path, finished_on=None, duration=None, digest=None, inputs=None
+    ):
+        """
+        Record a finished run in its own transaction.
+        """
+        now = int(finished_on or time.time())
+
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                smashlet_id = self._upsert(self._key(smashlet_path), now, digest, 1)
+                self.conn.execute(
+                    "INSERT INTO runs (smashlet_id, finished_on, duration) "
+                    "VALUES (?, ?, ?)",
+                    (smashlet_id, now, duration),
+                )
+                self._store_inputs(smashlet_id, inputs)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def flush(self):
+        """
+        No-op: every record is committed immediately.
+        """
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self.conn.close()
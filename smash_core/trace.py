@@ -0,0 +1,105 @@
+"""
+Records where build time goes, as a Chrome trace-event timeline.
+
+`smash build --trace` gives the build session a `Tracer`. The engine wraps
+each phase in `tracer.span(...)`: discovery, planning, building the context,
+every pass, and per smashlet the freshness check, module import, input
+digests, local context loading and the run itself. The result is written as
+Chrome trace-event JSON, which Perfetto (https://ui.perfetto.dev) and
+`chrome://tracing` open directly.
+
+Without `--trace` the session uses `NULL_TRACER`, whose spans do nothing.
+
+Note: This module is internal and not part of the public Smash API.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from smash_core.project import write_json_atomic
+
+TRACE_FILE = "trace.json"
+
+
+class Tracer:
+    """
+    Collects complete ("X") trace events from any thread.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.events = []
+        self._start = time.perf_counter_ns()
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def _now_us(self):
+        return (time.perf_counter_ns() - self._start) / 1000
+
+    @contextmanager
+    def span(self, name, cat="build", **args):
+        """
+        Time the enclosed block as one event. `args` show up in the event details.
+        """
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": start,
+                "dur": self._now_us() - start,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+            if args:
+                event["args"] = {k: str(v) for k, v in args.items()}
+            with self._lock:
+                self.events.append(event)
+                self._threads.setdefault(
+                    threading.get_ident(), threading.current_thread().name
+                )
+
+    def to_json(self) -> dict:
+        """
+        Return the trace in Chrome's JSON object format.
+        """
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+        names = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in threads.items()
+        ]
+        return {"traceEvents": names + events, "displayTimeUnit": "ms"}
+
+    def save(self, path):
+        """
+        Write the trace to `path` atomically.
+        """
+        write_json_atomic(path, self.to_json(), indent=None)
+
+
+class NullTracer:
+    """
+    A tracer that records nothing.
+    """
+
+    enabled = False
+
+    def span(self, name, cat="build", **args):
+        return nullcontext()
+
+
+NULL_TRACER = NullTracer()
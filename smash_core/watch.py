@@ -0,0 +1,216 @@
+"""
+Watches a Smash project's files for changes, using inotify where available.
+
+`InotifyWatcher` talks to the Linux inotify API through ctypes and follows new
+directories as they appear. `PollingWatcher` is the portable fallback: it
+compares stat tuples of every file in the watched directories at an interval.
+Both watch only the directories discovery would descend into, so `.smash/`,
+`.git/`, `node_modules/` and ignored folders never wake the watcher.
+
+Note: This module is internal and not part of the public Smash API.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+from smash_core.discovery import iter_project_dirs, load_ignore_rules
+
+# inotify flags (see <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+DEBOUNCE_SECONDS = 0.2  # Quiet time that ends a burst of changes
+MAX_BATCH_SECONDS = 2.0  # Never hold a batch back longer than this
+POLL_INTERVAL = 1.0
+
+
+class InotifyWatcher:
+    """
+    Recursive directory watcher on top of Linux inotify.
+
+    Raises OSError if inotify is unavailable, so callers can fall back to polling.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.rules = load_ignore_rules(root)
+        self.paths = {}
+
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        for path in iter_project_dirs(root, rules=self.rules):
+            self._add(path)
+
+    def _add(self, path: Path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self.paths[wd] = path
+
+    def read(self, timeout=None) -> set:
+        """
+        Wait up to `timeout` seconds (forever if None) and return the changed paths.
+
+        If the kernel queue overflowed, the project root is returned to signal
+        that anything may have changed.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                changed.add(self.root)
+                continue
+            if mask & IN_IGNORED:
+                self.paths.pop(wd, None)
+                continue
+
+            parent = self.paths.get(wd)
+            if parent is None:
+                continue
+            path = parent / os.fsdecode(name) if name else parent
+            changed.add(path)
+
+            # Follow directories created or moved into the watched tree
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                for sub in iter_project_dirs(self.root, start=path, rules=self.rules):
+                    self._add(sub)
+
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """
+    Portable watcher that compares (mtime_ns, size) of every watched file.
+    """
+
+    def __init__(self, root: Path, interval=POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.rules = load_ignore_rules(root)
+        self.snapshot = self._scan()
+
+    def _scan(self) -> dict:
+        stamps = {}
+        for directory in iter_project_dirs(self.root, rules=self.rules):
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_file(follow_symlinks=False):
+                                st = entry.stat(follow_symlinks=False)
+                                stamps[entry.path] = (st.st_mtime_ns, st.st_size)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return stamps
+
+    def read(self, timeout=None) -> set:
+        """
+        Poll until something changed or `timeout` seconds passed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.interval
+            if deadline is not None:
+                wait = max(0.0, min(wait, deadline - time.monotonic()))
+            time.sleep(wait)
+
+            current = self._scan()
+            changed = {
+                Path(p)
+                for p in current.keys() | self.snapshot.keys()
+                if current.get(p) != self.snapshot.get(p)
+            }
+            self.snapshot = current
+
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def create_watcher(root: Path, poll=False):
+    """
+    Return an inotify watcher, or a polling one if `poll` is set or inotify is unavailable.
+    """
+    if not poll:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root)
+
+
+def wait_for_changes(
+    watcher, debounce=DEBOUNCE_SECONDS, max_batch=MAX_BATCH_SECONDS
+) -> set:
+    """
+    Block until something changes, then keep collecting until the burst settles.
+
+    A batch ends after `debounce` seconds without new events, or after
+    `max_batch` seconds at most.
+    """
+    changed = set()
+    while not changed:
+        changed = watcher.read(None)
+
+    deadline = time.monotonic() + max_batch
+    while time.monotonic() < deadline:
+        more = watcher.read(debounce)
+        if not more:
+            break
+        changed |= more
+    return changed
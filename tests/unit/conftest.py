@@ -0,0 +1,53 @@
+"""
+Fixtures shared by the unit tests.
+"""
+
+import os
+import time
+
+import pytest
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """
+    Set up a Smash project in `tmp_path` with one smashlet and make it the
+    working directory. Call it with the smashlet source and a dict of
+    {filename: text} inputs; returns the smashlet path.
+    """
+
+    def setup(source, inputs=None):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / ".smash").mkdir()
+        smashlet = tmp_path / "smashlet.py"
+        smashlet.write_text(source)
+        for name, text in (inputs or {"a.md": "a"}).items():
+            (tmp_path / name).write_text(text)
+        return smashlet
+
+    return setup
+
+
+@pytest.fixture
+def age():
+    """
+    Push the mtime of a file, or of a directory and everything below it,
+    into the past, so caches and the fingerprint trust it.
+    """
+
+    def push_back(path, seconds=60):
+        past = time.time() - seconds
+        os.utime(path, (past, past))
+        for dirpath, dirnames, filenames in os.walk(path):
+            for name in dirnames + filenames:
+                os.utime(os.path.join(dirpath, name), (past, past))
+
+    return push_back
+
+
+@pytest.fixture
+def run_count(tmp_path):
+    """
+    Count the runs a test smashlet logged to `runs.txt`.
+    """
+    return lambda: len((tmp_path / "runs.txt").read_text().splitlines())
@@ -0,0 +1,105 @@
+"""
+Tests coroutine smashlets (`async def run`) and the async file helpers.
+"""
+
+import asyncio
+import json
+import os
+import time
+
+import smash
+from smash_core.commands import run_build
+from smash_core.scheduler import run_graph
+from smash_core.smashlets import load_smashlet_spec, run_smashlet
+
+ASYNC_SMASHLET = """
+import asyncio
+import time
+
+async def run(context):
+    start = time.time()
+    await asyncio.sleep(0.3)
+    with open("{name}.txt", "w") as f:
+        f.write(f"{{start}} {{time.time()}}")
+"""
+
+
+def test_async_smashlets_run_concurrently(tmp_path):
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    for name in ["a", "b", "c"]:
+        (tmp_path / f"smashlet_{name}.py").write_text(ASYNC_SMASHLET.format(name=name))
+
+    run_build()
+
+    spans = [
+        [float(t) for t in (tmp_path / f"{name}.txt").read_text().split()]
+        for name in ["a", "b", "c"]
+    ]
+    assert max(s for s, _ in spans) < min(e for _, e in spans)
+
+
+def test_async_jobs_limits_concurrency(tmp_path):
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    (tmp_path / ".smash" / "config.json").write_text(json.dumps({"async_jobs": 1}))
+    for name in ["a", "b"]:
+        (tmp_path / f"smashlet_{name}.py").write_text(ASYNC_SMASHLET.format(name=name))
+
+    run_build()
+
+    (a_start, a_end), (b_start, b_end) = [
+        [float(t) for t in (tmp_path / f"{name}.txt").read_text().split()]
+        for name in ["a", "b"]
+    ]
+    assert a_end <= b_start or b_end <= a_start
+
+
+def test_async_smashlet_runs_without_a_session(tmp_path):
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    smashlet = tmp_path / "smashlet.py"
+    smashlet.write_text("async def run(context):\n    return 1\n")
+
+    assert load_smashlet_spec(smashlet)[0]["async"] is True
+    assert run_smashlet(smashlet, tmp_path, {"project_root": tmp_path}) is True
+
+
+def test_run_graph_gives_async_nodes_their_own_slots():
+    running = set()
+    overlaps = []
+
+    def task(node):
+        running.add(node)
+        time.sleep(0.05)
+        overlaps.append(set(running))
+        running.discard(node)
+
+    run_graph(
+        ["s1", "s2", "a1", "a2"],
+        {},
+        task,
+        jobs=1,
+        async_nodes={"a1", "a2"},
+        async_jobs=2,
+    )
+
+    assert all(len(seen & {"s1", "s2"}) <= 1 for seen in overlaps)
+    assert any(seen >= {"a1", "a2"} for seen in overlaps)
+
+
+def test_async_file_helpers(tmp_path):
+    context = {"cwd": tmp_path, "project_root": tmp_path}
+
+    async def main():
+        await smash.write_async("out/a.txt", "hello", context)
+        changed = await smash.write_output_if_changed_async(
+            "out/a.txt", "hello", context
+        )
+        return (
+            await smash.read_async("out/a.txt", context),
+            await smash.read_bytes_async("out/a.txt", context),
+            changed,
+        )
+
+    assert asyncio.run(main()) == ("hello", b"hello", False)
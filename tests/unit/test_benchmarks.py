@@ -0,0 +1,39 @@
+"""
+Tests the benchmark project generator and result comparison.
+"""
+
+import importlib.util
+from pathlib import Path
+
+from smash_core.commands.build import plan_build
+from smash_core.discovery import walk_smashlets
+from smash_core.session import BuildSession
+
+BENCH = Path(__file__).resolve().parents[2] / "benchmarks" / "bench.py"
+spec = importlib.util.spec_from_file_location("bench", BENCH)
+bench = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(bench)
+
+
+def test_generated_project_has_dependency_chains(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bench.generate_project(tmp_path, smashlets=5, inputs=3, context_kb=1, chain=2)
+
+    smashlets, _ = walk_smashlets(tmp_path)
+    plan = plan_build(smashlets, BuildSession(tmp_path))
+
+    assert len(smashlets) == 5
+    assert len(list(tmp_path.glob("chain_0000/step_00/*.txt"))) == 3
+    step_1 = tmp_path / "chain_0000" / "step_01" / "smashlet.py"
+    assert plan["deps"][step_1] == {tmp_path / "chain_0000" / "step_00" / "smashlet.py"}
+    assert plan["deps"][tmp_path / "chain_0002" / "step_00" / "smashlet.py"] == set()
+
+
+def test_compare_flags_slower_medians():
+    old = {"results": {"noop_build": {"median": 1.0}, "status": {"median": 1.0}}}
+    new = {"results": {"noop_build": {"median": 1.3}, "status": {"median": 1.05}}}
+
+    rows = {row[0]: row for row in bench.compare(old, new, threshold=0.1)}
+
+    assert rows["noop_build"][-1] is True
+    assert rows["status"][-1] is False
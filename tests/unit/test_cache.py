@@ -0,0 +1,116 @@
+"""
+Tests the content-addressed output cache.
+"""
+
+import json
+import os
+
+from smash_core.cache import OutputCache
+from smash_core.session import BuildSession
+from smash_core.smashlets import run_smashlet
+
+SMASHLET = """
+INPUT_GLOB = "*.md"
+OUTPUT_FILES = ["out.txt"]
+CACHE = True
+
+def run(context):
+    with open("runs.txt", "a") as f:
+        f.write("run\\n")
+    with open("out.txt", "w") as f:
+        f.write("".join(p.read_text() for p in sorted(context["inputs"])))
+    return 1
+"""
+
+
+def build(tmp_path, smashlet):
+    session = BuildSession(tmp_path)
+    try:
+        return run_smashlet(smashlet, tmp_path, {"project_root": tmp_path}, session)
+    finally:
+        session.close()
+
+
+def test_reverted_inputs_restore_outputs_without_running(tmp_path, project, run_count):
+    smashlet = project(SMASHLET, {"a.md": "first"})
+    out = tmp_path / "out.txt"
+
+    assert build(tmp_path, smashlet) is True
+    (tmp_path / "a.md").write_text("second")
+    build(tmp_path, smashlet)
+    assert out.read_text() == "second"
+
+    (tmp_path / "a.md").write_text("first")
+    out.unlink()
+    assert build(tmp_path, smashlet) is True
+
+    assert out.read_text() == "first"
+    assert run_count() == 2
+    stats = OutputCache(tmp_path).stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+
+def test_context_files_are_part_of_the_key(tmp_path, project, run_count):
+    smashlet = project(SMASHLET)
+    (tmp_path / "context").mkdir()
+    (tmp_path / "context" / "site.json").write_text('{"title": "a"}')
+
+    def global_context():
+        return {"context_files": {"site.json": tmp_path / "context" / "site.json"}}
+
+    run_smashlet(smashlet, tmp_path, global_context())
+    (tmp_path / "context" / "site.json").write_text('{"title": "b"}')
+    run_smashlet(smashlet, tmp_path, global_context())
+
+    assert run_count() == 2
+
+
+def test_smashlets_are_not_cached_by_default(tmp_path, project, run_count):
+    smashlet = project(SMASHLET.replace("CACHE = True", ""))
+
+    build(tmp_path, smashlet)
+    build(tmp_path, smashlet)
+
+    assert run_count() == 2
+    assert not (tmp_path / ".smash" / "cache").exists()
+
+
+def test_eviction_drops_least_recently_used_entries(tmp_path):
+    (tmp_path / ".smash").mkdir()
+    (tmp_path / ".smash" / "config.json").write_text(json.dumps({"cache_size_mb": 1}))
+    cache = OutputCache(tmp_path)
+    blob = tmp_path / "blob.bin"
+
+    for i, key in enumerate(["old", "recent", "new"]):
+        blob.write_bytes(bytes([i]) * 400 * 1024)
+        cache.store(key, [blob])
+        entry = cache.root / "entries" / f"{key}.json"
+        os.utime(entry, (i, i))
+    assert cache.restore("old", [blob]) is not None  # now most recently used
+
+    cache.evict()
+
+    assert cache.restore("recent", [blob]) is None
+    assert cache.restore("old", [blob]) is not None
+    assert cache.stats()["objects"] == 2
+
+
+def test_forced_runs_run_and_refresh_the_cache(tmp_path, project, run_count):
+    smashlet = project(SMASHLET)
+    build(tmp_path, smashlet)
+
+    for _ in range(2):
+        run_smashlet(smashlet, tmp_path, {"project_root": tmp_path}, force=True)
+
+    assert run_count() == 3
+
+
+def test_project_wide_cache_skips_timed_and_hooked_smashlets(tmp_path, project):
+    smashlet = project(SMASHLET)
+    (tmp_path / ".smash" / "config.json").write_text(json.dumps({"cache": True}))
+
+    for extra in ['RUN = "always"\n', "def should_run(context):\n    return True\n"]:
+        smashlet.write_text(SMASHLET.replace("CACHE = True", "") + extra)
+        build(tmp_path, smashlet)
+
+    assert not (tmp_path / ".smash" / "cache").exists()
@@ -0,0 +1,171 @@
+"""
+Tests context loading and the parsed context file cache.
+"""
+
+import json
+
+import pytest
+
+from smash_core import context_loader
+from smash_core.context_loader import (
+    ContextCache,
+    LazyContext,
+    build_context,
+    load_context_data,
+    merge_contexts,
+)
+
+
+def test_load_context_data_parses_by_suffix(tmp_path):
+    ctx = tmp_path / "context"
+    ctx.mkdir()
+    (ctx / "site.json").write_text('{"title": "Smash"}')
+    (ctx / "prompt.txt").write_text("Be brief.")
+    (ctx / "image.png").write_bytes(b"\x89PNG")
+    (ctx / "broken.json").write_text("{")
+
+    merged, paths = load_context_data(ctx, ContextCache())
+
+    assert isinstance(merged, LazyContext)
+    assert merged == {"site": {"title": "Smash"}, "prompt": "Be brief."}
+    assert set(paths) == {"site.json", "prompt.txt", "image.png", "broken.json"}
+
+
+def test_context_cache_parses_unchanged_files_once(tmp_path, monkeypatch, age):
+    f = tmp_path / "data.json"
+    f.write_text('{"n": 1}')
+    age(f)
+
+    calls = []
+    parse = context_loader.parse_context_file
+    monkeypatch.setattr(
+        context_loader, "parse_context_file", lambda p: calls.append(p) or parse(p)
+    )
+
+    cache = ContextCache()
+    assert cache.get(f) == {"n": 1}
+    assert cache.get(f) == {"n": 1}
+    assert len(calls) == 1
+
+    f.write_text('{"n": 22}')
+    age(f)
+    assert cache.get(f) == {"n": 22}
+    assert len(calls) == 2
+
+
+def test_context_cache_persists_when_enabled(tmp_path, age):
+    (tmp_path / ".smash").mkdir()
+    (tmp_path / "context").mkdir()
+    f = tmp_path / "context" / "site.json"
+    f.write_text('{"title": "Smash"}')
+    age(f)
+
+    cache = ContextCache.load(tmp_path)
+    build_context(tmp_path, cache)["context"]["site"]
+    cache.save()
+    assert not (tmp_path / ".smash" / "context_cache.json").exists()
+
+    (tmp_path / ".smash" / "config.json").write_text('{"context_cache": true}')
+    cache = ContextCache.load(tmp_path)
+    assert build_context(tmp_path, cache)["context"]["site"]["title"] == "Smash"
+    cache.save()
+
+    saved = json.loads((tmp_path / ".smash" / "context_cache.json").read_text())
+    assert json.loads(saved[str(f)][3]) == {"title": "Smash"}
+    assert ContextCache.load(tmp_path).get(f) == {"title": "Smash"}
+
+
+def test_context_cache_hands_out_copies(tmp_path, age):
+    f = tmp_path / "data.json"
+    f.write_text('{"tags": ["a"]}')
+    age(f)
+
+    cache = ContextCache()
+    for _ in range(3):
+        cache.get(f)["tags"].append("mutated")
+
+    assert cache.get(f) == {"tags": ["a"]}
+
+
+def test_lazy_context_parses_on_first_access(tmp_path, monkeypatch):
+    ctx = tmp_path / "context"
+    ctx.mkdir()
+    (ctx / "big.json").write_text('{"rows": [1, 2, 3]}')
+    (ctx / "prompt.txt").write_text("Be brief.")
+
+    calls = []
+    parse = context_loader.parse_context_file
+    monkeypatch.setattr(
+        context_loader, "parse_context_file", lambda p: calls.append(p.name) or parse(p)
+    )
+
+    merged, _ = load_context_data(ctx)
+    assert sorted(merged) == ["big", "prompt"]
+    assert "prompt" in merged and len(merged) == 2
+    assert calls == []
+
+    assert merged["prompt"] == "Be brief."
+    assert merged.get("prompt") == "Be brief."
+    assert calls == ["prompt.txt"]
+    assert not merged.is_loaded("big")
+
+
+def test_lazy_context_behaves_like_a_dict(tmp_path):
+    ctx = tmp_path / "context"
+    ctx.mkdir()
+    (ctx / "site.json").write_text('{"title": "Smash"}')
+    (ctx / "broken.json").write_text("{")
+
+    merged, _ = load_context_data(ctx)
+    expected = {"site": {"title": "Smash"}}
+
+    assert isinstance(merged, dict)
+    assert dict(merged) == expected
+    assert {**merged} == expected
+    assert json.loads(json.dumps(merged)) == expected
+    assert merged | {"extra": 1} == {**expected, "extra": 1}
+    assert "broken" not in merged
+    assert merged.get("missing", "default") == "default"
+
+
+def test_merge_contexts_keeps_values_unparsed(tmp_path):
+    ctx = tmp_path / "context"
+    ctx.mkdir()
+    (ctx / "local.txt").write_text("local")
+    local, _ = load_context_data(ctx)
+
+    merged = merge_contexts({"site": "global", "local": "global"}, local)
+
+    assert not merged.is_loaded("local")
+    assert merged["local"] == "local"
+    assert merged["site"] == "global"
+    assert not local.is_loaded("local")
+
+
+def test_lazy_context_mmap_large_text(tmp_path):
+    ctx = tmp_path / "context"
+    ctx.mkdir()
+    (ctx / "corpus.txt").write_text("line\n" * 100_000)
+    (ctx / "empty.txt").write_text("")
+    merged, _ = load_context_data(ctx)
+
+    mapped = merged.mmap("corpus")
+    assert mapped[:5] == b"line\n"
+    assert len(mapped) == 500_000
+    assert not merged.is_loaded("corpus")
+    assert merged.mmap("empty") == b""
+
+
+def test_lazy_context_mmap_after_the_value_was_parsed(tmp_path):
+    ctx = tmp_path / "context"
+    ctx.mkdir()
+    (ctx / "prompt.txt").write_text("Be brief.")
+    merged, _ = load_context_data(ctx)
+
+    assert merge_contexts(merged)["prompt"] == "Be brief."
+    assert merged["prompt"] == "Be brief."
+    assert merged.mmap("prompt")[:2] == b"Be"
+
+    merged["prompt"] = "overridden"
+    with pytest.raises(ValueError):
+        merged.mmap("prompt")
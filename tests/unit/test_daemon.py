@@ -0,0 +1,118 @@
+"""
+Tests the resident build daemon: request handling over the socket and warm
+state reuse between builds.
+"""
+
+import io
+import os
+import socket
+import sys
+import threading
+
+from smash_core.daemon import SmashDaemon, daemon_request, socket_path
+
+
+def start_server(root):
+    daemon = SmashDaemon(root)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if daemon_request(root, {"command": "ping"}) is not None:
+            break
+        threading.Event().wait(0.01)
+    return daemon, thread
+
+
+def test_daemon_builds_with_warm_modules(tmp_path):
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    (tmp_path / "input.txt").write_text("hello")
+    (tmp_path / "smashlet.py").write_text("""
+INPUT_GLOB = "*.txt"
+OUTPUT_FILES = ["out.md"]
+
+def run():
+    with open("out.md", "w") as f:
+        f.write(open("input.txt").read().upper())
+    return 0
+""")
+
+    assert daemon_request(tmp_path, {"command": "ping"}) is None
+
+    daemon, thread = start_server(tmp_path)
+    out = io.StringIO()
+    assert daemon_request(tmp_path, {"command": "build"}, stream=out) == 0
+    assert (tmp_path / "out.md").read_text() == "HELLO"
+    assert "smashlet.py" in out.getvalue()
+
+    module = daemon.modules.load(tmp_path / "smashlet.py")
+
+    (tmp_path / "input.txt").write_text("again")
+    old = (tmp_path / "out.md").stat().st_mtime - 10
+    os.utime(tmp_path / "out.md", (old, old))
+    assert daemon_request(tmp_path, {"command": "build"}, stream=io.StringIO()) == 0
+    assert (tmp_path / "out.md").read_text() == "AGAIN"
+    assert daemon.modules.load(tmp_path / "smashlet.py") is module
+
+    status = io.StringIO()
+    assert daemon_request(tmp_path, {"command": "status"}, stream=status) == 0
+    assert "up to date" in status.getvalue()
+
+    assert daemon_request(tmp_path, {"command": "stop"}, stream=io.StringIO()) == 0
+    thread.join(5)
+    assert not thread.is_alive()
+    assert not socket_path(tmp_path).exists()
+    assert not (tmp_path / ".smash" / "daemon.json").exists()
+
+
+def test_daemon_reimports_changed_project_modules(tmp_path):
+    root = tmp_path / "project"
+    (root / ".smash").mkdir(parents=True)
+    (root / "site").mkdir()
+    helpers = root / "smash_test_helpers.py"
+    helpers.write_text("WORD = 'one'\n")
+    (root / "site" / "smashlet.py").write_text("""
+import smash_test_helpers
+
+def run():
+    with open("log.txt", "a") as f:
+        f.write(smash_test_helpers.WORD + "\\n")
+    return 0
+""")
+    os.chdir(root)
+
+    daemon = SmashDaemon(root)
+    try:
+        assert daemon.handle({"command": "run", "cwd": str(root)}) == 0
+        helpers.write_text("WORD = 'two!'\n")
+        assert daemon.handle({"command": "run", "cwd": str(root)}) == 0
+    finally:
+        sys.modules.pop("smash_test_helpers", None)
+
+    log = (root / "log.txt").read_text().splitlines()
+    assert log == ["one", "two!"]
+
+
+def test_daemon_survives_a_client_that_disconnects(tmp_path):
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    (tmp_path / "smashlet.py").write_text("""
+import time
+
+def run():
+    time.sleep(0.3)
+    for i in range(100):
+        print("line", i)
+    return 0
+""")
+    daemon, thread = start_server(tmp_path)
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(socket_path(tmp_path)))
+    client.sendall(b'{"command": "build"}\n')
+    client.close()
+    threading.Event().wait(0.5)
+
+    assert daemon_request(tmp_path, {"command": "ping"}) == 0
+    assert daemon_request(tmp_path, {"command": "stop"}, stream=io.StringIO()) == 0
+    thread.join(5)
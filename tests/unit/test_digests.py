@@ -0,0 +1,68 @@
+"""
+Tests content-hash freshness and the (inode, size, mtime_ns) stat cache.
+
+Verifies that unchanged files are not re-hashed and that `FRESHNESS = "hash"`
+smashlets ignore touches but notice content changes.
+"""
+
+import os
+import time
+
+import smash_core.digests as digests
+from smash_core.digests import StatCache
+from smash_core.smashlets import run_smashlet, should_run
+
+SLEEP_TIME = 0.1
+
+
+def test_stat_cache_skips_rehashing_unchanged_files(tmp_path, monkeypatch, age):
+    (tmp_path / ".smash").mkdir()
+    target = tmp_path / "data.txt"
+    target.write_text("hello")
+    age(target)
+
+    calls = []
+    original = digests.file_digest
+    monkeypatch.setattr(
+        digests, "file_digest", lambda p: calls.append(p) or original(p)
+    )
+
+    cache = StatCache.load(tmp_path)
+    first = cache.digest(target)
+    cache.save()
+
+    reloaded = StatCache.load(tmp_path)
+    assert reloaded.digest(target) == first
+    assert len(calls) == 1
+
+    target.write_text("changed")
+    age(target)
+    assert reloaded.digest(target) != first
+    assert len(calls) == 2
+
+
+def test_hash_freshness_ignores_touch_but_sees_edits(tmp_path):
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    source = tmp_path / "input.txt"
+    source.write_text("v1")
+
+    smashlet = tmp_path / "smashlet_hash.py"
+    smashlet.write_text("""
+INPUT_GLOB = "*.txt"
+FRESHNESS = "hash"
+
+def run():
+    return 0
+""")
+
+    assert should_run(smashlet, tmp_path) is True
+    run_smashlet(smashlet, tmp_path, {"project_root": tmp_path})
+
+    time.sleep(SLEEP_TIME)
+    source.touch()
+    smashlet.touch()
+    assert should_run(smashlet, tmp_path) is False
+
+    source.write_text("v2")
+    assert should_run(smashlet, tmp_path) is True
@@ -0,0 +1,118 @@
+"""
+Tests smashlet discovery with directory pruning and `.smashignore` rules.
+
+Covers default-ignored folders, nested projects, ignore patterns and the
+visited-directory count reported by `walk_smashlets()`.
+"""
+
+from smash_core.discovery import walk_smashlets
+from smash_core.patterns import IgnoreRules, glob_to_regex
+
+SMASHLET = "def run(): pass\n"
+
+
+def make_smashlet(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(SMASHLET)
+    return path
+
+
+def test_walk_skips_default_ignored_dirs(tmp_path):
+    (tmp_path / ".smash").mkdir()
+    keep = make_smashlet(tmp_path / "content" / "smashlet.py")
+    make_smashlet(tmp_path / "node_modules" / "pkg" / "smashlet.py")
+    make_smashlet(tmp_path / ".git" / "smashlet_hook.py")
+    make_smashlet(tmp_path / ".smash" / "smashlet_state.py")
+
+    found, stats = walk_smashlets(tmp_path)
+
+    assert found == [keep]
+    # root and content/ only
+    assert stats["dirs_visited"] == 2
+
+
+def test_walk_prunes_nested_projects_and_virtualenvs(tmp_path):
+    (tmp_path / ".smash").mkdir()
+    keep = make_smashlet(tmp_path / "smashlet_top.py")
+
+    nested = tmp_path / "sub"
+    (nested / ".smash").mkdir(parents=True)
+    make_smashlet(nested / "smashlet.py")
+
+    env = tmp_path / "env"
+    env.mkdir()
+    (env / "pyvenv.cfg").write_text("home = /usr")
+    make_smashlet(env / "lib" / "smashlet.py")
+
+    found, stats = walk_smashlets(tmp_path)
+
+    assert found == [keep]
+    assert stats["dirs_pruned"] == 2
+
+
+def test_walk_honours_smashignore(tmp_path):
+    (tmp_path / ".smashignore").write_text(
+        "# build output\ndist/\n/drafts\nsmashlet_skip*.py\n!smashlet_skip_keep.py\n"
+    )
+    make_smashlet(tmp_path / "dist" / "smashlet.py")
+    make_smashlet(tmp_path / "drafts" / "smashlet.py")
+    kept_draft = make_smashlet(tmp_path / "posts" / "drafts" / "smashlet.py")
+    make_smashlet(tmp_path / "smashlet_skip_me.py")
+    kept = make_smashlet(tmp_path / "smashlet_skip_keep.py")
+
+    found, _ = walk_smashlets(tmp_path)
+
+    assert sorted(found) == sorted([kept_draft, kept])
+
+
+def test_glob_to_regex_handles_double_star():
+    regex = glob_to_regex("**/*.md")
+
+    assert regex.match("a.md")
+    assert regex.match("posts/2024/a.md")
+    assert not regex.match("a.mdx")
+    assert not glob_to_regex("*.md").match("posts/a.md")
+
+
+def test_ignore_rules_dir_only_patterns():
+    rules = IgnoreRules(["build/"])
+
+    assert rules.is_ignored("build", is_dir=True)
+    assert rules.is_ignored("src/build", is_dir=True)
+    assert not rules.is_ignored("build", is_dir=False)
+
+
+def test_index_skips_unchanged_directories(tmp_path, age):
+    (tmp_path / ".smash").mkdir()
+    first = make_smashlet(tmp_path / "a" / "smashlet.py")
+    make_smashlet(tmp_path / "b" / "deep" / "smashlet_x.py")
+    age(tmp_path)
+
+    found, stats = walk_smashlets(tmp_path)
+    assert len(found) == 2
+    assert (tmp_path / ".smash" / "discovery.json").exists()
+
+    found_again, stats = walk_smashlets(tmp_path)
+    assert found_again == found
+    assert stats["dirs_scanned"] == 0
+    assert stats["dirs_visited"] == 4
+
+    # Adding a smashlet changes only a/'s mtime
+    added = make_smashlet(tmp_path / "a" / "smashlet_new.py")
+    found_after, stats = walk_smashlets(tmp_path)
+
+    assert added in found_after and first in found_after
+    assert stats["dirs_scanned"] == 1
+
+
+def test_index_is_dropped_when_smashignore_changes(tmp_path, age):
+    (tmp_path / ".smash").mkdir()
+    make_smashlet(tmp_path / "drafts" / "smashlet.py")
+    age(tmp_path)
+    assert len(walk_smashlets(tmp_path)[0]) == 1
+
+    (tmp_path / ".smashignore").write_text("drafts/\n")
+    age(tmp_path)
+
+    found, _ = walk_smashlets(tmp_path)
+    assert found == []
@@ -1,12 +1,14 @@
 """
-Tests file I/O helpers used in smashlets: `read`, `write`, and `resolve`.
+Tests file I/O helpers used in smashlets: `read`, `write`, `resolve`,
+`read_bytes`, `open` and `read_mmap`.
 
 Verifies that paths are correctly resolved relative to `context["cwd"]`
 and that basic reading and writing behaves as expected.
 """
 
 import os
-from smash_core.files import read, write, resolve
+from smash_core.files import open_file, read, read_bytes, read_mmap, resolve, write
+from smash_core.snapshot import FileSnapshot
 
 
 def test_resolve_and_read_write(tmp_path):
@@ -26,3 +28,45 @@ def test_resolve_and_read_write(tmp_path):
 
     content = read("example.txt", context)
     assert content == "Hello Smash!"
+
+
+def test_binary_streaming_and_mmap_access(tmp_path):
+    smashlet_dir = tmp_path / "site"
+    smashlet_dir.mkdir()
+    context = {"cwd": smashlet_dir, "project_root": tmp_path}
+    snapshot = FileSnapshot()
+    assert not snapshot.exists(tmp_path / "logs" / "big.log")
+
+    with open_file("/logs/big.log", "wb", context) as f:
+        for i in range(1000):
+            f.write(b"line %d\n" % i)
+
+    assert snapshot.exists(tmp_path / "logs" / "big.log")
+    assert read_bytes("../logs/big.log", context).startswith(b"line 0\n")
+
+    with open_file("/logs/big.log", "r", context, buffering=1) as f:
+        assert sum(1 for _ in f) == 1000
+
+    mapped = read_mmap("/logs/big.log", context)
+    assert mapped[:7] == b"line 0\n"
+    assert mapped.find(b"line 999") > 0
+    assert memoryview(mapped).readonly
+
+    (smashlet_dir / "empty.bin").write_bytes(b"")
+    assert read_mmap("empty.bin", context) == b""
+
+
+def test_write_replaces_read_only_outputs_with_the_default_mode(tmp_path):
+    context = {"cwd": tmp_path}
+    (tmp_path / "cached.txt").write_text("from cache")
+    os.chmod(tmp_path / "cached.txt", 0o444)
+    (tmp_path / "script.sh").write_text("#!/bin/sh\n")
+    os.chmod(tmp_path / "script.sh", 0o755)
+    (tmp_path / "new.txt").write_text("")
+    default = os.stat(tmp_path / "new.txt").st_mode & 0o777
+
+    write("cached.txt", "rewritten", context)
+    write("script.sh", "#!/bin/sh\necho hi\n", context)
+
+    assert os.stat(tmp_path / "cached.txt").st_mode & 0o777 == default
+    assert os.stat(tmp_path / "script.sh").st_mode & 0o777 == 0o755
@@ -0,0 +1,132 @@
+"""
+Tests the no-op build fast path based on the project fingerprint.
+"""
+
+import os
+
+import pytest
+
+from smash_core.commands import run_build
+from smash_core.commands.status import run_status
+from smash_core import fingerprint
+from smash_core.fingerprint import FINGERPRINT_FILE
+
+SMASHLET = """
+INPUT_GLOB = "*.md"
+OUTPUT_FILES = ["out.txt"]
+
+def run(context):
+    with open("runs.txt", "a") as f:
+        f.write("run\\n")
+    with open("out.txt", "w") as f:
+        f.write("".join(p.read_text() for p in sorted(context["inputs"])))
+"""
+
+
+@pytest.fixture
+def built(tmp_path, project, age):
+    """
+    Build a project twice, the second time with every file old enough to be
+    fingerprinted.
+    """
+
+    def setup(source=SMASHLET):
+        project(source)
+        run_build()
+        age(tmp_path)
+        run_build()
+
+    return setup
+
+
+def test_unchanged_project_skips_the_build(tmp_path, capsys, built, run_count):
+    built()
+    assert (tmp_path / ".smash" / FINGERPRINT_FILE).exists()
+    capsys.readouterr()
+
+    run_build()
+
+    assert "Nothing changed since the last build" in capsys.readouterr().out
+    assert run_count() == 1
+
+
+def test_changed_or_added_inputs_rebuild(tmp_path, capsys, built, age, run_count):
+    built()
+
+    (tmp_path / "a.md").write_text("changed")
+    run_build()
+    assert run_count() == 2
+
+    age(tmp_path)
+    run_build()
+    (tmp_path / "b.md").write_text("new")
+    os.utime(tmp_path / "b.md", (1, 1))  # older than out.txt, but still new
+    capsys.readouterr()
+    run_build()
+
+    assert "Nothing changed" not in capsys.readouterr().out
+    assert run_count() == 2  # Checked, but out.txt is newer than b.md
+
+
+def test_timed_smashlets_are_never_fingerprinted(tmp_path, built, run_count):
+    built(SMASHLET + 'RUN = "always"\nRUN_TIMEOUT = 0\n')
+
+    assert not (tmp_path / ".smash" / FINGERPRINT_FILE).exists()
+    run_build()
+    assert run_count() == 3
+
+
+def test_forced_builds_ignore_the_fingerprint(tmp_path, built, run_count):
+    built()
+
+    run_build(force=True)
+
+    assert run_count() == 2
+
+
+def test_new_input_in_a_new_ignored_subdirectory_rebuilds(
+    tmp_path, built, age, run_count
+):
+    built(
+        SMASHLET.replace('"*.md"', '"dist/**/*.html"'),
+    )
+    (tmp_path / ".smashignore").write_text("dist/\n")
+    (tmp_path / "dist" / "a").mkdir(parents=True)
+    (tmp_path / "dist" / "a" / "x.html").write_text("x")
+    run_build()
+    age(tmp_path)
+    run_build()
+    assert (tmp_path / ".smash" / FINGERPRINT_FILE).exists()
+    before = run_count()
+
+    (tmp_path / "dist" / "b").mkdir()
+    (tmp_path / "dist" / "b" / "y.html").write_text("y")
+    run_build()
+
+    assert run_count() == before + 1
+
+
+def test_status_trusts_a_matching_fingerprint(tmp_path, capsys, built):
+    built()
+    capsys.readouterr()
+
+    run_status(why=True)
+
+    output = capsys.readouterr().out
+    assert "✅ smashlet.py — up to date" in output
+    assert "↳ nothing changed since the last clean build" in output
+
+
+def test_inputs_edited_during_the_build_are_not_fingerprinted(
+    tmp_path, monkeypatch, built
+):
+    built()
+    monkeypatch.setattr(fingerprint, "RACY_WINDOW_NS", 0)
+    # Edit the input after the smashlet read it, as an editor might mid-build
+    (tmp_path / "smashlet.py").write_text(
+        SMASHLET + '    with open("a.md", "w") as f:\n        f.write("v2")\n'
+    )
+
+    run_build()
+    assert (tmp_path / "out.txt").read_text() == "a"
+    assert not (tmp_path / ".smash" / FINGERPRINT_FILE).exists()
@@ -0,0 +1,56 @@
+"""
+Tests `write_output_if_changed`: change detection, streaming and atomic writes.
+"""
+
+import os
+
+from smash_core import files
+from smash_core.helpers import write_output_if_changed
+
+
+def test_write_output_if_changed_skips_identical_content(tmp_path):
+    out = tmp_path / "dist" / "index.html"
+    context = {"cwd": tmp_path}
+
+    assert write_output_if_changed("dist/index.html", "<h1>Hi</h1>", context)
+    os.utime(out, (1, 1))
+
+    assert not write_output_if_changed(out, "<h1>Hi</h1>", context)
+    assert out.stat().st_mtime == 1
+    assert write_output_if_changed(out, "<h1>Hi!</h1>", context)
+    assert out.read_text() == "<h1>Hi!</h1>"
+
+
+def test_write_output_if_changed_accepts_bytes_and_streams(tmp_path, monkeypatch):
+    monkeypatch.setattr(files, "CHUNK_SIZE", 4)
+    out = tmp_path / "index.bin"
+    chunks = [b"abcd", "efgh", b"ij"]
+
+    assert write_output_if_changed(out, b"abcdefghij", {})
+    assert not write_output_if_changed(out, iter(chunks), {})
+    assert not write_output_if_changed(out, bytearray(b"abcdefghij"), {})
+    assert write_output_if_changed(out, iter([b"abcd", b"efgh"]), {})
+    assert out.read_bytes() == b"abcdefgh"
+    assert write_output_if_changed(out, iter(chunks + [b"k"]), {})
+    assert out.read_bytes() == b"abcdefghijk"
+
+
+def test_writes_are_atomic_and_keep_permissions(tmp_path):
+    out = tmp_path / "search.json"
+    out.write_text("old")
+    os.chmod(out, 0o640)
+
+    def failing_stream():
+        yield b"partial"
+        raise RuntimeError("generator failed")
+
+    try:
+        write_output_if_changed(out, failing_stream(), {})
+    except RuntimeError:
+        pass
+
+    assert out.read_text() == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["search.json"]
+
+    assert write_output_if_changed(out, "new", {})
+    assert out.stat().st_mode & 0o777 == 0o640
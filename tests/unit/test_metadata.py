@@ -0,0 +1,108 @@
+"""
+Tests static smashlet metadata extraction used for import-free freshness checks.
+
+Covers literal constant parsing, detection of dynamically bound names, and
+that `should_run()` only imports smashlets when it has to.
+"""
+
+import os
+
+from smash_core.metadata import MetadataIndex, needs_import, read_smashlet_metadata
+from smash_core.smashlets import should_run
+
+
+def test_reads_literal_constants_and_functions(tmp_path):
+    smashlet = tmp_path / "smashlet.py"
+    smashlet.write_text("""
+import json
+RUN = "always"
+RUN_TIMEOUT = 5
+INPUT_GLOB = "*.md"
+OUTPUT_FILES = ["dist/a.html", "dist/b.html"]
+def run(context):
+    return 1
+""")
+
+    meta = read_smashlet_metadata(smashlet)
+
+    assert meta["static"] is True
+    assert meta["constants"] == {
+        "RUN": "always",
+        "RUN_TIMEOUT": 5,
+        "INPUT_GLOB": "*.md",
+        "OUTPUT_FILES": ["dist/a.html", "dist/b.html"],
+    }
+    assert meta["functions"] == {"run"}
+    assert not needs_import(meta)
+
+
+def test_computed_or_conditional_values_are_dynamic(tmp_path):
+    computed = tmp_path / "smashlet_computed.py"
+    computed.write_text(
+        "import os\nINPUT_GLOB = os.environ.get('G', '*')\ndef run(): pass\n"
+    )
+
+    conditional = tmp_path / "smashlet_cond.py"
+    conditional.write_text(
+        "import sys\nif sys.platform:\n    RUN = 'always'\ndef run(): pass\n"
+    )
+
+    imported = tmp_path / "smashlet_imported.py"
+    imported.write_text("from helpers import run\n")
+
+    for path in (computed, conditional, imported):
+        assert read_smashlet_metadata(path)["static"] is False
+
+
+def test_dynamic_hooks_require_import(tmp_path):
+    smashlet = tmp_path / "smashlet.py"
+    smashlet.write_text(
+        "INPUT_GLOB = '*'\ndef get_outputs(): return []\ndef run(): pass\n"
+    )
+
+    assert needs_import(read_smashlet_metadata(smashlet))
+
+
+def test_syntax_error_returns_none(tmp_path):
+    smashlet = tmp_path / "smashlet.py"
+    smashlet.write_text("def run(:\n")
+
+    assert read_smashlet_metadata(smashlet) is None
+
+
+def test_should_run_does_not_import_static_smashlet(tmp_path):
+    os.chdir(tmp_path)
+    (tmp_path / "input.txt").write_text("data")
+
+    smashlet = tmp_path / "smashlet_static.py"
+    smashlet.write_text("""
+open("imported.txt", "w").write("yes")
+INPUT_GLOB = "*.txt"
+def run():
+    return 1
+""")
+
+    assert should_run(smashlet, tmp_path) is True
+    assert not (tmp_path / "imported.txt").exists()
+
+
+def test_metadata_index_is_reused_until_the_file_changes(tmp_path):
+    (tmp_path / ".smash").mkdir()
+    smashlet = tmp_path / "smashlet.py"
+    smashlet.write_text("INPUT_GLOB = '*.md'\ndef run():\n    pass\n")
+    os.utime(smashlet, (1000, 1000))
+
+    index = MetadataIndex.load(tmp_path)
+    read_smashlet_metadata(smashlet, index)
+    index.save()
+
+    reloaded = MetadataIndex.load(tmp_path)
+    meta = reloaded.get(smashlet)
+    assert meta["constants"] == {"INPUT_GLOB": "*.md"}
+    assert meta["functions"] == {"run"}
+
+    smashlet.write_text("INPUT_GLOB = '*.txt'\ndef run():\n    pass\n")
+    assert reloaded.get(smashlet) is None
+    assert read_smashlet_metadata(smashlet, reloaded)["constants"] == {
+        "INPUT_GLOB": "*.txt"
+    }
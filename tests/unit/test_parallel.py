@@ -0,0 +1,78 @@
+"""
+Tests `smash.parallel_map`.
+"""
+
+import os
+import threading
+
+import pytest
+
+from smash import parallel_map
+from smash_core import parallel
+from smash_core.smashlets import load_smashlet_module
+
+
+def test_parallel_map_keeps_order_across_processes():
+    items = list(range(100))
+
+    results = parallel_map(lambda n: (n * n, os.getpid()), items, workers=4)
+
+    assert [r[0] for r in results] == [n * n for n in items]
+    if parallel._fork_context():
+        assert {r[1] for r in results} != {os.getpid()}
+
+
+def test_parallel_map_propagates_worker_exceptions():
+    def check(n):
+        if n == 42:
+            raise ValueError("bad item")
+        return n
+
+    with pytest.raises(ValueError, match="bad item"):
+        parallel_map(check, range(100), workers=2, chunksize=5)
+
+
+def test_parallel_map_runs_small_inputs_serially():
+    results = parallel_map(lambda n: os.getpid(), range(3), workers=4)
+
+    assert results == [os.getpid()] * 3
+
+
+def test_parallel_map_respects_context_workers():
+    results = parallel_map(lambda n: os.getpid(), range(50), {"workers": 1})
+
+    assert results == [os.getpid()] * 50
+
+
+def test_parallel_map_does_not_fork_with_other_threads_running():
+    release = threading.Event()
+    thread = threading.Thread(target=release.wait)
+    thread.start()
+    try:
+        assert parallel._fork_context() is None
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_parallel_map_prints_worker_output_in_the_caller(capsys):
+    if not parallel._fork_context():
+        pytest.skip("needs fork")
+
+    parallel_map(lambda n: print(f"item {n}"), range(20), workers=2)
+
+    assert capsys.readouterr().out.splitlines() == [f"item {n}" for n in range(20)]
+
+
+def test_parallel_map_sends_smashlet_functions_to_unforked_workers(
+    tmp_path, monkeypatch
+):
+    smashlet = tmp_path / "smashlet.py"
+    smashlet.write_text("import os\n\ndef square(n):\n    return n * n, os.getpid()\n")
+    square = load_smashlet_module(smashlet).square
+    monkeypatch.setattr(parallel, "_fork_context", lambda: None)
+
+    results = parallel_map(square, range(50), workers=2)
+
+    assert [r[0] for r in results] == [n * n for n in range(50)]
+    assert os.getpid() not in {r[1] for r in results}
@@ -1,13 +1,14 @@
 """
 Tests project-level helpers for root detection and runlog tracking.
 
-Covers `find_project_root()`, `get_runlog()`, and `update_runlog()` in typical project setups.
+Covers `find_project_root()`, `get_runlog()`, `update_runlog()` and the
+build-scoped `Runlog` in typical project setups.
 """
 
 import os
 import json
 import time
-from smash_core.project import find_project_root, get_runlog, update_runlog
+from smash_core.project import Runlog, find_project_root, get_runlog, update_runlog
 
 
 def test_find_project_root_detects_smash_dir(tmp_path):
@@ -82,3 +83,33 @@ def test_update_runlog_adds_or_updates_entry(tmp_path):
 
     entry = runlog[str(fake_smashlet)]
     assert entry["last_run"] <= int(time.time())
+
+
+def test_runlog_records_in_memory_until_flush(tmp_path):
+    smash_dir = tmp_path / ".smash"
+    smash_dir.mkdir()
+    smashlet = tmp_path / "smashlet_a.py"
+
+    runlog = Runlog.load(tmp_path)
+    runlog.record(smashlet, finished_on=100, duration=0.5)
+    runlog.record(smashlet, finished_on=200, duration=0.25)
+
+    assert not (smash_dir / "runlog.json").exists()
+    assert runlog.get(smashlet)["runs"] == 2
+
+    runlog.flush()
+
+    entry = get_runlog(tmp_path)[str(smashlet)]
+    assert entry["last_run"] == 200
+    assert [h["finished_on"] for h in entry["history"]] == [100, 200]
+    # The atomic write leaves no temp files behind
+    assert sorted(p.name for p in smash_dir.iterdir()) == ["runlog.json"]
+
+
+def test_runlog_flushes_at_interval(tmp_path):
+    (tmp_path / ".smash").mkdir()
+
+    runlog = Runlog.load(tmp_path, flush_interval=0)
+    runlog.record(tmp_path / "smashlet.py", finished_on=123)
+
+    assert get_runlog(tmp_path)[str(tmp_path / "smashlet.py")]["last_run"] == 123
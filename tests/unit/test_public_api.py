@@ -4,6 +4,8 @@ Tests that key helper functions are exposed via the public `smash` API.
 Checks for presence of `read`, `write`, `log_step`, and `read_text_files`.
 """
 
+import builtins
+
 import smash
 
 
@@ -12,3 +14,19 @@ def test_public_api_exports():
     assert callable(smash.write)
     assert callable(smash.log_step)
     assert callable(smash.read_text_files)
+    assert callable(smash.parallel_map)
+    assert callable(smash.read_bytes)
+    assert callable(smash.open_file)
+    assert callable(smash.read_mmap)
+    assert callable(smash.read_async)
+    assert callable(smash.read_bytes_async)
+    assert callable(smash.write_async)
+    assert callable(smash.write_output_if_changed_async)
+
+
+def test_star_import_does_not_shadow_builtins():
+    namespace = {}
+    exec("from smash import *", namespace)
+
+    assert "open_file" in namespace
+    assert not set(namespace) & set(dir(builtins)) - {"__builtins__"}
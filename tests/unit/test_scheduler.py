@@ -0,0 +1,153 @@
+"""
+Tests dependency detection and concurrent execution for parallel builds.
+
+Covers matching declared outputs against INPUT_GLOB, dependency-respecting
+scheduling in `run_graph()`, and `run_build(jobs=N)` end to end.
+"""
+
+import os
+import threading
+import time
+
+from smash_core.commands import run_build
+from smash_core.scheduler import find_dependencies, run_graph, topological_order
+
+
+def test_find_dependencies_matches_outputs_to_input_glob(tmp_path):
+    os.chdir(tmp_path)
+    (tmp_path / "pages").mkdir()
+
+    producer = tmp_path / "smashlet_md.py"
+    producer.write_text(
+        "INPUT_GLOB = '*.txt'\nOUTPUT_FILES = ['pages/index.md']\ndef run(): pass\n"
+    )
+    consumer = tmp_path / "pages" / "smashlet.py"
+    consumer.write_text("INPUT_GLOB = '*.md'\ndef run(): pass\n")
+    unrelated = tmp_path / "smashlet_other.py"
+    unrelated.write_text("INPUT_GLOB = '*.csv'\ndef run(): pass\n")
+
+    deps = find_dependencies([producer, consumer, unrelated])
+
+    assert deps[consumer] == {producer}
+    assert deps[producer] == set()
+    assert deps[unrelated] == set()
+
+
+def test_run_graph_waits_for_dependencies():
+    events = []
+    lock = threading.Lock()
+
+    def task(node):
+        with lock:
+            events.append(("start", node))
+        time.sleep(0.05)
+        with lock:
+            events.append(("end", node))
+        return node.upper()
+
+    deps = {"c": {"a"}, "a": set(), "b": set()}
+    results = run_graph(["a", "b", "c"], deps, task, jobs=3)
+
+    assert results == {"a": "A", "b": "B", "c": "C"}
+    assert events.index(("end", "a")) < events.index(("start", "c"))
+    # a and b are independent and overlap
+    assert events.index(("start", "b")) < events.index(("end", "a"))
+
+
+def test_parallel_build_runs_chain_in_order(tmp_path, capsys):
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    (tmp_path / "source.txt").write_text("hello")
+
+    (tmp_path / "smashlet_upper.py").write_text("""
+from pathlib import Path
+INPUT_GLOB = "*.txt"
+OUTPUT_FILES = ["upper.md"]
+
+def run():
+    text = Path("source.txt").read_text().upper()
+    Path("upper.md").write_text(text)
+    print("upper done")
+    return 0
+""")
+    (tmp_path / "smashlet_wrap.py").write_text("""
+from pathlib import Path
+INPUT_GLOB = "*.md"
+OUTPUT_FILES = ["wrapped.html"]
+
+def run():
+    Path("wrapped.html").write_text("<p>" + Path("upper.md").read_text() + "</p>")
+    return 0
+""")
+    # Make the consumer look older so mtime order alone would run it first
+    past = time.time() - 60
+    os.utime(tmp_path / "smashlet_wrap.py", (past, past))
+
+    run_build(jobs=4)
+
+    assert (tmp_path / "wrapped.html").read_text() == "<p>HELLO</p>"
+    output = capsys.readouterr().out
+    assert "Running: smashlet_upper.py\nupper done" in output
+
+
+def test_topological_order_keeps_given_order_for_ties():
+    deps = {"a": {"c"}, "b": set(), "c": set(), "d": {"a"}}
+
+    order, cycle = topological_order(["a", "b", "c", "d"], deps)
+
+    assert cycle is None
+    assert order == ["b", "c", "a", "d"]
+
+
+def test_topological_order_reports_cycle():
+    deps = {"a": {"b"}, "b": {"c"}, "c": {"a"}, "d": set()}
+
+    order, cycle = topological_order(["a", "b", "c", "d"], deps)
+
+    assert order == ["d"]
+    assert set(cycle) == {"a", "b", "c"}
+    assert cycle[0] == cycle[-1]
+
+
+def test_build_chain_completes_in_one_pass(tmp_path, capsys):
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    (tmp_path / "a.txt").write_text("a")
+
+    # a.txt -> b.md -> c.csv, each smashlet reporting a change
+    for name, glob, out in [("one", "*.txt", "b.md"), ("two", "*.md", "c.csv")]:
+        (tmp_path / f"smashlet_{name}.py").write_text(f"""
+from pathlib import Path
+INPUT_GLOB = "{glob}"
+OUTPUT_FILES = ["{out}"]
+
+def run():
+    Path("{out}").write_text("x")
+    return 1
+""")
+    past = time.time() - 60
+    os.utime(tmp_path / "smashlet_two.py", (past, past))
+
+    run_build()
+
+    output = capsys.readouterr().out
+    assert (tmp_path / "c.csv").exists()
+    assert output.index("smashlet_one.py") < output.index("smashlet_two.py")
+    assert "Build complete in 1 pass(es)" in output
+
+
+def test_build_reports_dependency_cycle(tmp_path, capsys):
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+
+    (tmp_path / "smashlet_ping.py").write_text(
+        "INPUT_GLOB = '*.b'\nOUTPUT_FILES = ['x.a']\ndef run(): open('ran', 'w')\n"
+    )
+    (tmp_path / "smashlet_pong.py").write_text(
+        "INPUT_GLOB = '*.a'\nOUTPUT_FILES = ['x.b']\ndef run(): open('ran', 'w')\n"
+    )
+
+    run_build()
+
+    assert "Dependency cycle" in capsys.readouterr().out
+    assert not (tmp_path / "ran").exists()
@@ -3,6 +3,7 @@ import os
 import time
 
 from smash_core.project import get_runlog, update_runlog
+from smash_core.session import BuildSession
 from smash_core.smashlets import should_run
 
 SLEEP_TIME = 0.1
@@ -244,3 +245,20 @@ def test_update_runlog_adds_history(tmp_path):
     assert len(entry["history"]) == 1
     assert entry["history"][0]["finished_on"] == 1234567890
     assert entry["history"][0]["duration"] == 0.42
+
+
+def test_should_run_hooks_get_a_copy_of_the_context(tmp_path):
+    (tmp_path / "context").mkdir()
+    (tmp_path / "context" / "prompt.txt").write_text("Be brief.")
+    smashlet = tmp_path / "smashlet_reads_context.py"
+    smashlet.write_text("""
+def should_run(context):
+    return context["context"]["prompt"] == "Be brief."
+def run(context):
+    return 1
+""")
+    session = BuildSession(tmp_path)
+
+    assert should_run(smashlet, tmp_path, session) is True
+    assert not session.context["context"].is_loaded("prompt")
+    assert session.context["context"].mmap("prompt")[:2] == b"Be"
@@ -4,7 +4,14 @@ import json
 import os
 import time
 
-from smash_core.smashlets import discover_smashlets, run_smashlet, touch
+from smash_core.smashlets import (
+    ModuleRegistry,
+    discover_smashlets,
+    run_smashlet,
+    should_run,
+    touch,
+)
+from smash_core.session import BuildSession
 
 SLEEP_TIME = 0.1
 
@@ -188,3 +195,54 @@ def run(context):
     assert "foo.txt" in lines
     assert "bar.txt" in lines
     assert "ignore.md" not in lines
+
+
+def test_module_registry_loads_smashlet_once(tmp_path):
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    (tmp_path / "file.txt").write_text("data")
+
+    smashlet = tmp_path / "smashlet_counted.py"
+    smashlet.write_text("""
+with open("loads.txt", "a") as f:
+    f.write("x")
+
+INPUT_GLOB = "*.txt"
+
+def run(context):
+    return 0
+""")
+
+    session = BuildSession(tmp_path)
+    assert should_run(smashlet, tmp_path, session) is True
+    run_smashlet(smashlet, tmp_path, {"project_root": tmp_path}, session)
+    should_run(smashlet, tmp_path, session)
+
+    assert (tmp_path / "loads.txt").read_text() == "x"
+
+
+def test_module_registry_reloads_changed_file(tmp_path):
+    smashlet = tmp_path / "smashlet_changing.py"
+    smashlet.write_text("VALUE = 1\ndef run(): return 0\n")
+
+    registry = ModuleRegistry()
+    first = registry.load(smashlet)
+    assert registry.load(smashlet) is first
+
+    smashlet.write_text("VALUE = 22\ndef run(): return 0\n")
+    second = registry.load(smashlet)
+
+    assert second is not first
+    assert second.VALUE == 22
+
+
+def test_module_registry_touch_keeps_module(tmp_path):
+    smashlet = tmp_path / "smashlet_touched.py"
+    smashlet.write_text("def run(): return 1\n")
+
+    registry = ModuleRegistry()
+    first = registry.load(smashlet)
+    time.sleep(SLEEP_TIME)
+    registry.touch(smashlet)
+
+    assert registry.load(smashlet) is first
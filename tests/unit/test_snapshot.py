@@ -0,0 +1,72 @@
+"""
+Tests the per-pass filesystem snapshot and its invalidation.
+"""
+
+import os
+
+from smash import ensure_dir, write, write_output
+from smash_core.snapshot import FileSnapshot
+
+
+def test_snapshot_stats_and_globs_once(tmp_path, monkeypatch):
+    (tmp_path / "a.md").write_text("a")
+    snapshot = FileSnapshot()
+
+    calls = []
+    real_stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda p, *a, **k: calls.append(p) or real_stat(p))
+
+    assert snapshot.exists(tmp_path / "a.md")
+    assert snapshot.mtime(tmp_path / "a.md") > 0
+    assert not snapshot.exists(tmp_path / "missing.md")
+    assert not snapshot.exists(tmp_path / "missing.md")
+    assert len(calls) == 2
+
+    assert snapshot.glob(tmp_path, "*.md") == [tmp_path / "a.md"]
+    (tmp_path / "b.md").write_text("b")
+    assert snapshot.glob(tmp_path, "*.md") == [tmp_path / "a.md"]
+
+
+def test_invalidate_drops_path_and_matching_globs(tmp_path):
+    (tmp_path / "posts").mkdir()
+    snapshot = FileSnapshot()
+    out = tmp_path / "posts" / "new.md"
+
+    assert not snapshot.exists(out)
+    assert snapshot.glob(tmp_path / "posts", "*.md") == []
+    assert snapshot.glob(tmp_path, "**/*.md") == []
+    (tmp_path / "elsewhere").mkdir()
+    assert snapshot.glob(tmp_path / "elsewhere", "*") == []
+
+    out.write_text("hi")
+    (tmp_path / "elsewhere" / "x").write_text("x")
+    snapshot.invalidate(out)
+
+    assert snapshot.exists(out)
+    assert snapshot.glob(tmp_path / "posts", "*.md") == [out]
+    assert snapshot.glob(tmp_path, "**/*.md") == [out]
+    assert snapshot.glob(tmp_path / "elsewhere", "*") == []
+
+
+def test_file_helpers_invalidate_live_snapshots(tmp_path):
+    snapshot = FileSnapshot()
+    context = {"cwd": tmp_path}
+
+    assert not snapshot.exists(tmp_path / "out" / "page.html")
+    write("out/page.html", "<p>hi</p>", context)
+
+    assert snapshot.exists(tmp_path / "out" / "page.html")
+
+
+def test_write_output_and_ensure_dir_invalidate_live_snapshots(tmp_path):
+    snapshot = FileSnapshot()
+    out = tmp_path / "dist" / "index.html"
+    assets = tmp_path / "assets"
+
+    assert not snapshot.exists(out)
+    assert not snapshot.exists(assets)
+    write_output(out, "<p>hi</p>")
+    ensure_dir(assets)
+
+    assert snapshot.exists(out)
+    assert snapshot.exists(assets)
@@ -0,0 +1,117 @@
+"""
+Tests the optional SQLite state backend in `.smash/state.db`.
+
+Covers migration from `runlog.json`, unlimited history, per-input digests,
+concurrent writers and selection through `.smash/config.json`.
+"""
+
+import json
+import os
+import threading
+
+from smash_core.commands import run_init
+from smash_core.project import Runlog, get_runlog, open_runlog, update_runlog
+from smash_core.state import SqliteRunlog
+
+
+def make_project(tmp_path):
+    (tmp_path / ".smash").mkdir()
+    return tmp_path
+
+
+def test_migrates_json_runlog_once(tmp_path):
+    root = make_project(tmp_path)
+    smashlet = root / "smashlet_a.py"
+    (root / ".smash" / "runlog.json").write_text(
+        json.dumps(
+            {
+                str(smashlet): {
+                    "last_run": 50,
+                    "runs": 2,
+                    "history": [
+                        {"finished_on": 40},
+                        {"finished_on": 50, "duration": 1.5},
+                    ],
+                }
+            }
+        )
+    )
+
+    state = SqliteRunlog.open(root)
+    entry = state.get(smashlet)
+    state.close()
+
+    assert entry["last_run"] == 50
+    assert entry["runs"] == 2
+    assert entry["history"][-1] == {"finished_on": 50, "duration": 1.5}
+
+    # Reopening doesn't import the same history again
+    state = SqliteRunlog.open(root)
+    assert len(state.history(smashlet)) == 2
+    state.close()
+
+
+def test_history_is_unlimited_and_inputs_are_stored(tmp_path):
+    root = make_project(tmp_path)
+    smashlet = root / "smashlet.py"
+
+    state = SqliteRunlog.open(root)
+    for i in range(25):
+        state.record(smashlet, finished_on=1000 + i, duration=0.1 * i)
+    state.record(smashlet, finished_on=2000, digest="abc", inputs={"a.md": "d1"})
+
+    assert len(state.history(smashlet)) == 26
+    assert len(state.get(smashlet)["history"]) == 10
+    assert state.get(smashlet)["digest"] == "abc"
+    assert state.get_inputs(smashlet) == {"a.md": "d1"}
+    state.close()
+
+
+def test_runs_without_a_digest_clear_the_stored_one(tmp_path):
+    root = make_project(tmp_path)
+    smashlet = root / "smashlet.py"
+
+    for runlog in (Runlog.load(root), SqliteRunlog.open(root)):
+        runlog.record(smashlet, finished_on=1000, digest="abc")
+        runlog.record(smashlet, finished_on=2000)
+        assert runlog.get(smashlet).get("digest") is None
+        runlog.close()
+
+
+def test_concurrent_writers_do_not_lose_runs(tmp_path):
+    root = make_project(tmp_path)
+    smashlet = root / "smashlet.py"
+    SqliteRunlog.open(root).close()
+
+    def writer():
+        state = SqliteRunlog.open(root)
+        for _ in range(20):
+            state.record(smashlet, duration=0.01)
+        state.close()
+
+    threads = [threading.Thread(target=writer) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    state = SqliteRunlog.open(root)
+    assert state.get(smashlet)["runs"] == 80
+    state.close()
+
+
+def test_init_switches_project_to_sqlite(tmp_path):
+    os.chdir(tmp_path)
+    run_init()
+    update_runlog(tmp_path, tmp_path / "smashlet.py", finished_on=77)
+
+    run_init(state="sqlite")
+
+    assert (tmp_path / ".smash" / "state.db").exists()
+    assert get_runlog(tmp_path)[str(tmp_path / "smashlet.py")]["last_run"] == 77
+
+    update_runlog(tmp_path, tmp_path / "smashlet.py", finished_on=88)
+    runlog = open_runlog(tmp_path)
+    assert isinstance(runlog, SqliteRunlog)
+    assert runlog.get(tmp_path / "smashlet.py")["runs"] == 2
+    runlog.close()
@@ -0,0 +1,66 @@
+"""
+Tests `smash stats`: duration percentiles, regression detection and JSON output.
+"""
+
+import json
+import os
+
+from smash_core.commands.stats import collect_stats, percentile, run_stats
+from smash_core.project import Runlog, update_project_config
+
+
+def record_runs(root, name, durations):
+    runlog = Runlog.load(root, history_limit=50)
+    for i, duration in enumerate(durations):
+        runlog.record(root / name, finished_on=1000 + i, duration=duration)
+    runlog.flush()
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 21))
+
+    assert percentile(values, 50) == 10
+    assert percentile(values, 95) == 19
+    assert percentile([3.0], 95) == 3.0
+
+
+def test_stats_flag_slow_recent_runs(tmp_path):
+    (tmp_path / ".smash").mkdir()
+    update_project_config(tmp_path, history=50)
+    record_runs(tmp_path, "steady.py", [0.5] * 10)
+    record_runs(tmp_path, "slower.py", [0.2] * 7 + [0.9, 1.0, 1.1])
+
+    stats = collect_stats(tmp_path)
+
+    assert stats["steady.py"]["runs"] == 10
+    assert stats["steady.py"]["p50"] == 0.5
+    assert stats["steady.py"]["total"] == 5.0
+    assert stats["steady.py"]["regression"] is None
+    assert stats["slower.py"]["max"] == 1.1
+    assert stats["slower.py"]["regression"] == {
+        "baseline": 0.2,
+        "recent": 1.0,
+        "ratio": 5.0,
+    }
+
+
+def test_history_depth_is_configurable(tmp_path):
+    (tmp_path / ".smash").mkdir()
+    update_project_config(tmp_path, history=3)
+    record_runs(tmp_path, "a.py", [0.1, 0.2, 0.3, 0.4, 0.5])
+
+    stats = collect_stats(tmp_path)
+
+    assert stats["a.py"]["runs"] == 5
+    assert stats["a.py"]["timed_runs"] == 3
+
+
+def test_stats_json_output(tmp_path, capsys):
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    record_runs(tmp_path, "a.py", [0.1, 0.3])
+
+    run_stats(as_json=True)
+
+    data = json.loads(capsys.readouterr().out)
+    assert data["smashlets"]["a.py"]["p95"] == 0.3
@@ -6,6 +6,7 @@ Verifies that output reflects correct smashlet states: up to date, needs run, or
 
 import os
 from smash_core.commands.status import run_status
+from smash_core.smashlets import run_smashlet
 import json
 import time
 
@@ -105,3 +106,59 @@ def run(context):
     assert "✅ smashlet_up.py — up to date" in output
     assert "⚙️ smashlet_changed.py — will run" in output
     assert "⏳ smashlet_timeout.py — skipped (timeout not reached)" in output
+
+
+def test_status_explains_decisions_as_json(tmp_path, capsys):
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    (tmp_path / "smash.py").write_text("raise RuntimeError('must not run')\n")
+    (tmp_path / "a.md").write_text("a")
+    (tmp_path / "out.txt").write_text("out")
+    (tmp_path / "smashlet_build.py").write_text(
+        "INPUT_GLOB = '*.md'\nOUTPUT_FILES = ['out.txt']\ndef run(context):\n    pass\n"
+    )
+    # No INPUT_GLOB: the build still runs it, so status must list it
+    (tmp_path / "smashlet_noglob.py").write_text("def run():\n    pass\n")
+    os.utime(tmp_path / "out.txt", (1000, 1000))
+
+    run_status(as_json=True)
+    status = json.loads(capsys.readouterr().out)["smashlets"]
+
+    assert status["smashlet_build.py"]["state"] == "run"
+    assert status["smashlet_build.py"]["file"] in ("a.md", "smashlet_build.py")
+    assert status["smashlet_build.py"]["since"] == 1000
+    assert status["smashlet_noglob.py"]["reason"] == "never ran"
+
+
+def test_status_why_names_the_changed_input(tmp_path, capsys):
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    (tmp_path / "a.md").write_text("a")
+    smashlet = tmp_path / "smashlet.py"
+    smashlet.write_text(
+        "INPUT_GLOB = '*.md'\nFRESHNESS = 'hash'\ndef run():\n    pass\n"
+    )
+
+    run_smashlet(smashlet, tmp_path, {"project_root": tmp_path})
+    (tmp_path / "a.md").write_text("changed")
+
+    run_status(why=True)
+    output = capsys.readouterr().out
+
+    assert "smashlet.py — will run" in output
+    assert "↳ a.md: contents changed" in output
+
+
+def test_status_writes_nothing(tmp_path, capsys):
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    (tmp_path / ".smash" / "config.json").write_text('{"state": "sqlite"}')
+    (tmp_path / "a.md").write_text("a")
+    (tmp_path / "smashlet.py").write_text(
+        "INPUT_GLOB = '*.md'\nFRESHNESS = 'hash'\ndef run():\n    pass\n"
+    )
+
+    run_status()
+
+    assert "will run" in capsys.readouterr().out
+    assert sorted(p.name for p in (tmp_path / ".smash").iterdir()) == ["config.json"]
@@ -0,0 +1,70 @@
+"""
+Tests build tracing and the Chrome trace-event output.
+"""
+
+import json
+import os
+import threading
+
+from smash_core.commands.build import run_build
+from smash_core.trace import NULL_TRACER, Tracer
+
+
+def test_tracer_records_complete_events():
+    tracer = Tracer()
+
+    with tracer.span("outer", smashlet="a.py"):
+        with tracer.span("inner"):
+            pass
+
+    def work():
+        with tracer.span("other"):
+            pass
+
+    thread = threading.Thread(target=work, name="worker")
+    thread.start()
+    thread.join()
+
+    trace = tracer.to_json()
+    events = {e["name"]: e for e in trace["traceEvents"] if e["ph"] == "X"}
+    assert set(events) == {"outer", "inner", "other"}
+    assert events["other"]["tid"] != events["outer"]["tid"]
+    assert events["outer"]["args"] == {"smashlet": "a.py"}
+    assert events["outer"]["dur"] >= events["inner"]["dur"]
+    thread_names = [e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"]
+    assert "worker" in thread_names
+
+
+def test_null_tracer_spans_do_nothing():
+    with NULL_TRACER.span("nothing"):
+        pass
+    assert not NULL_TRACER.enabled
+
+
+def test_build_trace_covers_phases(tmp_path):
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    (tmp_path / "input.txt").write_text("hi")
+    (tmp_path / "smashlet.py").write_text("""
+INPUT_GLOB = "*.txt"
+OUTPUT_FILES = ["out.txt"]
+
+def run():
+    open("out.txt", "w").write("x")
+""")
+
+    run_build(trace=True)
+
+    trace = json.loads((tmp_path / ".smash" / "trace.json").read_text())
+    names = {e["name"] for e in trace["traceEvents"] if e["ph"] == "X"}
+    assert {
+        "build context",
+        "discover",
+        "plan",
+        "pass 1",
+        "smashlet.py",
+        "should_run",
+        "load module",
+        "local context",
+        "run",
+    } <= names
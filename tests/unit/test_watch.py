@@ -0,0 +1,119 @@
+"""
+Tests `smash watch`: change detection, mapping changes to smashlets, and
+incremental rebuilds.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from smash_core.commands.watch import (
+    affected_smashlets,
+    run_watch,
+    with_dependents,
+)
+from smash_core.watch import InotifyWatcher, PollingWatcher
+
+
+def inotify_available(path):
+    try:
+        InotifyWatcher(path).close()
+        return True
+    except OSError:
+        return False
+
+
+def test_affected_smashlets_maps_inputs_context_and_source(tmp_path):
+    (tmp_path / "posts").mkdir()
+    (tmp_path / "data").mkdir()
+    posts = tmp_path / "posts" / "smashlet.py"
+    posts.write_text("INPUT_GLOB = '*.md'\ndef run(): pass\n")
+    data = tmp_path / "data" / "smashlet.py"
+    data.write_text("INPUT_GLOB = '*.csv'\ndef run(): pass\n")
+    smashlets = [posts, data]
+
+    def affected(*paths):
+        return affected_smashlets(set(paths), smashlets, tmp_path)
+
+    assert affected(tmp_path / "posts" / "a.md") == {posts}
+    assert affected(tmp_path / "posts" / "a.csv") == set()
+    assert affected(tmp_path / "data" / "context" / "prompt.txt") == {data}
+    assert affected(data) == {data}
+    assert affected(tmp_path / "context" / "site.json") == {posts, data}
+    assert affected(tmp_path / "smash.py") == {posts, data}
+
+
+def test_with_dependents_follows_graph():
+    deps = {"b": {"a"}, "c": {"b"}, "d": set()}
+
+    assert with_dependents({"a"}, deps) == {"a", "b", "c"}
+    assert with_dependents({"d"}, deps) == {"d"}
+
+
+def test_polling_watcher_sees_changes_but_not_ignored_dirs(tmp_path):
+    (tmp_path / ".smash").mkdir()
+    watcher = PollingWatcher(tmp_path, interval=0.01)
+
+    (tmp_path / ".smash" / "runlog.json").write_text("{}")
+    (tmp_path / "note.md").write_text("hi")
+
+    assert watcher.read(0.5) == {tmp_path / "note.md"}
+
+
+def test_watch_rebuilds_only_affected_smashlets(tmp_path):
+    if not inotify_available(tmp_path):
+        pytest.skip("inotify not available")
+
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    for name in ["md", "csv"]:
+        (tmp_path / f"input.{name}").write_text("v1")
+        (tmp_path / f"smashlet_{name}.py").write_text(f"""
+INPUT_GLOB = "*.{name}"
+
+def run():
+    with open("log.txt", "a") as f:
+        f.write("{name}\\n")
+    return 0
+""")
+
+    def edit():
+        time.sleep(0.5)
+        (tmp_path / "input.md").write_text("v2")
+
+    threading.Thread(target=edit).start()
+    run_watch(debounce=0.1, max_batches=1)
+
+    lines = (tmp_path / "log.txt").read_text().splitlines()
+    assert sorted(lines[:2]) == ["csv", "md"]  # initial build
+    assert lines[2:] == ["md"]  # only the smashlet whose input changed
+
+
+def test_watch_rebuilds_the_session_context_on_global_changes(tmp_path):
+    if not inotify_available(tmp_path):
+        pytest.skip("inotify not available")
+
+    os.chdir(tmp_path)
+    (tmp_path / ".smash").mkdir()
+    (tmp_path / "context").mkdir()
+    (tmp_path / "context" / "site.json").write_text('{"title": "v1"}')
+    (tmp_path / "smashlet.py").write_text("""
+def should_run(context):
+    with open("log.txt", "a") as f:
+        f.write(context["context"]["site"]["title"] + "\\n")
+    return False
+
+def run():
+    pass
+""")
+
+    def edit():
+        time.sleep(0.5)
+        (tmp_path / "context" / "site.json").write_text('{"title": "v2"}')
+
+    threading.Thread(target=edit).start()
+    run_watch(debounce=0.1, max_batches=1)
+
+    assert (tmp_path / "log.txt").read_text().splitlines() == ["v1", "v2"]